@@ -0,0 +1,9 @@
+"""Headless benchmark suite for Spirograph Studio.
+
+    python -m benchmarks                    # run everything, compare to baseline
+    python -m benchmarks -k engine          # only cases whose name contains "engine"
+    python -m benchmarks --save-baseline    # record this run as the new baseline
+
+Cases live in ``cases.py``; ``runner.py`` times them, writes the results
+as JSON and flags anything slower than the stored baseline.
+"""
@@ -0,0 +1,230 @@
+"""Benchmark cases. Each ``setup`` builds its state and returns the
+callable that gets timed; heavy imports happen inside, so a missing
+frontend dependency skips its cases instead of failing the run.
+
+pygame runs on the SDL dummy video driver and the PIL paths never touch a
+terminal, so the whole suite runs headless (CI, ssh, cron).
+"""
+import itertools
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from constants import CANVAS_SIZE, CANVAS_MARGIN, PREVIEW_SIZE
+from curve_cache import CURVE_CACHE
+from spiro_math import SpiroMath
+from spirograph_batch import _PenColor
+
+from .runner import case
+
+# (R, r, d) per regime: loop count and |d|·k² drive the adaptive step count.
+REGIMES = {
+    "few-loops":   (150, 80, 100),     # 8 loops, smooth
+    "many-loops":  (173, 61, 140),     # 61 loops, dense
+    "near-circle": (200, 199, 20),     # r ≈ R: 199 loops of a tiny epicycle
+    "spiky":       (300, 7, 250),      # large k: sharp cusps, streamed on screen
+}
+LAYER      = REGIMES["many-loops"]
+STEP_SPEED = 100     # slider speed × 5 at the default Speed of 20
+THICK      = 2
+
+
+# ── Math ──────────────────────────────────────────────────────────────────────
+
+def _compute_points(R, r, d):
+    spiro = SpiroMath()
+    steps = spiro.steps_for(R, r, d, CANVAS_SIZE, CANVAS_MARGIN)
+    return lambda: spiro.compute_points(R, r, d, steps)
+
+
+for _name, _params in REGIMES.items():
+    case(f"math.compute_points[{_name}]")(lambda p=_params: _compute_points(*p))
+
+
+@case("math.curve_store.load")
+def _curve_store_load():
+    """A stored streamed-size curve, memory-mapped back from disk."""
+    import tempfile
+    from curve_store import CurveStore
+    R, r, d = REGIMES["spiky"]
+    steps   = SpiroMath().steps_for(R, r, d, CANVAS_SIZE, CANVAS_MARGIN, max_steps=10 ** 6)
+    store   = CurveStore(tempfile.mkdtemp(prefix="spirograph-bench-"))
+    key     = (R, r, d, steps)
+    store.save(key, SpiroMath().fit_points(R, r, d, CANVAS_SIZE, CANVAS_MARGIN, steps))
+    return lambda: store.load(key, (steps + 1, 2))
+
+
+# ── Drawing engines ───────────────────────────────────────────────────────────
+
+def _pygame_display():
+    """A (dummy) display, so surfaces convert to its format as in the app."""
+    import pygame
+    pygame.display.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+def _pygame_engine():
+    _pygame_display()
+    from pygame_app.drawing_engine import DrawingEngine
+    return DrawingEngine()
+
+
+def _pil_engine():
+    from tui.drawing_engine import DrawingEngine
+    return DrawingEngine()
+
+
+ENGINES = {"pygame": _pygame_engine, "pil": _pil_engine}
+
+
+def _bench_start(make):
+    """Request, compute (uncached) and accept a layer, then drop it."""
+    engine = make()
+
+    def start():
+        CURVE_CACHE.clear()
+        engine.start(*LAYER)
+        engine.pop_undo()
+    return start
+
+
+def _bench_step(make):
+    """One animation step at the default speed. Finished layers stay on the
+    canvas; the next call starts another (from the curve cache)."""
+    engine = make()
+    pen    = _PenColor("rainbow")
+
+    def step():
+        if not engine.drawing:
+            engine.start(*LAYER)
+        engine.step(STEP_SPEED, THICK, pen)
+    return step
+
+
+def _bench_undo(make):
+    """Clear pushes an undo entry that snapshots every tile; undo pastes
+    them back."""
+    engine = make()
+    pen    = _PenColor("#f95757")
+    engine.start(*LAYER)
+    while engine.drawing:
+        engine.step(10 ** 9, THICK, pen)
+
+    def push_pop():
+        engine.clear()
+        engine.pop_undo()
+    return push_pop
+
+
+for _kind, _make in ENGINES.items():
+    case(f"engine.{_kind}.start")(lambda m=_make: _bench_start(m))
+    case(f"engine.{_kind}.step")(lambda m=_make: _bench_step(m))
+    case(f"engine.{_kind}.push_undo")(lambda m=_make: _bench_undo(m))
+
+
+# ── Widgets ───────────────────────────────────────────────────────────────────
+
+@case("preview.pygame.frame")
+def _pygame_preview():
+    import pygame
+    from pygame_app.preview import PreviewWidget
+    from pygame_app.utils import load_fonts
+    _pygame_display()
+    fonts   = load_fonts()
+    preview = PreviewWidget(0, 0, PREVIEW_SIZE)
+    target  = pygame.Surface((PREVIEW_SIZE, PREVIEW_SIZE))
+
+    def frame():
+        preview.update(False)
+        preview.draw(target, *REGIMES["few-loops"], (249, 87, 87), fonts)
+    return frame
+
+
+@case("preview.pygame.rebuild")
+def _pygame_preview_rebuild():
+    """A frame after a slider change: the static layer is rebuilt."""
+    import pygame
+    from pygame_app.preview import PreviewWidget
+    from pygame_app.utils import load_fonts
+    _pygame_display()
+    fonts   = load_fonts()
+    preview = PreviewWidget(0, 0, PREVIEW_SIZE)
+    target  = pygame.Surface((PREVIEW_SIZE, PREVIEW_SIZE))
+    params  = itertools.cycle(REGIMES.values())
+
+    def frame():
+        preview.draw(target, *next(params), (249, 87, 87), fonts)
+    return frame
+
+
+@case("preview.pil.frame")
+def _pil_preview():
+    from tui.widgets.preview import PreviewWidget
+    preview = PreviewWidget()
+
+    def frame():
+        preview._angle += 0.02
+        preview._draw_frame(*REGIMES["few-loops"], (249, 87, 87))
+    return frame
+
+
+@case("preview.pil.rebuild")
+def _pil_preview_rebuild():
+    from tui.widgets.preview import PreviewWidget
+    preview = PreviewWidget()
+    params  = itertools.cycle(REGIMES.values())
+
+    def frame():
+        preview._draw_frame(*next(params), (249, 87, 87))
+    return frame
+
+
+def _canvas_widget():
+    from tui.widgets.canvas import CanvasWidget, TImage
+    widget = CanvasWidget()
+    widget._img = TImage(id="canvas-img")   # unmounted: default 80 x 40 cells
+    engine = _pil_engine()
+    engine.start(*LAYER)
+    while engine.drawing:
+        engine.step(10 ** 9, THICK, _PenColor("rainbow"))
+    return widget, engine.canvas
+
+
+@case("canvas.pil.render_and_center")
+def _canvas_full():
+    """Full LANCZOS rescale, as after a resize, undo or clear."""
+    widget, canvas = _canvas_widget()
+    return lambda: widget._render_and_center(canvas)
+
+
+@case("canvas.pil.render_and_center[region]")
+def _canvas_region():
+    """Dirty-region rescale of one drawing step's worth of canvas."""
+    widget, canvas = _canvas_widget()
+    widget._render_and_center(canvas)
+    return lambda: widget._render_and_center(canvas, (300, 300, 340, 340))
+
+
+# ── Saving ────────────────────────────────────────────────────────────────────
+
+def _drawn(make):
+    engine = make()
+    engine.start(*LAYER)
+    while engine.drawing:
+        engine.step(10 ** 9, THICK, _PenColor("rainbow"))
+    return engine
+
+
+for _kind, _make in ENGINES.items():
+    case(f"save.{_kind}.snapshot")(lambda m=_make: _drawn(m).snapshot)
+
+
+@case("save.write_png")
+def _write_png():
+    import tempfile
+    from save_queue import write_png
+    snapshot = _drawn(_pil_engine).snapshot()
+    path     = os.path.join(tempfile.gettempdir(), "spirograph-bench.png")
+    return lambda: write_png(snapshot, path)
@@ -0,0 +1,194 @@
+"""Timing, JSON results and baseline comparison for the benchmark cases."""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+HERE     = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "baseline.json")
+
+_CASES = {}   # name -> setup(); setup() returns the zero-argument callable to time
+
+
+def case(name: str):
+    """Register ``setup`` under ``name``. ``setup()`` builds any state and
+    returns the callable to time; raising ImportError skips the case."""
+    def register(setup):
+        _CASES[name] = setup
+        return setup
+    return register
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+
+def measure(fn, repeat: int = 5, min_sample: float = 0.05) -> dict:
+    """Per-call times of ``fn`` over ``repeat`` samples, each looping until
+    it lasts at least ``min_sample`` seconds (like ``timeit.autorange``)."""
+    fn()                                    # warm-up: imports, caches, JIT-free but lazy
+    loops = 1
+    while True:
+        t = _sample(fn, loops)
+        if t >= min_sample or loops >= 1 << 20:
+            break
+        loops *= max(2, min(10, int(min_sample / max(t, 1e-9)) + 1))
+    samples = [t / loops] + [_sample(fn, loops) / loops for _ in range(repeat - 1)]
+    return {
+        "median_ms": statistics.median(samples) * 1e3,
+        "min_ms":    min(samples) * 1e3,
+        "loops":     loops,
+        "repeat":    repeat,
+    }
+
+
+def _sample(fn, loops: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return time.perf_counter() - t0
+
+
+def run(pattern: str = "", repeat: int = 5, min_sample: float = 0.05,
+        log=print) -> dict:
+    """Run every case whose name contains ``pattern``; returns the results
+    document (``meta`` + ``results``). Each result also carries the
+    ``perf`` counters and timers its case reported."""
+    import perf
+    from . import cases  # noqa: F401  (registers the cases)
+
+    results, skipped = {}, {}
+    for name in sorted(_CASES):
+        if pattern not in name:
+            continue
+        perf.reset()
+        try:
+            fn = _CASES[name]()
+        except ImportError as exc:
+            skipped[name] = str(exc)
+            log(f"  {name:<44} skipped ({exc})")
+            continue
+        results[name] = measure(fn, repeat, min_sample)
+        stats = perf.snapshot()
+        results[name]["perf"] = {"counters": stats["counters"], "timers": stats["timers"]}
+        log(f"  {name:<44} {results[name]['median_ms']:10.3f} ms")
+    return {"meta": _meta(), "results": results, "skipped": skipped}
+
+
+def _meta() -> dict:
+    meta = {
+        "created":   datetime.now().isoformat(timespec="seconds"),
+        "python":    platform.python_version(),
+        "platform":  platform.platform(),
+        "machine":   platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    for mod in ("numpy", "pygame", "PIL", "textual"):
+        try:
+            meta[mod] = __import__(mod).__version__
+        except (ImportError, AttributeError):
+            meta[mod] = None
+    return meta
+
+
+# ── Baseline ──────────────────────────────────────────────────────────────────
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """``(name, baseline_ms, current_ms, ratio, status)`` for every case in
+    either document. ``status`` is ``slower`` / ``faster`` beyond
+    ``threshold`` (a fraction), ``ok``, ``new`` or ``missing``."""
+    cur, base = current["results"], baseline["results"]
+    rows = []
+    for name in sorted(set(cur) | set(base)):
+        if name not in base:
+            rows.append((name, None, cur[name]["median_ms"], None, "new"))
+            continue
+        if name not in cur:
+            rows.append((name, base[name]["median_ms"], None, None, "missing"))
+            continue
+        b, c  = base[name]["median_ms"], cur[name]["median_ms"]
+        ratio = c / b if b > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, b, c, ratio, status))
+    return rows
+
+
+def _fmt(ms) -> str:
+    return f"{ms:10.3f}" if ms is not None else f"{'—':>10}"
+
+
+def print_comparison(rows: list, file=sys.stdout) -> None:
+    print(f"\n  {'case':<44} {'baseline':>10} {'current':>10} {'ratio':>7}", file=file)
+    for name, b, c, ratio, status in rows:
+        r = f"{ratio:7.2f}" if ratio is not None else f"{'':>7}"
+        mark = "" if status == "ok" else f"  {status.upper()}"
+        print(f"  {name:<44} {_fmt(b)} {_fmt(c)} {r}{mark}", file=file)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks",
+                                 description="Run the headless benchmark suite.")
+    ap.add_argument("-k", dest="pattern", default="",
+                    help="only run cases whose name contains this")
+    ap.add_argument("-o", "--out", default=os.path.join(HERE, "results.json"),
+                    help="where to write this run's JSON results")
+    ap.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare against")
+    ap.add_argument("--save-baseline", action="store_true",
+                    help="also store this run as the baseline")
+    ap.add_argument("--require-baseline", action="store_true",
+                    help="fail if the baseline is missing (release / CI runs)")
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="fractional slowdown that counts as a regression (default 0.25)")
+    ap.add_argument("--repeat", type=int, default=5, help="samples per case")
+    ap.add_argument("--min-sample", type=float, default=0.05,
+                    help="minimum seconds per sample")
+    args = ap.parse_args(argv)
+
+    print(f"Running benchmarks{f' matching {args.pattern!r}' if args.pattern else ''}…")
+    current = run(args.pattern, args.repeat, args.min_sample)
+    _write_json(args.out, current)
+    print(f"\nResults written to {args.out}")
+
+    if args.save_baseline:
+        _write_json(args.baseline, current)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one with --save-baseline.")
+        return 2 if args.require_baseline else 0
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    base_meta = baseline["meta"]
+    print(f"Baseline: {base_meta.get('created')}, Python {base_meta.get('python')} "
+          f"on {base_meta.get('platform')} ({base_meta.get('cpu_count')} CPUs)")
+    if base_meta.get("platform") != current["meta"]["platform"]:
+        print("Note: recorded on a different platform; timings may not be comparable.")
+    if args.pattern:
+        baseline["results"] = {k: v for k, v in baseline["results"].items()
+                               if args.pattern in k}
+    rows = compare(current, baseline, args.threshold)
+    print_comparison(rows)
+    slower = [row[0] for row in rows if row[4] == "slower"]
+    if slower:
+        print(f"\n{len(slower)} case(s) regressed by more than {args.threshold:.0%}.")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+def _write_json(path: str, doc: dict) -> None:
+    tmp = path + ".part"
+    with open(tmp, "w") as fh:
+        json.dump(doc, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    os.replace(tmp, path)
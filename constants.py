@@ -2,8 +2,9 @@
 # All visual styling (colors, radii, alphas, font sizes) lives in theme.py.
 import os
 
-SAVE_DIR = os.path.expanduser("~/Desktop/spirograph")
-os.makedirs(SAVE_DIR, exist_ok=True)
+SAVE_DIR        = os.path.expanduser("~/Desktop/spirograph")
+CACHE_DIR       = os.path.expanduser("~/.cache/spirograph")   # created on first write
+FONT_CACHE_PATH = os.path.join(CACHE_DIR, "fonts.json")
 
 WINDOW_W     = 1060
 WINDOW_H     = 720
@@ -13,3 +14,44 @@ CANVAS_X     = PANEL_W + 25
 CANVAS_Y     = (WINDOW_H - CANVAS_SIZE) // 2
 PREVIEW_SIZE  = 155
 CANVAS_MARGIN = 28   # padding between canvas edge and first drawn point
+
+# ── Curve sampling ────────────────────────────────────────────────────────────
+CURVE_TOL_PX       = 0.25        # max chord-to-curve deviation on the canvas, in px
+CURVE_MIN_STEPS    = 360
+CURVE_MAX_STEPS    = 200_000     # cap for curves materialized whole (and cached)
+CURVE_STREAM_STEPS = 100_000     # curves sampled finer than this are streamed
+CURVE_STREAM_MAX   = 5_000_000   # cap for streamed curves
+CURVE_CHUNK        = 16_384      # points per streamed batch
+DRAW_REF_STEPS     = 6000        # sample count the Speed slider was tuned against
+CURVE_CACHE_SIZE   = 32          # fitted curves kept in the shared LRU cache
+
+# ── On-disk curve cache ───────────────────────────────────────────────────────
+CURVE_STORE_DIR       = os.path.join(CACHE_DIR, "curves")
+CURVE_STORE_BYTES     = 256 * 1024 * 1024   # evict least recently used beyond this; 0 disables
+CURVE_STORE_MIN_STEPS = 50_000              # below this, computing beats loading from disk
+
+# ── Undo ──────────────────────────────────────────────────────────────────────
+UNDO_RAM_BUDGET  = 32 * 1024 * 1024   # compressed tile bytes kept before spilling to disk
+
+# ── Export ────────────────────────────────────────────────────────────────────
+EXPORT_SIZE = 8192   # default edge of a high-resolution export, in px
+EXPORT_TILE = 512    # tile edge rendered per worker task, in px
+VECTOR_TOL  = 0.1    # max deviation of SVG/PDF Bézier paths from the curve, in px
+
+# ── Saving ────────────────────────────────────────────────────────────────────
+AUTOSAVE_PATH     = os.path.join(CACHE_DIR, "autosave.png")   # crash-recovery copy
+AUTOSAVE_INTERVAL = 60     # min seconds between autosaves of a changed canvas
+FLASH_SECS        = 3      # seconds a status message ("Saved", "Exported …") stays up
+FLASH_ERROR_SECS  = 8      # the same for failures, long enough to read the error
+
+# ── Explorer ──────────────────────────────────────────────────────────────────
+EXPLORER_SPAN       = 2             # neighbours on each side of the current value
+EXPLORER_STEPS      = (1, 1, 5)     # (R, r, d) step per column; d changes shape slowly
+EXPLORER_THUMB      = 124           # thumbnail edge, in px (5 across the canvas)
+EXPLORER_WORKERS    = 2             # thumbnail render threads
+EXPLORER_CACHE_SIZE = 120           # rendered thumbnails kept for revisits
+
+# ── Performance HUD ───────────────────────────────────────────────────────────
+PERF_WINDOW      = 240    # most recent samples per timer used for percentiles
+PERF_RATE_WINDOW = 1.0    # seconds over which counter rates are averaged
+PERF_HUD_REFRESH = 0.25   # seconds between HUD text updates
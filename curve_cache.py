@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+
+import perf
+from constants import CURVE_CACHE_SIZE
+
+
+class CurveCache:
+    """Bounded LRU map from curve parameters to computed point sets.
+
+    One instance (``CURVE_CACHE``) is shared by every engine, preview and
+    headless renderer in the process. Cached point sets are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=CURVE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits    = 0
+        self.misses  = 0
+        self._items  = OrderedDict()
+        self._lock   = threading.Lock()
+
+    def get(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` and
+        storing its result on a miss."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+CURVE_CACHE = CurveCache()
+perf.gauge("cache.curve.hit_rate", lambda: CURVE_CACHE.hit_rate)
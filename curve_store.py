@@ -0,0 +1,191 @@
+"""On-disk curve cache: the second tier behind ``CURVE_CACHE``.
+
+Fitted curves are kept as ``.npy`` files under CURVE_STORE_DIR and loaded
+back memory-mapped, so a curve one session or batch worker computed is a
+page-cache read for every later one, and callers get read-only views of
+the mapping rather than copies.
+
+Files are written under a per-writer ``.part`` name and renamed into place,
+so other processes only ever see complete files, and are never modified
+afterwards, so any number of processes can map them at once. Beyond
+CURVE_STORE_BYTES the least recently loaded files (by mtime, refreshed on
+every load) are deleted; a process that already mapped one keeps its view.
+
+Needs NumPy. Without it, or when the directory is not writable, every
+lookup is a miss and nothing is written.
+"""
+import os
+import threading
+import time
+
+import perf
+from constants import CURVE_STORE_DIR, CURVE_STORE_BYTES
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+PART_MAX_AGE = 3600   # seconds before a .part file left by a dead writer is swept
+
+
+class CurveWriter:
+    """A curve being written to the store in batches. ``commit`` publishes
+    it once all ``shape[0]`` points are written; ``discard`` drops it."""
+
+    def __init__(self, store, key, shape):
+        self._store = store
+        self._path  = store.path(key)
+        self._tmp   = f"{self._path}.{os.getpid()}-{threading.get_ident()}.part"
+        self._left  = shape[0]
+        os.makedirs(store.root, exist_ok=True)
+        self._fh    = open(self._tmp, "wb")
+        try:
+            np.lib.format.write_array_header_1_0(self._fh, {
+                "descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                "fortran_order": False, "shape": shape})
+        except OSError:
+            self.discard()
+            raise
+
+    def write(self, pts):
+        """Append ``pts``, an ``(n, 2)`` array, to the curve."""
+        if self._fh is None:
+            return
+        try:
+            np.ascontiguousarray(pts, dtype=np.float64).tofile(self._fh)
+            self._left -= len(pts)
+        except OSError:
+            self.discard()          # disk full: the curve just is not stored
+
+    def commit(self):
+        if self._fh is None:
+            return
+        if self._left != 0:
+            self.discard()
+            return
+        try:
+            self._fh.close()
+            self._fh = None
+            os.replace(self._tmp, self._path)
+        except OSError:
+            self.discard()
+            return
+        self._store.evict()
+
+    def discard(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
+
+
+class CurveStore:
+    """Directory of stored curves, keyed by any tuple of parameters that
+    identifies the points (``SpiroMath.curve`` includes CURVE_VERSION)."""
+
+    def __init__(self, root=CURVE_STORE_DIR, max_bytes=CURVE_STORE_BYTES):
+        self.root      = root
+        self.max_bytes = max_bytes
+        self.hits      = 0
+        self.misses    = 0
+        self._lock     = threading.Lock()
+
+    @property
+    def enabled(self):
+        return _HAS_NUMPY and self.max_bytes > 0
+
+    def path(self, key):
+        return os.path.join(self.root, "_".join(map(str, key)) + ".npy")
+
+    def load(self, key, shape):
+        """Read-only, memory-mapped ``float64`` array of the curve stored as
+        ``key``, or None if there is none of ``shape``."""
+        if not self.enabled:
+            return None
+        path = self.path(key)
+        try:
+            pts = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            pts = None
+        hit = pts is not None and pts.shape == shape and pts.dtype == np.float64
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not hit:
+            return None
+        try:
+            os.utime(path)          # recently used: evicted last
+        except OSError:
+            pass
+        return np.asarray(pts)      # plain ndarray view of the mapping
+
+    def writer(self, key, shape):
+        """A ``CurveWriter`` for ``key``, or None if the store is disabled
+        or not writable."""
+        if not self.enabled:
+            return None
+        try:
+            return CurveWriter(self, key, shape)
+        except OSError:
+            return None
+
+    def save(self, key, pts):
+        """Store ``pts``, a whole ``(n, 2)`` curve, as ``key``."""
+        if not self.enabled:
+            return
+        out = self.writer(key, pts.shape)
+        if out is not None:
+            out.write(pts)
+            out.commit()
+
+    def evict(self):
+        """Delete the least recently used curves until the store fits in
+        ``max_bytes``, and sweep stale ``.part`` files."""
+        now   = time.time()
+        files = []
+        try:
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue                # removed by another process
+                    if not entry.name.endswith(".part"):
+                        files.append((st.st_mtime, st.st_size, entry.path))
+                    elif now - st.st_mtime > PART_MAX_AGE:
+                        _remove(entry.path)
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if _remove(path):
+                total -= size
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _remove(path):
+    """Delete ``path``; False if it is already gone or still in use
+    (Windows refuses to delete mapped files)."""
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+CURVE_STORE = CurveStore()
+perf.gauge("cache.disk.hit_rate",
+           lambda: CURVE_STORE.hit_rate if CURVE_STORE.hits + CURVE_STORE.misses else None)
@@ -0,0 +1,107 @@
+"""Parameter-neighbourhood explorer.
+
+A grid of thumbnails of the curves around the current ``(R, r, d)``: each
+row steps one parameter by ``-EXPLORER_SPAN .. +EXPLORER_SPAN`` times its
+EXPLORER_STEPS entry, and the centre column is the current curve.
+Thumbnails render on a small thread pool, centre first, and the frontends
+draw whichever have finished, so the grid fills in progressively. When the
+sliders move, queued jobs for cells that left the grid are cancelled.
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from constants import EXPLORER_SPAN, EXPLORER_STEPS, EXPLORER_WORKERS, EXPLORER_CACHE_SIZE
+
+PARAMS = ("R", "r", "d")
+
+
+def neighbours(R, r, d, limits):
+    """Rows of ``(R, r, d)`` cells, one row per parameter; ``None`` where a
+    neighbour falls outside ``limits`` (``(lo, hi)`` per parameter) or
+    would make ``r >= R``."""
+    centre = (R, r, d)
+    rows   = []
+    for i, step in enumerate(EXPLORER_STEPS):
+        lo, hi = limits[i]
+        row = []
+        for off in range(-EXPLORER_SPAN, EXPLORER_SPAN + 1):
+            cell    = list(centre)
+            cell[i] = centre[i] + off * step
+            ok      = lo <= cell[i] <= hi and cell[1] < cell[0]
+            row.append(tuple(cell) if ok else None)
+        rows.append(row)
+    return rows
+
+
+class Explorer:
+    """Renders and caches the thumbnails for the current grid.
+
+    ``render(R, r, d, color)`` runs on pool threads and returns whatever
+    image type the frontend draws; it must not touch UI state. Call
+    ``update`` every frame with the current parameters, ``poll`` to pick up
+    finished thumbnails, and ``image`` to look one up.
+    """
+
+    def __init__(self, render, limits):
+        self.limits  = limits
+        self.rows    = []
+        self._render = render
+        self._key    = None
+        self._color  = None
+        self._images = OrderedDict()   # (R, r, d, color) -> image, LRU
+        self._jobs   = {}              # (R, r, d, color) -> Future
+        self._pool   = ThreadPoolExecutor(max_workers=EXPLORER_WORKERS,
+                                          thread_name_prefix="spiro-explore")
+
+    def update(self, R, r, d, color):
+        """Re-centre on ``(R, r, d)``; returns True if the grid changed."""
+        color = tuple(color)
+        key   = (R, r, d, color)
+        if key == self._key:
+            return False
+        self._key, self._color = key, color
+        self.rows = neighbours(R, r, d, self.limits)
+        wanted    = [(*cell, color) for cell in self._centre_out() if cell is not None]
+        for job in list(self._jobs):
+            if job not in wanted and self._jobs[job].cancel():
+                del self._jobs[job]          # still queued: drop it
+        for job in wanted:
+            if job not in self._images and job not in self._jobs:
+                self._jobs[job] = self._pool.submit(self._render, *job)
+        return True
+
+    def _centre_out(self):
+        """Cells ordered by distance from the centre column, so the nearest
+        neighbours show up first."""
+        order = sorted(range(2 * EXPLORER_SPAN + 1), key=lambda c: abs(c - EXPLORER_SPAN))
+        return [row[c] for c in order for row in self.rows]
+
+    def poll(self):
+        """Store finished thumbnails; returns True if any arrived."""
+        done = [job for job, fut in self._jobs.items() if fut.done()]
+        for job in done:
+            fut = self._jobs.pop(job)
+            if fut.cancelled():
+                continue
+            self._images[job] = fut.result()
+            while len(self._images) > EXPLORER_CACHE_SIZE:
+                self._images.popitem(last=False)
+        return bool(done)
+
+    def image(self, cell):
+        """Thumbnail of ``cell`` in the current pen color, or None while it
+        is still rendering."""
+        if cell is None:
+            return None
+        key = (*cell, self._color)
+        img = self._images.get(key)
+        if img is not None:
+            self._images.move_to_end(key)
+        return img
+
+    @property
+    def pending(self):
+        return len(self._jobs)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,212 @@
+"""High-resolution PNG export.
+
+Re-renders the layer history at any size from the recorded curve
+parameters and segment runs, so an 8K–20K print is as sharp as the curve
+itself rather than an upscale of the 680² canvas. The image is cut into
+square tiles that render in parallel worker processes; each finished row
+band of tiles is compressed straight into the PNG, so memory is bounded
+by a few bands, never the whole image.
+"""
+import math
+import multiprocessing
+import os
+from collections import deque
+
+from PIL import Image, ImageDraw
+
+import theme
+from constants import CANVAS_SIZE, CANVAS_MARGIN, CURVE_STREAM_MAX, CURVE_CHUNK, EXPORT_TILE
+from history import resample_runs
+from palette import color_rows
+from png_writer import PNGWriter
+from raster import pixel_runs
+from spiro_math import SpiroMath
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+
+# ── Layer plan ────────────────────────────────────────────────────────────────
+
+def plan(layers, size):
+    """Resample each layer for ``size`` and map its runs onto the new curve.
+
+    Run indices move proportionally along the curve, thickness scales with
+    the canvas, and each CURVE_CHUNK-point batch gets a bounding box so
+    tiles only evaluate the batches that reach them.
+    """
+    spiro  = SpiroMath()
+    margin = round(CANVAS_MARGIN * size / CANVAS_SIZE)
+    k      = size / CANVAS_SIZE
+    out    = []
+    for R, r, d, total, runs in layers:
+        steps  = spiro.steps_for(R, r, d, size, margin, max_steps=CURVE_STREAM_MAX)
+        scaled = [(a, b, max(1, round(thick * k)), mode)
+                  for a, b, thick, mode in resample_runs(runs, total, steps + 1)]
+        boxes  = []
+        for pts in spiro.stream_points(R, r, d, size, margin, steps):
+            if _HAS_NUMPY:
+                lo, hi = pts.min(axis=0), pts.max(axis=0)
+                boxes.append((int(lo[0]), int(lo[1]), int(hi[0]), int(hi[1])))
+            else:
+                xs, ys = [p[0] for p in pts], [p[1] for p in pts]
+                boxes.append((int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))))
+        out.append((R, r, d, steps, scaled, boxes))
+    return {"size": size, "margin": margin, "layers": out}
+
+
+# ── Tile rendering (runs in pool workers) ────────────────────────────────────
+
+_PLAN = None
+
+
+def _init_worker(plan_):
+    global _PLAN
+    _PLAN = plan_
+
+
+def render_tile(plan_, x, y, w, h):
+    """Render the ``w`` x ``h`` tile at ``(x, y)``; returns packed RGB bytes."""
+    size  = plan_["size"]
+    spiro = SpiroMath()
+    img   = Image.new("RGB", (w, h), theme.CANVAS_BG)
+    _grid(img, x, y, size)
+    draw  = ImageDraw.Draw(img)
+    for R, r, d, steps, runs, boxes in plan_["layers"]:
+        for a, b, thick, mode in runs:
+            pad = thick + 1
+            # Batch c holds points c*CHUNK .. (c+1)*CHUNK, i.e. segments
+            # c*CHUNK+1 .. (c+1)*CHUNK.
+            for c in range((a - 1) // CURVE_CHUNK, (b - 2) // CURVE_CHUNK + 1):
+                bx0, by0, bx1, by1 = boxes[c]
+                if (bx1 + pad < x or bx0 - pad >= x + w
+                        or by1 + pad < y or by0 - pad >= y + h):
+                    continue
+                s0 = max(a, c * CURVE_CHUNK + 1)
+                s1 = min(b, (c + 1) * CURVE_CHUNK + 1)
+                pts    = _to_tile(spiro.fit_range(R, r, d, size, plan_["margin"],
+                                                   steps, s0 - 1, s1), x, y)
+                colors = color_rows(mode, steps + 1, s0 - 1, s1)
+                for j0, j1 in _spans_in_tile(pts, w, h, pad):
+                    polys, _ = pixel_runs(pts, j0, j1, colors)
+                    for col, poly in polys:
+                        draw.line(poly, fill=col, width=thick)
+    return img.tobytes()
+
+
+def _spans_in_tile(pts, w, h, pad):
+    """``(start, end)`` ranges of segments of ``pts`` (segment j joins
+    points j-1, j) that come within ``pad`` px of a ``w`` x ``h`` tile."""
+    if _HAS_NUMPY:
+        a, b = pts[:-1], pts[1:]
+        lo   = np.minimum(a, b)
+        hi   = np.maximum(a, b)
+        hit  = ((hi[:, 0] >= -pad) & (lo[:, 0] < w + pad)
+                & (hi[:, 1] >= -pad) & (lo[:, 1] < h + pad))
+        edge = np.flatnonzero(np.diff(np.concatenate(([0], hit.view(np.int8), [0]))))
+        return [(int(s) + 1, int(e) + 1) for s, e in zip(edge[::2], edge[1::2])]
+    spans, start = [], None
+    for j in range(1, len(pts)):
+        (ax, ay), (bx, by) = pts[j - 1], pts[j]
+        inside = (max(ax, bx) >= -pad and min(ax, bx) < w + pad
+                  and max(ay, by) >= -pad and min(ay, by) < h + pad)
+        if inside and start is None:
+            start = j
+        elif not inside and start is not None:
+            spans.append((start, j))
+            start = None
+    if start is not None:
+        spans.append((start, len(pts)))
+    return spans
+
+
+def _render_tile_task(rect):
+    return render_tile(_PLAN, *rect)
+
+
+def _to_tile(pts, x, y):
+    # Snap to canvas pixels first so a tile sees exactly the pixels a
+    # single big canvas would.
+    if _HAS_NUMPY:
+        return np.floor(pts) - (x, y)
+    return [(int(px) - x, int(py) - y) for px, py in pts]
+
+
+def _grid(img, x, y, size):
+    """The dot grid of ``_make_canvas_bg(size)``, restricted to the tile."""
+    sp   = theme.GRID_SPACING
+    base = theme.GRID_BASE_BRIGHT
+    amp  = theme.GRID_VARY_AMP
+    freq = theme.GRID_VARY_FREQ
+    tint = theme.GRID_BLUE_TINT
+    w, h = img.size
+    first_x = max(sp, -(-x // sp) * sp)
+    first_y = max(sp, -(-y // sp) * sp)
+    for gx in range(first_x, min(x + w, size), sp):
+        for gy in range(first_y, min(y + h, size), sp):
+            c = base + int(amp * math.sin(gx * freq) * math.cos(gy * freq))
+            img.putpixel((gx - x, gy - y), (c, c, c + tint))
+
+
+# ── Export ────────────────────────────────────────────────────────────────────
+
+def export_png(layers, path, size, jobs=None, tile=EXPORT_TILE, progress=None):
+    """Write ``layers`` (from ``layers_from_history``) to ``path`` as a
+    ``size``² PNG. ``progress(done_rows, size)`` is called per band.
+
+    ``layers`` is a snapshot, so the export can run on a background thread
+    while the user keeps drawing."""
+    plan_  = plan(layers, size)
+    jobs   = jobs or os.cpu_count() or 1
+    across = -(-size // tile)
+    bands  = [[(x, y, min(tile, size - x), min(tile, size - y))
+               for x in range(0, size, tile)]
+              for y in range(0, size, tile)]
+
+    tmp    = path + ".part"
+    writer = PNGWriter(tmp, size, size)
+    try:
+        if jobs == 1:
+            for band in bands:
+                _write_band(writer, band, [render_tile(plan_, *rect) for rect in band])
+                if progress:
+                    progress(band[0][1] + band[0][3], size)
+        else:
+            # Spawned workers: forking a process that runs a GUI is unsafe.
+            ctx      = multiprocessing.get_context("spawn")
+            inflight = max(2, -(-jobs // across) + 1)    # bands queued at once
+            with ctx.Pool(jobs, initializer=_init_worker, initargs=(plan_,)) as pool:
+                todo    = iter(bands)
+                pending = deque()
+                for band in todo:
+                    pending.append((band, [pool.apply_async(_render_tile_task, (rect,))
+                                           for rect in band]))
+                    if len(pending) >= inflight:
+                        break
+                while pending:
+                    band, results = pending.popleft()
+                    _write_band(writer, band, [res.get() for res in results])
+                    if progress:
+                        progress(band[0][1] + band[0][3], size)
+                    nxt = next(todo, None)
+                    if nxt is not None:
+                        pending.append((nxt, [pool.apply_async(_render_tile_task, (rect,))
+                                              for rect in nxt]))
+        writer.close()
+    except BaseException:
+        writer.abort()
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return path
+
+
+def _write_band(writer, band, tiles):
+    """Interleave the rows of a band's tiles into full-width image rows."""
+    h     = band[0][3]
+    views = [(memoryview(data), w * 3) for (_, _, w, _), data in zip(band, tiles)]
+    writer.write_rows(b"".join(v[row * s:(row + 1) * s] for v, s in views)
+                      for row in range(h))
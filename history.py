@@ -0,0 +1,136 @@
+from tile_store import TileStore
+
+
+class DrawCommand:
+    """One Draw: the curve parameters plus the segment runs that actually
+    reached the canvas, each with the thickness and color mode in effect.
+    A Draw interrupted by another Draw, Clear or Undo keeps its partial runs."""
+
+    kind = "draw"
+
+    def __init__(self, R, r, d, layers_before, total):
+        self.R, self.r, self.d = R, r, d
+        self.layers_before     = layers_before
+        self.total             = total   # points in the curve the runs index
+        self.delta             = None
+        self.runs              = []   # [start, end, thick, mode]; segment i joins points i-1, i
+
+    def record(self, start, end, thick, mode):
+        if end <= start:
+            return
+        last = self.runs[-1] if self.runs else None
+        if last and last[1] == start and last[2] == thick and last[3] == mode:
+            last[1] = end
+        else:
+            self.runs.append([start, end, thick, mode])
+
+
+class ClearCommand:
+    kind = "clear"
+
+    def __init__(self, layers_before):
+        self.layers_before = layers_before
+        self.delta         = None
+
+
+class History:
+    """Undo log of draw/clear commands.
+
+    While a command runs, the engine calls ``touch`` with the box it is
+    about to paint; the first touch of each tile saves that tile's pre-draw
+    pixels. When the command is sealed, tiles that ended up unchanged are
+    dropped and the rest go to a TileStore as the command's ``delta``. Undo
+    pastes the delta back in place, so cost and memory scale with the pixels
+    a layer changed rather than the canvas size.
+
+    ``read_tile(rect)`` / ``write_tile(rect, raw)`` adapt the canvas backend;
+    ``rect`` is ``(x, y, w, h)`` and ``raw`` packed RGB bytes.
+    """
+
+    TILE = 64
+
+    def __init__(self, size, read_tile, write_tile, store=None):
+        self.size        = size
+        self.commands    = []
+        self.store       = store or TileStore()
+        self._read_tile  = read_tile
+        self._write_tile = write_tile
+        self._pending    = None   # {(tx, ty): pre-draw bytes} for commands[-1]
+
+    def __len__(self):
+        return len(self.commands)
+
+    def push(self, cmd):
+        """Seal the current command and start recording ``cmd``."""
+        self.seal()
+        self.commands.append(cmd)
+        self._pending = {}
+
+    def touch(self, x0, y0, x1, y1):
+        """Save pre-draw pixels of every unsaved tile overlapping the box."""
+        if self._pending is None:
+            return
+        t  = self.TILE
+        n  = (self.size + t - 1) // t
+        for ty in range(max(0, int(y0) // t), min(n - 1, int(y1) // t) + 1):
+            for tx in range(max(0, int(x0) // t), min(n - 1, int(x1) // t) + 1):
+                if (tx, ty) not in self._pending:
+                    self._pending[tx, ty] = self._read_tile(self._rect(tx, ty))
+
+    def touch_all(self):
+        self.touch(0, 0, self.size - 1, self.size - 1)
+
+    def seal(self):
+        """Store the tiles the current command changed as its ``delta``."""
+        if self._pending is None:
+            return
+        changed = []
+        for (tx, ty), before in self._pending.items():
+            rect = self._rect(tx, ty)
+            if self._read_tile(rect) != before:
+                changed.append((rect, before))
+        self.commands[-1].delta = self.store.put(changed)
+        self._pending = None
+
+    def pop(self):
+        """Undo the last command in place and return it."""
+        self.seal()
+        cmd = self.commands.pop()
+        for rect, raw in self.store.take(cmd.delta):
+            self._write_tile(rect, raw)
+        return cmd
+
+    def _rect(self, tx, ty):
+        t = self.TILE
+        x, y = tx * t, ty * t
+        return (x, y, min(t, self.size - x), min(t, self.size - y))
+
+
+# ── Replay ────────────────────────────────────────────────────────────────────
+
+def layers_from_history(commands):
+    """Plain, picklable ``(R, r, d, total, runs)`` for every draw since the
+    last clear; ``runs`` index a curve of ``total`` points."""
+    start = 0
+    for i, cmd in enumerate(commands):
+        if cmd.kind == "clear":
+            start = i + 1
+    return [(cmd.R, cmd.r, cmd.d, cmd.total, [tuple(run) for run in cmd.runs])
+            for cmd in commands[start:] if cmd.kind == "draw" and cmd.runs]
+
+
+def resample_runs(runs, total, n):
+    """Map runs recorded on a ``total``-point curve onto the same curve
+    sampled with ``n`` points; empty runs are dropped.
+
+    Run ``(start, end)`` draws segments ``start..end-1``, i.e. points
+    ``start-1 .. end-1``; those end points are what get scaled, so a fully
+    drawn ``(1, total)`` becomes ``(1, n)``."""
+    ratio = (n - 1) / max(total - 1, 1)
+    out   = []
+    for start, end, thick, mode in runs:
+        a = round((start - 1) * ratio) + 1
+        b = min(n, round((end - 1) * ratio) + 1)
+        if b > a:
+            out.append((a, b, thick, mode))
+    return out
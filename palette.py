@@ -0,0 +1,97 @@
+import colorsys
+from functools import lru_cache
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+
+# A color mode is hashable: an (r, g, b) tuple for a solid pen, "rainbow",
+# or ("gradient", ((r, g, b), ...)) for a multi-stop gradient along the curve.
+
+@lru_cache(maxsize=32)
+def color_table(mode, total):
+    """Per-segment colors for ``mode`` over a curve of ``total`` points.
+
+    Segment ``i`` uses row ``i``. Returns a read-only ``(total, 3)`` uint8
+    array with NumPy, else a tuple of RGB tuples. Cached by mode and count.
+    """
+    total = max(total, 1)
+    table = color_rows(mode, total, 0, total)
+    if _HAS_NUMPY:
+        table.flags.writeable = False
+        return table
+    return tuple(table)
+
+
+def color_rows(mode, total, start, end):
+    """Rows ``start..end-1`` of ``color_table(mode, total)``, computed
+    without building the whole table (for streamed curves). Uncached."""
+    total = max(total, 1)
+    idx   = np.arange(start, end) if _HAS_NUMPY else range(start, end)
+    if mode == "rainbow":
+        return _rainbow(idx, total)
+    if isinstance(mode, tuple) and mode and mode[0] == "gradient":
+        return _gradient(mode[1], idx, total)
+    return _solid(mode, len(idx))
+
+
+def color_at(mode, idx, total):
+    """Single segment color as an RGB tuple."""
+    row = color_table(mode, total)[idx % max(total, 1)]
+    return (int(row[0]), int(row[1]), int(row[2]))
+
+
+def _rainbow(idx, total):
+    # Same arithmetic as colorsys.hsv_to_rgb(h, 1.0, 1.0) so both paths
+    # produce identical bytes.
+    if not _HAS_NUMPY:
+        out = []
+        for i in idx:
+            r, g, b = colorsys.hsv_to_rgb((i / total) % 1.0, 1.0, 1.0)
+            out.append((int(r * 255), int(g * 255), int(b * 255)))
+        return out
+    n  = len(idx)
+    h6 = ((idx / total) % 1.0) * 6.0
+    i  = h6.astype(int)
+    f  = h6 - i
+    q  = 1.0 - f
+    t  = 1.0 - (1.0 - f)
+    one, zero = np.ones(n), np.zeros(n)
+    sector = [(one, t, zero), (q, one, zero), (zero, one, t),
+              (zero, q, one), (t, zero, one), (one, zero, q)]
+    i  %= 6
+    rgb = np.empty((n, 3))
+    for s, chans in enumerate(sector):
+        m = i == s
+        for c in range(3):
+            rgb[m, c] = chans[c][m]
+    return (rgb * 255).astype(np.uint8)
+
+
+def _gradient(stops, idx, total):
+    n = len(stops)
+    if n == 1:
+        return _solid(stops[0], len(idx))
+    if not _HAS_NUMPY:
+        out = []
+        for i in idx:
+            x  = i / total * (n - 1)
+            k  = min(int(x), n - 2)
+            f  = x - k
+            a, b = stops[k], stops[k + 1]
+            out.append(tuple(int(a[c] + (b[c] - a[c]) * f) for c in range(3)))
+        return out
+    x   = idx / total * (n - 1)
+    xp  = np.arange(n)
+    arr = np.asarray(stops, dtype=float)
+    rgb = np.stack([np.interp(x, xp, arr[:, c]) for c in range(3)], axis=1)
+    return rgb.astype(np.uint8)
+
+
+def _solid(color, total):
+    if _HAS_NUMPY:
+        return np.tile(np.array(tuple(color), dtype=np.uint8), (total, 1))
+    return [tuple(color)] * total
@@ -0,0 +1,176 @@
+"""Process-wide performance counters and timers.
+
+Engines, widgets and renderers report into named metrics here; the live
+HUD (F3 in both frontends), the benchmarks and tests read them back with
+``snapshot``. Recording is always on and costs a lock and a deque append,
+so it is safe on per-frame paths.
+
+- ``timer(name)`` / ``timed(name)`` / ``record(name, seconds)``:
+  durations; the last PERF_WINDOW samples give percentiles. Timers are
+  also ``tracing`` spans when tracing is on.
+- ``count(name, n)``: event totals with a rate over the last
+  PERF_RATE_WINDOW seconds.
+- ``gauge(name, fn)``: a value sampled at ``snapshot`` time (undo bytes,
+  cache hit rates), for state that already lives elsewhere.
+"""
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import tracing
+from constants import PERF_WINDOW, PERF_RATE_WINDOW
+
+_lock     = threading.Lock()
+_timers   = {}    # name -> _Timer
+_counters = {}    # name -> _Counter
+_gauges   = {}    # name -> zero-argument callable
+
+
+class _Timer:
+    __slots__ = ("samples", "count", "total")
+
+    def __init__(self):
+        self.samples = deque(maxlen=PERF_WINDOW)
+        self.count   = 0
+        self.total   = 0.0
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "count":   self.count,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "p50_ms":  _percentile(ordered, 50) * 1e3,
+            "p95_ms":  _percentile(ordered, 95) * 1e3,
+            "p99_ms":  _percentile(ordered, 99) * 1e3,
+            "max_ms":  (ordered[-1] if ordered else 0.0) * 1e3,
+        }
+
+
+class _Counter:
+    __slots__ = ("total", "recent")
+
+    def __init__(self):
+        self.total  = 0
+        self.recent = deque()    # (perf_counter, n) within the rate window
+
+    def summary(self, now):
+        _trim(self.recent, now)
+        return {"total": self.total,
+                "rate":  sum(n for _, n in self.recent) / PERF_RATE_WINDOW}
+
+
+def _trim(recent, now):
+    while recent and recent[0][0] < now - PERF_RATE_WINDOW:
+        recent.popleft()
+
+
+def _percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))]
+
+
+# ── Recording ─────────────────────────────────────────────────────────────────
+
+def record(name, seconds):
+    with _lock:
+        t = _timers.get(name)
+        if t is None:
+            t = _timers[name] = _Timer()
+        t.samples.append(seconds)
+        t.count += 1
+        t.total += seconds
+
+
+@contextmanager
+def timer(name):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        t1 = time.perf_counter()
+        record(name, t1 - t0)
+        tracing.complete(name, t0, t1)
+
+
+def timed(name):
+    """Decorator: time every call of the function as ``name``."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            with timer(name):
+                return fn(*args, **kwargs)
+        return call
+    return wrap
+
+
+def count(name, n=1):
+    now = time.perf_counter()
+    with _lock:
+        c = _counters.get(name)
+        if c is None:
+            c = _counters[name] = _Counter()
+        c.total += n
+        c.recent.append((now, n))
+        _trim(c.recent, now)
+
+
+def gauge(name, fn):
+    """Register ``fn()`` to be sampled as ``name``; replaces any previous one."""
+    with _lock:
+        _gauges[name] = fn
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+
+def snapshot():
+    """All metrics as plain data:
+    ``{"timers": {name: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}},
+    "counters": {name: {total, rate}}, "gauges": {name: value}}``."""
+    now = time.perf_counter()
+    with _lock:
+        timers   = {name: t.summary() for name, t in _timers.items()}
+        counters = {name: c.summary(now) for name, c in _counters.items()}
+        gauges   = dict(_gauges)
+    return {"timers": timers, "counters": counters,
+            "gauges": {name: fn() for name, fn in gauges.items()}}
+
+
+def reset():
+    """Drop all timer and counter samples; gauges stay registered."""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def hud_lines(stats):
+    """Short text lines summarizing ``snapshot()`` for the HUD overlays."""
+    t, c, g = stats["timers"], stats["counters"], stats["gauges"]
+
+    def ms(name, key="mean_ms"):
+        return f"{t[name][key]:.1f}" if name in t else "–"
+
+    lines = [
+        f"frame ms  p50 {ms('frame', 'p50_ms')}  p95 {ms('frame', 'p95_ms')}"
+        f"  p99 {ms('frame', 'p99_ms')}",
+        f"draw  {c.get('engine.segments', {}).get('rate', 0):,.0f} seg/s"
+        f"  step {ms('engine.step')} ms  compute {ms('engine.compute')} ms",
+    ]
+    if "canvas.upload" in t:
+        lines.append(f"canvas upload {ms('canvas.upload')} ms")
+    else:
+        lines.append(f"panel {ms('render.panel')} ms  canvas {ms('render.canvas')} ms"
+                     f"  preview {ms('preview.frame')} ms")
+    frames  = t.get("preview.frame", {}).get("count", 0)
+    rebuilt = c.get("preview.static.miss", {}).get("total", 0)
+    preview = f"{1 - rebuilt / frames:.0%}" if frames else "–"
+    disk    = g.get("cache.disk.hit_rate")
+    curves  = f"{g.get('cache.curve.hit_rate', 0):.0%}"
+    if disk is not None:
+        curves += f" (disk {disk:.0%})"
+    lines.append(f"undo {g.get('undo.bytes', 0) / 2 ** 20:.1f} MB"
+                 f"  curve cache {curves}  preview cache {preview}")
+    return lines
@@ -0,0 +1,46 @@
+"""Streaming 8-bit RGB PNG encoder.
+
+Rows are compressed as they arrive, so neither the raw image nor the whole
+compressed stream has to be held at once, and ``zlib`` releases the GIL
+while it works, so encoding on a worker thread does not stall the UI.
+"""
+import struct
+import zlib
+
+
+class PNGWriter:
+    """Minimal 8-bit RGB PNG encoder fed one block of rows at a time."""
+
+    def __init__(self, path, width, height, level=6):
+        self.width   = width
+        self.height  = height
+        self._rows   = 0
+        self._fh     = open(path, "wb")
+        self._z      = zlib.compressobj(level)
+        self._fh.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def write_rows(self, rows):
+        """Append an iterable of packed RGB rows, ``width * 3`` bytes each."""
+        lines = bytearray()
+        for row in rows:
+            lines += b"\x00"                    # filter type: None
+            lines += row
+            self._rows += 1
+        data = self._z.compress(lines)
+        if data:
+            self._chunk(b"IDAT", data)
+
+    def close(self):
+        if self._rows != self.height:
+            raise ValueError(f"wrote {self._rows} of {self.height} rows")
+        self._chunk(b"IDAT", self._z.flush())
+        self._chunk(b"IEND", b"")
+        self._fh.close()
+
+    def abort(self):
+        self._fh.close()
+
+    def _chunk(self, tag, data):
+        self._fh.write(struct.pack(">I", len(data)) + tag + data)
+        self._fh.write(struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
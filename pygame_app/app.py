@@ -1,28 +1,36 @@
 import os
-import sys as _sys
-_sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-_sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
+import time
 import pygame
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-from constants import WINDOW_W, WINDOW_H, SAVE_DIR
-from utils import load_fonts
-from drawing_engine import DrawingEngine
-from ui_layout import build_ui
-from renderer import draw_panel, draw_canvas
+import perf
+import startup
+import tracing
+from constants import WINDOW_W, WINDOW_H, EXPORT_SIZE, FLASH_SECS, FLASH_ERROR_SECS
+from history import layers_from_history
+from save_queue import SaveQueue, save_path, error_text
+from .utils import load_fonts
+from .drawing_engine import DrawingEngine
+from .ui_layout import build_ui
+from .renderer import PanelRenderer, CanvasRenderer
+from .hud import PerfHUD
+from .explorer_view import ExplorerView
 
 
 class App:
     def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_W, WINDOW_H))
-        pygame.display.set_caption("Spirograph Studio")
+        with startup.phase("window"):
+            pygame.init()
+            self.screen = pygame.display.set_mode((WINDOW_W, WINDOW_H))
+            pygame.display.set_caption("Spirograph Studio")
 
-        self.fonts  = load_fonts()
-        self.engine = DrawingEngine()
+        with startup.phase("fonts"):
+            self.fonts  = load_fonts()
+        with startup.phase("engine"):
+            self.engine = DrawingEngine()
 
-        ui = build_ui(self.fonts)
+        with startup.phase("widgets"):
+            ui = build_ui(self.fonts)
         self.preview      = ui["preview"]
         self.sliders      = ui["sliders"]
         self.color_picker = ui["color_picker"]
@@ -30,9 +38,32 @@ class App:
         self.buttons      = ui["buttons"]
         self.btn_draw, self.btn_undo, self.btn_clear, self.btn_save = self.buttons
 
-        self.save_flash = 0
-        self.tick       = 0
-        self.clock      = pygame.time.Clock()
+        with startup.phase("renderers"):
+            self.panel_renderer  = PanelRenderer(self)
+            self.canvas_renderer = CanvasRenderer()
+            self.hud             = PerfHUD(self.fonts)
+            self.explorer_view   = ExplorerView(self)
+        perf.gauge("undo.bytes", lambda: self.engine.undo_bytes)
+
+        self.flash_text   = ""      # status-bar message, cleared at _flash_until
+        self._flash_until = 0.0
+        self.flash_ok     = True
+        self.tick         = 0
+        self.clock        = pygame.time.Clock()
+        self._full_update = True   # push the whole window on the next frame
+
+        # Curves are computed off the UI thread; one worker, newest job wins.
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="spiro-compute")
+        self._compute  = None      # (job, future) of the pending Draw
+        self._exporter = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="spiro-export")
+        self._export   = None      # future of the running export
+        self._export_path = None   # file it writes
+        self.export_label = ""
+        self.export_pct   = None   # percent done, None if not reported
+        self._saver          = SaveQueue()
+        self._save_requested = None   # path of a Save waiting for the layer to finish
 
     # ── Slider value accessors ─────────────────────────────────────────────────
     def R(self): return self.sliders[0].value
@@ -40,23 +71,40 @@ class App:
     def d(self): return self.sliders[2].value
 
     # ── Event handling ─────────────────────────────────────────────────────────
+    @tracing.traced("app.handle_events")
     def _handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._full_update = True
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
                 if event.key == pygame.K_z and (event.mod & pygame.KMOD_META
                                                 or event.mod & pygame.KMOD_CTRL):
                     self.engine.pop_undo()
+                if event.key == pygame.K_e:
+                    self._export_hires()
+                if event.key == pygame.K_v:
+                    self._export_vector("svg")
+                if event.key == pygame.K_p:
+                    self._export_vector("pdf")
+                if event.key == pygame.K_F3:
+                    self.hud.toggle()
+                if event.key == pygame.K_x:
+                    self._toggle_explorer()
+
+            cell = self.explorer_view.handle_event(event)
+            if cell is not None:
+                self._load_params(cell)
 
             handled = any(s.handle_event(event) for s in self.sliders)
             if not handled:
                 self.color_picker.handle_event(event)
 
             if self.btn_draw.is_clicked(event):
-                self.engine.start(self.R(), self.r(), self.d())
+                self._draw()
             elif self.btn_undo.is_clicked(event):
                 self.engine.pop_undo()
             elif self.btn_clear.is_clicked(event):
@@ -66,21 +114,118 @@ class App:
 
         return True
 
+    # ── Explorer ───────────────────────────────────────────────────────────────
+    def _toggle_explorer(self):
+        self.explorer_view.toggle()
+        if not self.explorer_view.visible:
+            self.canvas_renderer.invalidate()
+
+    def _load_params(self, cell):
+        for slider, value in zip(self.sliders, cell):
+            slider.set_value(value)
+
+    # ── Background compute ─────────────────────────────────────────────────────
+    def _draw(self):
+        job = self.engine.request(self.R(), self.r(), self.d())
+        if self._compute is not None:
+            self._compute[1].cancel()   # superseded; no-op if already running
+        self._compute = (job, self._executor.submit(self.engine.compute, job))
+
+    def _poll_compute(self):
+        if self._compute is None or not self._compute[1].done():
+            return
+        (job, future), self._compute = self._compute, None
+        if future.cancelled():
+            return
+        try:
+            self.engine.accept(job, future.result())
+        except Exception as exc:    # bad parameters, MemoryError on a huge curve
+            self.engine.cancel()
+            self._flash(f"✗  Curve failed: {error_text(exc)}", ok=False)
+
+    # ── Export ─────────────────────────────────────────────────────────────────
+    def _export_hires(self):
+        from export import export_png     # PIL and multiprocessing: load on first use
+        self._start_export(f"{EXPORT_SIZE}px", 0, export_png, save_path(f"_{EXPORT_SIZE}px.png"),
+                           EXPORT_SIZE, progress=self._on_export_progress)
+
+    def _export_vector(self, ext):
+        import vector_export
+        writer = vector_export.write_svg if ext == "svg" else vector_export.write_pdf
+        self._start_export(ext.upper(), None, writer, save_path(f".{ext}"))
+
+    def _start_export(self, label, pct, fn, fname, *args, **kwargs):
+        """Run ``fn(layers, fname, *args, **kwargs)`` on the export thread
+        with a snapshot of the layer history; one export at a time."""
+        if self._export is not None:
+            return
+        layers = layers_from_history(self.engine.commands)
+        self.export_label = label
+        self.export_pct   = pct
+        self._export      = self._exporter.submit(fn, layers, fname, *args, **kwargs)
+        self._export_path = fname
+
+    @property
+    def exporting(self):
+        return self._export is not None
+
+    def _on_export_progress(self, rows, size):
+        self.export_pct = 100 * rows // size
+
+    def _poll_export(self):
+        if self._export is None or not self._export.done():
+            return
+        future, self._export = self._export, None
+        error = future.exception()
+        if error is None:
+            self._flash(f"✓  Exported {os.path.basename(self._export_path)}")
+        else:
+            self._flash(f"✗  {self.export_label} export failed: {error_text(error)}", ok=False)
+
+    def _flash(self, text, ok=True):
+        """Show ``text`` in the status bar for a few seconds."""
+        self.flash_text   = text
+        self.flash_ok     = ok
+        self._flash_until = time.monotonic() + (FLASH_SECS if ok else FLASH_ERROR_SECS)
+
+    # ── Saving ─────────────────────────────────────────────────────────────────
     def _save(self):
-        fname = os.path.join(SAVE_DIR,
-                             f"spirograph_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
-        pygame.image.save(self.engine.canvas, fname)
-        self.save_flash = 120
+        self._save_requested = save_path()
+
+    @property
+    def saving(self):
+        return self._save_requested is not None or self._saver.busy
+
+    def _poll_saves(self):
+        """Snapshot a requested save once no layer is mid-animation, report
+        finished saves, and autosave between layers."""
+        for _path, error in self._saver.poll():
+            if error is None:
+                self._flash("✓  Saved to Desktop/spirograph")
+            else:
+                self._flash(f"✗  Save failed: {error_text(error)}", ok=False)
+        if self.engine.drawing:
+            return
+        if self._save_requested is not None:
+            self._saver.save(self.engine.snapshot(), self._save_requested)
+            self._save_requested = None
+        self._saver.autosave(self.engine.revision, self.engine.snapshot)
 
     # ── Main loop ──────────────────────────────────────────────────────────────
     def run(self):
         running = True
         while running:
-            self.clock.tick(60)
+            perf.record("frame", self.clock.tick(60) / 1000)
             self.tick += 1
             mouse = pygame.mouse.get_pos()
 
             running = self._handle_events()
+            self._poll_compute()
+            self._poll_export()
+            self._poll_saves()
+            if self.flash_text and time.monotonic() >= self._flash_until:
+                self.flash_text = ""
+            self.btn_draw.text = "Computing…" if self.engine.computing else "Draw"
 
             self.engine.step(
                 self.sliders[3].value * 5,
@@ -88,8 +233,25 @@ class App:
                 self.color_picker,
             )
 
-            draw_canvas(self.screen, self)
-            draw_panel(self.screen, self, mouse, self.tick)
-            pygame.display.flip()
+            if self.explorer_view.visible:
+                dirty    = self.explorer_view.draw(self.screen, self)
+                backdrop = self.explorer_view.surface
+            else:
+                dirty    = self.canvas_renderer.draw(self.screen, self)
+                backdrop = self.engine.canvas
+            dirty += self.panel_renderer.draw(self.screen, self, mouse, self.tick)
+            dirty += self.hud.draw(self.screen, backdrop)
+            if self._full_update:
+                self._full_update = False
+                pygame.display.flip()
+            elif dirty:
+                pygame.display.update(dirty)
+            if self.tick == 1:
+                startup.ready()
+                startup.report()
 
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._exporter.shutdown(wait=False, cancel_futures=True)
+        self._saver.shutdown()
+        self.explorer_view.explorer.shutdown()
         pygame.quit()
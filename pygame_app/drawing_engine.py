@@ -1,76 +1,217 @@
-import os as _os, sys as _sys
-_sys.path.insert(0, _os.path.dirname(_os.path.abspath(__file__)))
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-
 import pygame
+import perf
+import tracing
+from raster import pixel_runs
 from spiro_math import SpiroMath
-from utils import make_canvas_bg
-from constants import CANVAS_SIZE, CANVAS_MARGIN
+from history import History, DrawCommand, ClearCommand
+from palette import color_table, color_rows
+from .utils import make_canvas_bg
+from constants import (CANVAS_SIZE, CANVAS_MARGIN, DRAW_REF_STEPS,
+                       CURVE_STREAM_STEPS, CURVE_STREAM_MAX)
 
 
 class DrawingEngine:
-    """Owns the canvas surface, undo stack, and drawing animation state."""
-
-    MAX_UNDO = 20
+    """Owns the canvas surface, undo history, and drawing animation state."""
 
     def __init__(self):
         self._spiro      = SpiroMath()
         self._canvas_bg  = make_canvas_bg(CANVAS_SIZE)
         self.canvas      = self._canvas_bg.copy()
         self.drawing     = False
+        self.computing   = False   # a requested layer's curve is on a worker
+        self._job_id     = 0
         self.draw_index  = 0
         self.draw_points = []
         self.draw_total  = 0
+        self._draw_carry = 0.0
+        self._base       = 0      # curve index of draw_points[0]
+        self._stream     = None   # remaining point batches of a streamed curve
+        self._window_colors = (None, None)
         self.layer_count = 0
-        self._undo_stack = []
+        self.revision    = 0      # bumped whenever the layer history changes
+        self._history    = History(CANVAS_SIZE, self._read_tile, self._write_tile)
+        self._layer      = None   # DrawCommand being animated
+        self._dirty      = self._full_rect()   # start dirty so the first frame shows it
 
     # ── Undo ───────────────────────────────────────────────────────────────────
-    def push_undo(self):
-        self._undo_stack.append(self.canvas.copy())
-        if len(self._undo_stack) > self.MAX_UNDO:
-            self._undo_stack.pop(0)
+    def push_undo(self, cmd):
+        self._history.push(cmd)
+        self.revision += 1
 
     def pop_undo(self):
-        if self._undo_stack:
-            self.drawing     = False
-            self.canvas      = self._undo_stack.pop()
-            self.layer_count = max(0, self.layer_count - 1)
+        if self.computing:          # nothing drawn yet: undo just drops the request
+            self.cancel()
+            return
+        if not self._history:
+            return
+        self.drawing     = False
+        self._layer      = None
+        cmd              = self._history.pop()
+        self.layer_count = cmd.layers_before
+        self.revision   += 1
+        self._dirty      = self._full_rect()
+
+    def _read_tile(self, rect):
+        return pygame.image.tobytes(self.canvas.subsurface(rect), "RGB")
+
+    def _write_tile(self, rect, raw):
+        self.canvas.blit(pygame.image.frombytes(raw, rect[2:], "RGB"), rect[:2])
 
     @property
     def undo_count(self):
-        return len(self._undo_stack)
+        return len(self._history)
+
+    @property
+    def undo_bytes(self):
+        """Compressed undo tiles held in RAM and spilled to disk."""
+        store = self._history.store
+        return store.ram_bytes + store.spilled_bytes
+
+    @property
+    def commands(self):
+        """The undo log, oldest first. Read only."""
+        return self._history.commands
 
     # ── Canvas control ─────────────────────────────────────────────────────────
+    def snapshot(self):
+        """The canvas as ``(width, height, rgb_bytes)``, for ``SaveQueue``."""
+        return (*self.canvas.get_size(), pygame.image.tobytes(self.canvas, "RGB"))
+
     def clear(self):
-        self.push_undo()
+        self.cancel()
+        self.push_undo(ClearCommand(self.layer_count))
+        self._history.touch_all()
         self.drawing     = False
-        self.canvas      = self._canvas_bg.copy()
+        self._layer      = None
+        self.canvas.blit(self._canvas_bg, (0, 0))
         self.layer_count = 0
+        self._dirty      = self._full_rect()
 
     # ── Drawing ────────────────────────────────────────────────────────────────
-    def start(self, R, r, d):
-        pts     = self._spiro.compute_points(R, r, d)
-        max_ext = max(max(abs(v) for pt in pts for v in pt), 1)
-        scale   = (CANVAS_SIZE / 2 - CANVAS_MARGIN) / max_ext
-        cx = cy = CANVAS_SIZE // 2
-        self.draw_points = [(cx + x * scale, cy + y * scale) for x, y in pts]
-        self.draw_total  = len(self.draw_points)
+    def request(self, R, r, d):
+        """Supersede any running or pending layer and return a job for
+        ``compute``; hand the result to ``accept``."""
+        self.drawing   = False
+        self._layer    = None
+        self._history.seal()
+        self._job_id  += 1
+        self.computing = True
+        return (self._job_id, R, r, d)
+
+    @perf.timed("engine.compute")
+    def compute(self, job):
+        """Curve for ``job`` as ``(total_points, batches)``. Touches no
+        engine state, so it is safe to run on a worker thread.
+
+        Curves up to CURVE_STREAM_STEPS samples come back whole (one batch,
+        from the shared cache); finer ones as a lazy stream of batches that
+        ``step`` evaluates as the pen reaches them.
+        """
+        _, R, r, d = job
+        steps = self._spiro.steps_for(R, r, d, CANVAS_SIZE, CANVAS_MARGIN,
+                                      max_steps=CURVE_STREAM_MAX)
+        if steps > CURVE_STREAM_STEPS:
+            return steps + 1, self._spiro.stream_curve(R, r, d, CANVAS_SIZE, CANVAS_MARGIN, steps)
+        points = self._spiro.curve(R, r, d, CANVAS_SIZE, CANVAS_MARGIN, steps)
+        return len(points), iter((points,))
+
+    def accept(self, job, curve):
+        """Start animating ``curve``; returns False if ``job`` was
+        superseded or cancelled in the meantime."""
+        if not self.computing or job[0] != self._job_id:
+            return False
+        _, R, r, d = job
+        self.computing   = False
+        self.draw_total, self._stream = curve
+        self.draw_points = next(self._stream)
+        self._base       = 0
         self.draw_index  = 1
-        self.push_undo()
+        self._draw_carry = 0.0
+        self._layer      = DrawCommand(R, r, d, self.layer_count, self.draw_total)
+        self.push_undo(self._layer)
         self.drawing = True
+        return True
+
+    def cancel(self):
+        """Drop the pending request, if any; its result will be ignored."""
+        self._job_id  += 1
+        self.computing = False
+
+    @tracing.traced("engine.start")
+    def start(self, R, r, d):
+        """Compute and start a layer synchronously."""
+        job = self.request(R, r, d)
+        self.accept(job, self.compute(job))
+
+    def _segments_for(self, speed):
+        """Convert ``speed`` (segments per frame at DRAW_REF_STEPS samples)
+        to this curve's sample count, so a Draw takes the same time however
+        densely the curve is sampled."""
+        self._draw_carry += speed * self.draw_total / DRAW_REF_STEPS
+        n = int(self._draw_carry)
+        self._draw_carry -= n
+        return n
+
+    def _draw_run(self, pts, start, end, thick, colors):
+        if end <= start:
+            return
+        runs, (x0, y0, x1, y1) = pixel_runs(pts, start, end, colors)
+        pad = thick + 1
+        self._history.touch(x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+        self._mark_dirty(pygame.Rect(x0 - pad, y0 - pad,
+                                     x1 - x0 + pad * 2 + 1, y1 - y0 + pad * 2 + 1))
+        for col, poly in runs:
+            pygame.draw.lines(self.canvas, col, False, poly, thick)
+
+    def _colors(self, mode):
+        """Segment colors indexed like ``draw_points``: the cached table for
+        a whole curve, or just the current batch's rows for a stream."""
+        if len(self.draw_points) == self.draw_total:
+            return color_table(mode, self.draw_total)
+        key = (mode, self._base)
+        if self._window_colors[0] != key:
+            end = self._base + len(self.draw_points)
+            self._window_colors = (key, color_rows(mode, self.draw_total, self._base, end))
+        return self._window_colors[1]
 
     def step(self, speed, thick, color_picker):
         if not self.drawing:
             return
-        for _ in range(speed):
+        with perf.timer("engine.step"):
+            start = self.draw_index
+            end   = min(start + self._segments_for(speed), self.draw_total)
+            mode  = color_picker.color_mode()
+            seg   = start
+            while seg < end:
+                stop = min(end, self._base + len(self.draw_points))
+                if stop <= seg:                 # pen reached the end of this batch
+                    self._base      += len(self.draw_points) - 1
+                    self.draw_points = next(self._stream)
+                    continue
+                b = self._base
+                self._draw_run(self.draw_points, seg - b, stop - b, thick, self._colors(mode))
+                seg = stop
+            self._layer.record(start, end, thick, mode)
+            perf.count("engine.segments", end - start)
+            self.draw_index = end
             if self.draw_index >= self.draw_total:
                 self.drawing      = False
+                self._layer       = None
+                self._stream      = None
                 self.layer_count += 1
-                break
-            p1  = self.draw_points[self.draw_index - 1]
-            p2  = self.draw_points[self.draw_index]
-            col = color_picker.get_color(self.draw_index, self.draw_total)
-            pygame.draw.line(self.canvas, col,
-                             (int(p1[0]), int(p1[1])),
-                             (int(p2[0]), int(p2[1])), thick)
-            self.draw_index += 1
+                self._history.seal()
+
+    # ── Dirty region ───────────────────────────────────────────────────────────
+    def _full_rect(self):
+        return self.canvas.get_rect()
+
+    def _mark_dirty(self, rect):
+        rect = rect.clip(self.canvas.get_rect())
+        self._dirty = rect if self._dirty is None else self._dirty.union(rect)
+
+    def take_dirty(self):
+        """Return the canvas Rect changed since the last call, or None;
+        resets it."""
+        d = self._dirty
+        self._dirty = None
+        return d
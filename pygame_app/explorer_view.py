@@ -0,0 +1,104 @@
+import pygame
+import theme
+from explorer import Explorer, PARAMS
+from spiro_math import SpiroMath
+from .utils import render_text
+from constants import (CANVAS_X, CANVAS_Y, CANVAS_SIZE, EXPLORER_SPAN, EXPLORER_STEPS,
+                       EXPLORER_THUMB)
+
+HEADER_H = 30
+LABEL_H  = 18     # row title above the thumbnails
+VALUE_H  = 16     # value caption below each thumbnail
+ROW_GAP  = 14
+COL_GAP  = 8
+
+
+def render_thumbnail(R, r, d, color):
+    """Thumbnail surface of one curve; runs on an explorer pool thread."""
+    surf = pygame.Surface((EXPLORER_THUMB, EXPLORER_THUMB))
+    surf.fill(theme.CANVAS_BG)
+    pts = SpiroMath().fit_points(R, r, d, EXPLORER_THUMB, theme.PREVIEW_MARGIN,
+                                 tol=theme.PREVIEW_GHOST_TOL)
+    pygame.draw.aalines(surf, color, False, [(float(x), float(y)) for x, y in pts])
+    return surf
+
+
+class ExplorerView:
+    """X toggles this grid of neighbouring-parameter thumbnails in place of
+    the canvas. It is redrawn only when the grid moves or thumbnails
+    arrive; clicking a thumbnail returns its ``(R, r, d)``."""
+
+    def __init__(self, app):
+        limits = [(s.min_val, s.max_val) for s in app.sliders[:3]]
+        self.explorer = Explorer(render_thumbnail, limits)
+        self.visible  = False
+        self.rect     = pygame.Rect(CANVAS_X, CANVAS_Y, CANVAS_SIZE, CANVAS_SIZE)
+        self.surface  = pygame.Surface(self.rect.size)
+        self._dirty   = True
+        self._cells   = []   # [(screen rect, (R, r, d))] of the drawn thumbnails
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._dirty  = True
+
+    def handle_event(self, event):
+        """``(R, r, d)`` of a clicked thumbnail, else None."""
+        if not (self.visible and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1):
+            return None
+        for rect, cell in self._cells:
+            if rect.collidepoint(event.pos):
+                return cell
+        return None
+
+    def draw(self, screen, app):
+        """Re-centre on the sliders and redraw if anything changed; returns
+        the touched screen rects."""
+        moved   = self.explorer.update(app.R(), app.r(), app.d(),
+                                       app.color_picker.current_solid())
+        arrived = self.explorer.poll()
+        if not (moved or arrived or self._dirty):
+            return []
+        self._dirty = False
+        self._build(app.fonts)
+        screen.blit(self.surface, self.rect)
+        return [self.rect]
+
+    def _build(self, fonts):
+        surf = self.surface
+        surf.fill(theme.CANVAS_BG)
+        surf.blit(render_text(fonts["section"],
+                              "Explorer  ·  click a thumbnail to load it  ·  X to close",
+                              theme.TEXT_DIM), (14, 9))
+
+        cols   = 2 * EXPLORER_SPAN + 1
+        grid_w = cols * EXPLORER_THUMB + (cols - 1) * COL_GAP
+        row_h  = LABEL_H + EXPLORER_THUMB + VALUE_H
+        x0     = (CANVAS_SIZE - grid_w) // 2
+        y      = HEADER_H + (CANVAS_SIZE - HEADER_H - 3 * row_h - 2 * ROW_GAP) // 2
+        self._cells = []
+        for i, row in enumerate(self.explorer.rows):
+            surf.blit(render_text(fonts["label"],
+                                  f"{PARAMS[i]}  ±{EXPLORER_STEPS[i]}",
+                                  theme.SLIDER_COLORS[i]), (x0, y))
+            for c, cell in enumerate(row):
+                box = pygame.Rect(x0 + c * (EXPLORER_THUMB + COL_GAP), y + LABEL_H,
+                                  EXPLORER_THUMB, EXPLORER_THUMB)
+                self._draw_cell(surf, box, cell, c == EXPLORER_SPAN, i, fonts)
+                if cell is not None:
+                    self._cells.append((box.move(self.rect.topleft), cell))
+            y += row_h + ROW_GAP
+
+    def _draw_cell(self, surf, box, cell, centre, param, fonts):
+        if cell is None:
+            pygame.draw.rect(surf, theme.CARD_EDGE, box, 1, border_radius=6)
+            return
+        img = self.explorer.image(cell)
+        if img is None:
+            pygame.draw.rect(surf, theme.CARD, box, border_radius=6)
+        else:
+            surf.blit(img, box)
+        pygame.draw.rect(surf, theme.DRAW if centre else theme.CARD_EDGE, box,
+                         2 if centre else 1, border_radius=6)
+        val = render_text(fonts["small"], f"{PARAMS[param]}={cell[param]}",
+                          theme.TEXT if centre else theme.TEXT_DIM)
+        surf.blit(val, (box.centerx - val.get_width() // 2, box.bottom + 2))
@@ -0,0 +1,51 @@
+import time
+import pygame
+import perf
+import theme
+from .utils import alpha_rect
+from constants import CANVAS_X, CANVAS_Y, PERF_HUD_REFRESH
+
+
+class PerfHUD:
+    """F3 overlay in the canvas's top-left corner showing ``perf`` metrics.
+
+    The text is re-rendered every PERF_HUD_REFRESH seconds. Every frame the
+    canvas under the overlay is restored and the overlay re-blitted on top,
+    so dirty-region canvas updates never paint over it."""
+
+    LINES = 4
+
+    def __init__(self, fonts):
+        self.visible  = False
+        self._font    = fonts["small"]
+        self.rect     = pygame.Rect(CANVAS_X + 8, CANVAS_Y + 8, theme.HUD_W,
+                                    theme.HUD_PAD * 2 + theme.HUD_LINE_H * self.LINES)
+        self._surface = None
+        self._next    = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._next   = 0.0
+
+    def _build(self):
+        surf = alpha_rect(*self.rect.size, (*theme.CARD, theme.HUD_BG_A), 6).copy()
+        for i, line in enumerate(perf.hud_lines(perf.snapshot())):
+            surf.blit(self._font.render(line, True, theme.TEXT),
+                      (theme.HUD_PAD, theme.HUD_PAD + i * theme.HUD_LINE_H))
+        return surf
+
+    def draw(self, screen, backdrop):
+        """Draw (or erase) the overlay over ``backdrop``, the canvas-sized
+        surface shown at the canvas position; returns the touched rects."""
+        if not self.visible and self._surface is None:
+            return []
+        screen.blit(backdrop, self.rect, self.rect.move(-CANVAS_X, -CANVAS_Y))
+        if not self.visible:
+            self._surface = None
+            return [self.rect]
+        now = time.perf_counter()
+        if now >= self._next:
+            self._surface = self._build()
+            self._next    = now + PERF_HUD_REFRESH
+        screen.blit(self._surface, self.rect)
+        return [self.rect]
@@ -1,19 +1,20 @@
-import os as _os, sys as _sys
-_sys.path.insert(0, _os.path.dirname(_os.path.abspath(__file__)))
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-
 import math
 import pygame
+import perf
 import theme
 from spiro_math import SpiroMath
-from utils import lerp_color
+from .utils import lerp_color, render_text, to_display
 from constants import PREVIEW_SIZE
 
 
 class PreviewWidget:
     """Animated toy-mechanism: outer ring, rolling inner wheel, pen arm,
     pen dot, ghost trace. Everything draws into a local surface so
-    coordinates never leak into the parent panel's space."""
+    coordinates never leak into the parent panel's space.
+
+    The parts that only depend on (R, r, d, pen color) are rendered once
+    into a cached static layer; each frame copies it and draws the moving
+    wheel, gear dots and pen on top."""
 
     def __init__(self, x, y, size):
         self.x    = x
@@ -23,6 +24,16 @@ class PreviewWidget:
         self._ghost_pts    = []
         self._ghost_params = None
         self._spiro        = SpiroMath()
+        self._static       = None   # ghost, ring, ticks, R= label
+        self._static_key   = None
+        self._wheel_fill   = {}     # r_px -> translucent wheel disc
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.x, self.y, self.size, self.size)
+
+    def render_key(self):
+        return self._angle
 
     def update(self, drawing):
         speed = theme.PREVIEW_SPIN_DRAW if drawing else theme.PREVIEW_SPIN_IDLE
@@ -33,20 +44,20 @@ class PreviewWidget:
         if params == self._ghost_params:
             return self._ghost_pts
         self._ghost_params = params
-        raw     = self._spiro.compute_points(R, r, d, steps=theme.PREVIEW_GHOST_STEPS)
-        max_ext = max(max(abs(v) for pt in raw for v in pt), 1)
-        scale   = (self.size * 0.5 - theme.PREVIEW_MARGIN) / max_ext
-        half    = self.size // 2
-        self._ghost_pts = [(half + px * scale, half + py * scale) for px, py in raw]
+        self._ghost_pts = self._spiro.curve(R, r, d, self.size, theme.PREVIEW_MARGIN,
+                                            tol=theme.PREVIEW_GHOST_TOL)
         return self._ghost_pts
 
-    def draw(self, surface, R, r, d, pen_color, fonts):
-        sz        = self.size
-        local     = pygame.Surface((sz, sz), pygame.SRCALPHA)
-        cx = cy   = sz // 2
-        scale     = (sz // 2 - theme.PREVIEW_MARGIN) / (R + 4)
-        r_clamped = min(r, R - 1)
-        inner_rot = -(R - r_clamped) / max(r_clamped, 0.001) * self._angle
+    def _get_static(self, R, r, d, pen_color, fonts):
+        """Everything that only changes with the parameters or pen color."""
+        key = (R, r, d, tuple(pen_color), id(fonts["small"]))
+        if key == self._static_key:
+            return self._static
+        perf.count("preview.static.miss")
+        sz      = self.size
+        local   = pygame.Surface((sz, sz), pygame.SRCALPHA)
+        cx = cy = sz // 2
+        scale   = (sz // 2 - theme.PREVIEW_MARGIN) / (R + 4)
 
         # Ghost trace
         ghost = self._get_ghost(R, r, d)
@@ -65,15 +76,39 @@ class PreviewWidget:
                              (cx + int(R_px * math.cos(a)),
                               cy + int(R_px * math.sin(a))), 1)
 
+        # R= label
+        lbl_R = fonts["small"].render(f"R={R}", True,
+                                      lerp_color(theme.SLIDER_COLORS[0], (200, 200, 255),
+                                                 theme.PREVIEW_LABEL_LERP))
+        local.blit(lbl_R, (cx - lbl_R.get_width() // 2, sz - 16))
+
+        self._static, self._static_key = to_display(local), key
+        return self._static
+
+    def _get_wheel_fill(self, r_px):
+        surf = self._wheel_fill.get(r_px)
+        if surf is None:
+            surf = pygame.Surface((r_px * 2 + 2, r_px * 2 + 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*theme.PREVIEW_WHEEL_FILL, theme.PREVIEW_WHEEL_FILL_A),
+                               (r_px + 1, r_px + 1), r_px)
+            surf = self._wheel_fill[r_px] = to_display(surf)
+        return surf
+
+    @perf.timed("preview.frame")
+    def draw(self, surface, R, r, d, pen_color, fonts):
+        sz        = self.size
+        local     = self._get_static(R, r, d, pen_color, fonts).copy()
+        cx = cy   = sz // 2
+        scale     = (sz // 2 - theme.PREVIEW_MARGIN) / (R + 4)
+        r_clamped = min(r, R - 1)
+        inner_rot = -(R - r_clamped) / max(r_clamped, 0.001) * self._angle
+
         # Inner wheel
         wheel_x = cx + int((R - r_clamped) * scale * math.cos(self._angle))
         wheel_y = cy + int((R - r_clamped) * scale * math.sin(self._angle))
         r_px    = max(2, int(r_clamped * scale))
 
-        wheel_surf = pygame.Surface((r_px * 2 + 2, r_px * 2 + 2), pygame.SRCALPHA)
-        pygame.draw.circle(wheel_surf, (*theme.PREVIEW_WHEEL_FILL, theme.PREVIEW_WHEEL_FILL_A),
-                           (r_px + 1, r_px + 1), r_px)
-        local.blit(wheel_surf, (wheel_x - r_px - 1, wheel_y - r_px - 1))
+        local.blit(self._get_wheel_fill(r_px), (wheel_x - r_px - 1, wheel_y - r_px - 1))
         pygame.draw.circle(local, theme.SLIDER_COLORS[1], (wheel_x, wheel_y), r_px, 2)
 
         # Gear dots + crosshair
@@ -97,13 +132,8 @@ class PreviewWidget:
         pygame.draw.circle(local, (255, 255, 255),   (pen_x, pen_y), theme.PREVIEW_PEN_RING_R)
         pygame.draw.circle(local, pen_color,         (pen_x, pen_y), theme.PREVIEW_PEN_CORE_R)
 
-        # R= / r= labels
-        f     = fonts["small"]
-        lbl_R = f.render(f"R={R}", True,
-                         lerp_color(theme.SLIDER_COLORS[0], (200, 200, 255),
-                                    theme.PREVIEW_LABEL_LERP))
-        local.blit(lbl_R, (cx - lbl_R.get_width() // 2, sz - 16))
-        lbl_r = f.render(f"r={r}", True, theme.SLIDER_COLORS[1])
+        # r= label follows the wheel
+        lbl_r = render_text(fonts["small"], f"r={r}", theme.SLIDER_COLORS[1])
         local.blit(lbl_r, (min(wheel_x + r_px + 3, sz - lbl_r.get_width() - 2), wheel_y - 7))
 
         surface.blit(local, (self.x, self.y))
@@ -1,94 +1,223 @@
-import os as _os, sys as _sys
-_sys.path.insert(0, _os.path.dirname(_os.path.abspath(__file__)))
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-
 import math
 import pygame
+import perf
 import theme
-from utils import draw_card, lerp_color
-from constants import PANEL_W, WINDOW_H, CANVAS_X, CANVAS_Y, CANVAS_SIZE
-
-
-def draw_panel(screen, app, mouse, tick):
-    panel = pygame.Surface((PANEL_W, WINDOW_H))
-    panel.fill(theme.PANEL)
-
-    # Title bar
-    pygame.draw.rect(panel, theme.CARD, pygame.Rect(0, 0, PANEL_W, 44))
-    pygame.draw.line(panel, theme.CARD_EDGE, (0, 44), (PANEL_W, 44))
-    pulse = 0.5 + 0.5 * math.sin(tick * theme.STATUS_PULSE_FREQ)
-    dot_c = lerp_color(theme.STATUS_DOT_IDLE, theme.DRAW, pulse) \
-            if app.engine.drawing else theme.STATUS_DOT_IDLE
-    pygame.draw.circle(panel, dot_c, (16, 22), theme.STATUS_DOT_R)
-    panel.blit(app.fonts["title"].render("SPIROGRAPH STUDIO", True, theme.TEXT), (28, 14))
-
-    # Preview card
-    draw_card(panel, app.cards["preview"])
-    panel.blit(app.fonts["section"].render("👁  Preview", True, theme.TEXT_DIM),
-               (app.cards["preview"].x + 10, app.cards["preview"].y + 8))
-    app.preview.update(app.engine.drawing)
-    app.preview.draw(panel, app.R(), app.r(), app.d(),
-                     app.color_picker.current_solid(), app.fonts)
-
-    # Sliders card
-    draw_card(panel, app.cards["sliders"])
-    panel.blit(app.fonts["section"].render("🎛  Adjust the Shape", True, theme.TEXT_DIM),
-               (app.cards["sliders"].x + 10, app.cards["sliders"].y + 8))
-    for s in app.sliders:
-        s.draw(panel)
-
-    # Color card
-    draw_card(panel, app.cards["color"])
-    app.color_picker.draw(panel)
-
-    # Button card
-    draw_card(panel, app.cards["buttons"])
-    for btn in app.buttons:
-        btn.draw(panel, btn.rect.collidepoint(mouse))
-
-    _draw_status(panel, app)
-    pygame.draw.line(panel, theme.CARD_EDGE, (PANEL_W - 1, 0), (PANEL_W - 1, WINDOW_H))
-    screen.blit(panel, (0, 0))
-
-
-def _draw_status(panel, app):
-    sy = WINDOW_H - 30
-    pygame.draw.line(panel, theme.CARD_EDGE, (0, sy), (PANEL_W, sy))
-    f = app.fonts["small"]
-
-    if app.engine.drawing:
-        pct = app.engine.draw_index / max(app.engine.draw_total, 1)
-        bar = pygame.Rect(8, sy + 8, PANEL_W - 16, 6)
-        pygame.draw.rect(panel, theme.CARD_EDGE, bar,
-                         border_radius=theme.STATUS_PROGRESS_R)
-        if pct > 0:
-            pygame.draw.rect(panel, theme.DRAW,
-                             pygame.Rect(bar.x, bar.y, int(bar.w * pct), bar.h),
+from .utils import draw_card, lerp_color, render_text, alpha_rect, to_display
+from constants import (PANEL_W, WINDOW_W, WINDOW_H,
+                       CANVAS_X, CANVAS_Y, CANVAS_SIZE)
+
+
+class PanelRenderer:
+    """Retained-mode left panel.
+
+    Card chrome, shadows, the title and section headers are rendered once
+    into a background layer. Each frame every widget group computes a
+    render key from its state; only groups whose key changed are restored
+    from the background and redrawn. ``draw`` returns the screen rects it
+    touched.
+    """
+
+    def __init__(self, app):
+        self.surface = to_display(pygame.Surface((PANEL_W, WINDOW_H)))
+        self._chrome = self._build_chrome(app)
+        self.surface.blit(self._chrome, (0, 0))
+        self._keys   = {}
+        self._first  = True
+
+        cards = app.cards
+        self._groups = [
+            ("dot",     pygame.Rect(16 - theme.STATUS_DOT_R - 1, 22 - theme.STATUS_DOT_R - 1,
+                                    theme.STATUS_DOT_R * 2 + 2, theme.STATUS_DOT_R * 2 + 2),
+             self._dot_key,     self._draw_dot),
+            ("preview", app.preview.rect,
+             self._preview_key, self._draw_preview),
+            ("sliders", cards["sliders"].unionall([s.bounds for s in app.sliders]),
+             self._sliders_key, self._draw_sliders),
+            ("color",   cards["color"].union(app.color_picker.bounds),
+             self._color_key,   self._draw_color),
+            ("buttons", cards["buttons"].unionall([b.bounds for b in app.buttons]),
+             self._buttons_key, self._draw_buttons),
+            ("status",  pygame.Rect(0, WINDOW_H - 29, PANEL_W, 29),
+             self._status_key,  self._draw_status),
+        ]
+
+    # ── Background layer ───────────────────────────────────────────────────────
+    @staticmethod
+    def _build_chrome(app):
+        panel = pygame.Surface((PANEL_W, WINDOW_H))
+        panel.fill(theme.PANEL)
+
+        # Title bar
+        pygame.draw.rect(panel, theme.CARD, pygame.Rect(0, 0, PANEL_W, 44))
+        pygame.draw.line(panel, theme.CARD_EDGE, (0, 44), (PANEL_W, 44))
+        panel.blit(render_text(app.fonts["title"], "SPIROGRAPH STUDIO", theme.TEXT), (28, 14))
+
+        for name in ("preview", "sliders", "color", "buttons"):
+            draw_card(panel, app.cards[name])
+        panel.blit(render_text(app.fonts["section"], "👁  Preview", theme.TEXT_DIM),
+                   (app.cards["preview"].x + 10, app.cards["preview"].y + 8))
+        panel.blit(render_text(app.fonts["section"], "🎛  Adjust the Shape", theme.TEXT_DIM),
+                   (app.cards["sliders"].x + 10, app.cards["sliders"].y + 8))
+
+        sy = WINDOW_H - 30
+        pygame.draw.line(panel, theme.CARD_EDGE, (0, sy), (PANEL_W, sy))
+        pygame.draw.line(panel, theme.CARD_EDGE, (PANEL_W - 1, 0), (PANEL_W - 1, WINDOW_H))
+        return to_display(panel)
+
+    # ── Frame ──────────────────────────────────────────────────────────────────
+    @perf.timed("render.panel")
+    def draw(self, screen, app, mouse, tick):
+        app.preview.update(app.engine.drawing)
+        for btn in app.buttons:
+            btn.update(btn.rect.collidepoint(mouse))
+
+        dirty = []
+        for name, region, key_fn, draw_fn in self._groups:
+            key = key_fn(app, tick)
+            if not self._first and self._keys.get(name) == key:
+                continue
+            self._keys[name] = key
+            self.surface.set_clip(region)
+            self.surface.blit(self._chrome, region, region)
+            draw_fn(app, key)
+            pygame.draw.line(self.surface, theme.CARD_EDGE,
+                             (PANEL_W - 1, 0), (PANEL_W - 1, WINDOW_H))
+            self.surface.set_clip(None)
+            dirty.append(region)
+
+        if self._first:
+            self._first = False
+            dirty = [self.surface.get_rect()]
+        for rect in dirty:
+            screen.blit(self.surface, rect, rect)
+        return dirty
+
+    # ── Widget groups: (key, draw) pairs ───────────────────────────────────────
+    def _dot_key(self, app, tick):
+        if not (app.engine.drawing or app.engine.computing):
+            return theme.STATUS_DOT_IDLE
+        pulse = 0.5 + 0.5 * math.sin(tick * theme.STATUS_PULSE_FREQ)
+        return lerp_color(theme.STATUS_DOT_IDLE, theme.DRAW, pulse)
+
+    def _draw_dot(self, app, dot_c):
+        pygame.draw.circle(self.surface, dot_c, (16, 22), theme.STATUS_DOT_R)
+
+    def _preview_key(self, app, tick):
+        return (app.preview.render_key(), app.R(), app.r(), app.d(),
+                app.color_picker.current_solid())
+
+    def _draw_preview(self, app, key):
+        app.preview.draw(self.surface, app.R(), app.r(), app.d(),
+                         app.color_picker.current_solid(), app.fonts)
+
+    def _sliders_key(self, app, tick):
+        return tuple(s.render_key() for s in app.sliders)
+
+    def _draw_sliders(self, app, key):
+        for s in app.sliders:
+            s.draw(self.surface)
+
+    def _color_key(self, app, tick):
+        return app.color_picker.render_key()
+
+    def _draw_color(self, app, key):
+        app.color_picker.draw(self.surface)
+
+    def _buttons_key(self, app, tick):
+        return tuple(b.render_key() for b in app.buttons)
+
+    def _draw_buttons(self, app, key):
+        for btn in app.buttons:
+            btn.draw(self.surface)
+
+    def _status_key(self, app, tick):
+        if app.engine.computing:
+            return ("computing",)
+        if app.engine.drawing:
+            pct = app.engine.draw_index / max(app.engine.draw_total, 1)
+            return ("drawing", int((PANEL_W - 16) * pct), int(pct * 100))
+        if app.exporting:
+            return ("exporting", app.export_label, app.export_pct)
+        if app.saving:
+            return ("saving",)
+        if app.flash_text:
+            return ("flash", app.flash_text, app.flash_ok)
+        return ("idle", app.engine.layer_count, app.engine.undo_count)
+
+    def _draw_status(self, app, key):
+        sy = WINDOW_H - 30
+        f  = app.fonts["small"]
+
+        if key[0] == "drawing":
+            _, fill_w, pct = key
+            bar = pygame.Rect(8, sy + 8, PANEL_W - 16, 6)
+            pygame.draw.rect(self.surface, theme.CARD_EDGE, bar,
                              border_radius=theme.STATUS_PROGRESS_R)
-        panel.blit(f.render(f"Drawing…  {int(pct * 100)}%", True, theme.TEXT_DIM),
-                   (10, sy + 16))
-    elif app.save_flash > 0:
-        app.save_flash -= 1
-        panel.blit(f.render("✓  Saved to Desktop/spirograph", True, theme.SAVE),
-                   (10, sy + 8))
-    else:
-        panel.blit(f.render(
-            f"Layers: {app.engine.layer_count}   Undo: {app.engine.undo_count}",
-            True, theme.TEXT_DIM), (10, sy + 8))
-
-
-def draw_canvas(screen, app):
-    screen.fill(theme.BG)
-    for offset, alpha in theme.CANVAS_AURA_LAYERS:
-        aura = pygame.Surface((CANVAS_SIZE + offset * 2, CANVAS_SIZE + offset * 2),
-                              pygame.SRCALPHA)
-        col  = theme.DRAW if app.engine.drawing else theme.CANVAS_GLOW_IDLE
-        pygame.draw.rect(aura, (*col, alpha), aura.get_rect(),
-                         border_radius=10 + offset)
-        screen.blit(aura, (CANVAS_X - offset, CANVAS_Y - offset))
-
-    pygame.draw.rect(screen, theme.CARD_EDGE,
-                     pygame.Rect(CANVAS_X - 2, CANVAS_Y - 2,
-                                 CANVAS_SIZE + 4, CANVAS_SIZE + 4),
-                     theme.CANVAS_BORDER_W, border_radius=theme.CANVAS_BORDER_R)
-    screen.blit(app.engine.canvas, (CANVAS_X, CANVAS_Y))
+            if fill_w > 0:
+                pygame.draw.rect(self.surface, theme.DRAW,
+                                 pygame.Rect(bar.x, bar.y, fill_w, bar.h),
+                                 border_radius=theme.STATUS_PROGRESS_R)
+            self.surface.blit(render_text(f, f"Drawing…  {pct}%", theme.TEXT_DIM),
+                              (10, sy + 16))
+        elif key[0] == "computing":
+            self.surface.blit(render_text(f, "Computing curve…", theme.TEXT_DIM),
+                              (10, sy + 8))
+        elif key[0] == "exporting":
+            _, label, pct = key
+            text = f"Exporting {label}…" + ("" if pct is None else f"  {pct}%")
+            self.surface.blit(render_text(f, text, theme.TEXT_DIM), (10, sy + 8))
+        elif key[0] == "saving":
+            self.surface.blit(render_text(f, "Saving…", theme.TEXT_DIM), (10, sy + 8))
+        elif key[0] == "flash":
+            _, text, ok = key
+            self.surface.blit(render_text(f, text, theme.SAVE if ok else theme.ERROR),
+                              (10, sy + 8))
+        else:
+            _, layers, undos = key
+            self.surface.blit(render_text(f, f"Layers: {layers}   Undo: {undos}",
+                                          theme.TEXT_DIM), (10, sy + 8))
+
+
+class CanvasRenderer:
+    """Right-hand side: background, aura, border and the drawing canvas.
+
+    The backdrop for the idle and drawing states is pre-rendered; it is
+    re-blitted only when the state flips. Otherwise only the canvas region
+    the engine reports as changed is copied to the screen."""
+
+    def __init__(self):
+        self.rect       = pygame.Rect(PANEL_W, 0, WINDOW_W - PANEL_W, WINDOW_H)
+        self._backdrops = {d: self._build_backdrop(d) for d in (False, True)}
+        self._drawing   = None
+
+    def invalidate(self):
+        """Redraw everything next frame, e.g. after the explorer covered it."""
+        self._drawing = None
+
+    def _build_backdrop(self, drawing):
+        surf = pygame.Surface(self.rect.size)
+        surf.fill(theme.BG)
+        col = theme.DRAW if drawing else theme.CANVAS_GLOW_IDLE
+        for offset, alpha in theme.CANVAS_AURA_LAYERS:
+            surf.blit(alpha_rect(CANVAS_SIZE + offset * 2, CANVAS_SIZE + offset * 2,
+                                 (*col, alpha), 10 + offset),
+                      (CANVAS_X - offset - PANEL_W, CANVAS_Y - offset))
+        pygame.draw.rect(surf, theme.CARD_EDGE,
+                         pygame.Rect(CANVAS_X - 2 - PANEL_W, CANVAS_Y - 2,
+                                     CANVAS_SIZE + 4, CANVAS_SIZE + 4),
+                         theme.CANVAS_BORDER_W, border_radius=theme.CANVAS_BORDER_R)
+        return to_display(surf)
+
+    @perf.timed("render.canvas")
+    def draw(self, screen, app):
+        """Blit what changed; returns the touched screen rects."""
+        changed = app.engine.take_dirty()
+        if app.engine.drawing != self._drawing:
+            self._drawing = app.engine.drawing
+            screen.blit(self._backdrops[self._drawing], self.rect)
+            screen.blit(app.engine.canvas, (CANVAS_X, CANVAS_Y))
+            return [self.rect]
+        if changed is None:
+            return []
+        screen.blit(app.engine.canvas, changed.move(CANVAS_X, CANVAS_Y), changed)
+        return [changed.move(CANVAS_X, CANVAS_Y)]
@@ -1,12 +1,8 @@
-import os as _os, sys as _sys
-_sys.path.insert(0, _os.path.dirname(_os.path.abspath(__file__)))
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-
 import pygame
 import theme
 from constants import PANEL_W, PREVIEW_SIZE
-from preview import PreviewWidget
-from widgets import Slider, Button, ColorPicker
+from .preview import PreviewWidget
+from .widgets import Slider, Button, ColorPicker
 
 
 def build_ui(fonts):
@@ -1,10 +1,11 @@
-import os as _os, sys as _sys
-_sys.path.insert(0, _os.path.dirname(_os.path.abspath(__file__)))
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-
+import json
 import math
+import os
+from functools import lru_cache
+
 import pygame
 import theme
+from constants import FONT_CACHE_PATH
 
 
 def gcd(a, b):
@@ -25,26 +26,114 @@ def clamp(v, lo, hi):
 
 def load_fonts():
     pygame.font.init()
+    files = _font_files([(theme.FONT_FACE_DEFAULT, True), (theme.FONT_FACE_DEFAULT, False),
+                         (theme.FONT_FACE_MONO, True)])
     return {
-        "title":   pygame.font.SysFont(theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_TITLE,   bold=True),
-        "section": pygame.font.SysFont(theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_SECTION, bold=True),
-        "label":   pygame.font.SysFont(theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_LABEL,   bold=True),
-        "value":   pygame.font.SysFont(theme.FONT_FACE_MONO,    theme.FONT_SIZE_VALUE,   bold=True),
-        "btn":     pygame.font.SysFont(theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_BTN,     bold=True),
-        "small":   pygame.font.SysFont(theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_SMALL),
+        "title":   _font(files, theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_TITLE,   bold=True),
+        "section": _font(files, theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_SECTION, bold=True),
+        "label":   _font(files, theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_LABEL,   bold=True),
+        "value":   _font(files, theme.FONT_FACE_MONO,    theme.FONT_SIZE_VALUE,   bold=True),
+        "btn":     _font(files, theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_BTN,     bold=True),
+        "small":   _font(files, theme.FONT_FACE_DEFAULT, theme.FONT_SIZE_SMALL),
     }
 
 
+def _font(files, face, size, bold=False):
+    """What ``SysFont(face, size, bold)`` returns, from a resolved file."""
+    path, fake_bold = files[f"{face}|{int(bold)}"]
+    font = pygame.font.Font(path, size)
+    font.set_bold(fake_bold)
+    return font
+
+
+def _font_files(wanted):
+    """Map ``"face|bold"`` to ``(file, fake_bold)`` for each ``(face, bold)``.
+
+    Resolving a face makes pygame scan every installed font (fc-list,
+    the registry or the font folders), so results are kept in
+    FONT_CACHE_PATH and only re-resolved when a cached file disappears.
+    """
+    try:
+        with open(FONT_CACHE_PATH) as fh:
+            files = json.load(fh)
+    except (OSError, ValueError):
+        files = {}
+    stale = [(face, bold) for face, bold in wanted
+             if f"{face}|{int(bold)}" not in files
+             or not _font_exists(files[f"{face}|{int(bold)}"][0])]
+    if not stale:
+        return files
+    for face, bold in stale:
+        path = pygame.font.match_font(face, bold=bold)
+        # SysFont fakes bold when the face has no bold file.
+        fake = bold and (path is None or path == pygame.font.match_font(face))
+        files[f"{face}|{int(bold)}"] = (path, fake)
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_PATH), exist_ok=True)
+        tmp = FONT_CACHE_PATH + ".part"
+        with open(tmp, "w") as fh:
+            json.dump(files, fh)
+        os.replace(tmp, FONT_CACHE_PATH)
+    except OSError:
+        pass                    # read-only home: resolve again next time
+    return files
+
+
+def _font_exists(path):
+    return path is None or os.path.exists(path)
+
+
+def to_display(surf):
+    """Convert ``surf`` to the display pixel format so blits are plain
+    copies; a no-op before the window exists."""
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if surf.get_flags() & pygame.SRCALPHA else surf.convert()
+
+
+# ── Surface caches ────────────────────────────────────────────────────────────
+_TEXT_CACHE     = {}
+_TEXT_CACHE_MAX = 512
+
+
+def render_text(font, text, color):
+    """``font.render(text, True, color)``, memoized by (font, text, color).
+
+    Returned surfaces are shared, so callers must only blit them."""
+    key  = (font, text, tuple(color))
+    surf = _TEXT_CACHE.get(key)
+    if surf is None:
+        if len(_TEXT_CACHE) >= _TEXT_CACHE_MAX:
+            _TEXT_CACHE.clear()
+        surf = _TEXT_CACHE[key] = to_display(font.render(text, True, color))
+    return surf
+
+
+@lru_cache(maxsize=64)
+def alpha_rect(w, h, rgba, radius=0):
+    """Shared translucent (rounded) rectangle, e.g. a drop shadow or gloss."""
+    surf = pygame.Surface((w, h), pygame.SRCALPHA)
+    pygame.draw.rect(surf, rgba, surf.get_rect(), border_radius=radius)
+    return to_display(surf)
+
+
+@lru_cache(maxsize=32)
+def alpha_disc(radius, rgba):
+    """Shared translucent disc centered in a ``2 * radius`` square."""
+    surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, rgba, (radius, radius), radius)
+    return to_display(surf)
+
+
 def draw_card(surface, rect,
               color=None, edge=None,
               radius=None):
     color  = color  or theme.CARD
     edge   = edge   or theme.CARD_EDGE
     radius = radius or theme.CARD_RADIUS
-    sh = pygame.Surface((rect.w + 4, rect.h + 5), pygame.SRCALPHA)
-    pygame.draw.rect(sh, (0, 0, 0, theme.CARD_SHADOW_A),
-                     sh.get_rect(), border_radius=radius + 2)
-    surface.blit(sh, (rect.x - 1, rect.y + 3))
+    surface.blit(alpha_rect(rect.w + 4, rect.h + 5, (0, 0, 0, theme.CARD_SHADOW_A),
+                            radius + 2),
+                 (rect.x - 1, rect.y + 3))
     pygame.draw.rect(surface, color, rect, border_radius=radius)
     pygame.draw.rect(surface, edge,  rect, 1, border_radius=radius)
 
@@ -57,7 +146,8 @@ def make_canvas_bg(size):
         theme.GRID_VARY_AMP, theme.GRID_VARY_FREQ, theme.GRID_BLUE_TINT,
     )
     for gx in range(sp, size, sp):
+        sx = amp * math.sin(gx * freq)
         for gy in range(sp, size, sp):
-            c = base + int(amp * math.sin(gx * freq) * math.cos(gy * freq))
+            c = base + int(sx * math.cos(gy * freq))
             surf.set_at((gx, gy), (c, c, c + tint))
-    return surf
+    return to_display(surf)
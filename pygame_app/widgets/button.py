@@ -1,10 +1,6 @@
-import os as _os, sys as _sys
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__)))))
-
 import pygame
 import theme
-from utils import lerp_color
+from ..utils import lerp_color, render_text, alpha_rect
 
 
 class Button:
@@ -16,27 +12,40 @@ class Button:
         self.fonts = fonts
         self._t    = 0.0
 
-    def draw(self, surface, hovered):
+    @property
+    def bounds(self):
+        """Everything draw() touches, drop shadow included."""
+        return pygame.Rect(self.rect.x - 1, self.rect.y, self.rect.w + 4, self.rect.h + 10)
+
+    def update(self, hovered):
         self._t += ((1.0 if hovered else 0.0) - self._t) * theme.BTN_HOVER_LERP
-        col = lerp_color(self.color,
-                         tuple(min(255, c + theme.BTN_HOVER_BOOST) for c in self.color),
-                         self._t)
 
-        sh = pygame.Surface((self.rect.w + 4, self.rect.h + 6), pygame.SRCALPHA)
-        pygame.draw.rect(sh, (0, 0, 0, theme.BTN_SHADOW_A),
-                         sh.get_rect(), border_radius=theme.BTN_SHADOW_R)
-        surface.blit(sh, (self.rect.x - 1, self.rect.y + 4))
+    def _fill(self):
+        return lerp_color(self.color,
+                          tuple(min(255, c + theme.BTN_HOVER_BOOST) for c in self.color),
+                          self._t)
+
+    def render_key(self):
+        """Changes exactly when the drawn pixels would."""
+        return (self._fill(), self.icon, self.text)
+
+    def draw(self, surface):
+        col = self._fill()
+
+        surface.blit(alpha_rect(self.rect.w + 4, self.rect.h + 6,
+                                (0, 0, 0, theme.BTN_SHADOW_A), theme.BTN_SHADOW_R),
+                     (self.rect.x - 1, self.rect.y + 4))
 
         pygame.draw.rect(surface, col, self.rect, border_radius=theme.BTN_RADIUS)
 
-        gloss = pygame.Surface((self.rect.w - 4, self.rect.h // 2 - 2), pygame.SRCALPHA)
-        gloss.fill((255, 255, 255, theme.BTN_GLOSS_A))
-        surface.blit(gloss, (self.rect.x + 2, self.rect.y + 2))
+        surface.blit(alpha_rect(self.rect.w - 4, self.rect.h // 2 - 2,
+                                (255, 255, 255, theme.BTN_GLOSS_A)),
+                     (self.rect.x + 2, self.rect.y + 2))
 
         pygame.draw.rect(surface, theme.CARD_EDGE, self.rect,
                          theme.BTN_BORDER_W, border_radius=theme.BTN_RADIUS)
 
-        lbl = self.fonts["btn"].render(f"{self.icon}  {self.text}", True, (255, 255, 255))
+        lbl = render_text(self.fonts["btn"], f"{self.icon}  {self.text}", (255, 255, 255))
         surface.blit(lbl, lbl.get_rect(center=self.rect.center))
 
     def is_clicked(self, event):
@@ -1,10 +1,7 @@
-import os as _os, sys as _sys
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__)))))
-
-import colorsys
 import pygame
 import theme
+from palette import color_at
+from ..utils import render_text
 
 
 class ColorPicker:
@@ -40,19 +37,34 @@ class ColorPicker:
                 return True
         return False
 
+    def color_mode(self):
+        """Hashable pen mode for palette.color_table."""
+        return "rainbow" if self.rainbow else theme.PRESET_COLORS[self.selected]
+
     def get_color(self, idx, total):
-        if self.rainbow:
-            h = (idx / max(total, 1)) % 1.0
-            r, g, b = colorsys.hsv_to_rgb(h, 1.0, 1.0)
-            return (int(r * 255), int(g * 255), int(b * 255))
-        return theme.PRESET_COLORS[self.selected]
+        return color_at(self.color_mode(), idx, total)
 
     def current_solid(self):
         return theme.PRESET_COLORS[self.selected]
 
+    @property
+    def bounds(self):
+        """Everything draw() touches, section header included."""
+        f      = self.fonts
+        header = render_text(f["section"], "🎨  Color", theme.TEXT_DIM).get_rect(
+            topleft=(self.x, self.y - 18))
+        label  = render_text(f["label"], "🌈  Rainbow!", theme.TEXT_DIM).get_rect(
+            topleft=self.rb_pos)
+        swatches = [r.inflate(theme.SWATCH_SEL_EXPAND, theme.SWATCH_SEL_EXPAND)
+                    for r in self.rects]
+        return header.unionall(swatches + [self.rb_rect, label])
+
+    def render_key(self):
+        return (self.selected, self.rainbow)
+
     def draw(self, surface):
         f = self.fonts
-        surface.blit(f["section"].render("🎨  Color", True, theme.TEXT_DIM),
+        surface.blit(render_text(f["section"], "🎨  Color", theme.TEXT_DIM),
                      (self.x, self.y - 18))
 
         for i, (r, col) in enumerate(zip(self.rects, theme.PRESET_COLORS)):
@@ -65,7 +77,7 @@ class ColorPicker:
         pygame.draw.rect(surface, rb_col,       self.rb_rect, border_radius=3)
         pygame.draw.rect(surface, theme.TEXT_DIM, self.rb_rect, 1, border_radius=3)
         if self.rainbow:
-            ck = f["small"].render("✓", True, theme.RAINBOW_CHECK_COLOR)
+            ck = render_text(f["small"], "✓", theme.RAINBOW_CHECK_COLOR)
             surface.blit(ck, ck.get_rect(center=self.rb_rect.center))
         rb_label_col = theme.RAINBOW_ACTIVE_COLOR if self.rainbow else theme.TEXT_DIM
-        surface.blit(f["label"].render("🌈  Rainbow!", True, rb_label_col), self.rb_pos)
+        surface.blit(render_text(f["label"], "🌈  Rainbow!", rb_label_col), self.rb_pos)
@@ -1,11 +1,7 @@
-import os as _os, sys as _sys
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-_sys.path.insert(0, _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__)))))
-
 import math
 import pygame
 import theme
-from utils import clamp
+from ..utils import clamp, render_text, alpha_disc
 
 
 class Slider:
@@ -28,6 +24,9 @@ class Slider:
     def value(self):
         return int(round(self._value))
 
+    def set_value(self, value):
+        self._value = float(clamp(value, self.min_val, self.max_val))
+
     def _vx(self, val):
         r = (val - self.min_val) / (self.max_val - self.min_val)
         return self.track.x + int(r * self.track.w)
@@ -56,14 +55,25 @@ class Slider:
             return True
         return False
 
+    @property
+    def bounds(self):
+        """Everything draw() touches: label row, track and handle glow."""
+        r   = self.HANDLE_R
+        top = self.track.y - 20
+        return pygame.Rect(self.track.x - r * 2, top,
+                           self.track.w + r * 4, self.track.centery + r * 2 - top)
+
+    def render_key(self):
+        return (self.value, self._vx(self._value))
+
     def draw(self, surface):
         hx = self._vx(self._value)
         f  = self.fonts
         r  = self.HANDLE_R
         tr = theme.SLIDER_TRACK_R
 
-        em  = f["label"].render(f"{self.emoji}  {self.label}", True, theme.TEXT)
-        val = f["value"].render(str(self.value), True, self.color)
+        em  = render_text(f["label"], f"{self.emoji}  {self.label}", theme.TEXT)
+        val = render_text(f["value"], str(self.value), self.color)
         surface.blit(em,  (self.track.x, self.track.y - 18))
         surface.blit(val, (self.track.right - val.get_width(), self.track.y - 19))
 
@@ -76,9 +86,8 @@ class Slider:
                              pygame.Rect(track_rect.x, track_rect.y, fw, track_rect.h),
                              border_radius=tr)
 
-        glow = pygame.Surface((r * 4, r * 4), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (*self.color, theme.SLIDER_GLOW_A), (r * 2, r * 2), r * 2)
-        surface.blit(glow, (hx - r * 2, self.track.centery - r * 2))
+        surface.blit(alpha_disc(r * 2, (*self.color, theme.SLIDER_GLOW_A)),
+                     (hx - r * 2, self.track.centery - r * 2))
         pygame.draw.circle(surface, self.color,      (hx, self.track.centery), r)
         pygame.draw.circle(surface, (255, 255, 255), (hx, self.track.centery),
                            r - theme.SLIDER_INNER_TRIM)
@@ -0,0 +1,57 @@
+"""Rasterization helpers shared by the drawing engines and the PNG export."""
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+
+def pixel_runs(pts, start, end, colors):
+    """Group segments ``start..end-1`` of ``pts`` (segment i joins points
+    i-1 and i, colored ``colors[i]``) into same-colored integer polylines
+    for batched drawing.
+
+    Returns ``(runs, box)``: ``runs`` is a list of ``(color, [(x, y), ...])``
+    with consecutive duplicate pixels dropped, ``box`` the
+    ``(x0, y0, x1, y1)`` pixel bounds of every point involved.
+    """
+    seg = pts[start - 1:end]
+    if _HAS_NUMPY and isinstance(seg, np.ndarray) and isinstance(colors, np.ndarray):
+        ip   = seg.astype(int)
+        lo   = ip.min(axis=0)
+        hi   = ip.max(axis=0)
+        box  = (int(lo[0]), int(lo[1]), int(hi[0]), int(hi[1]))
+        col  = colors[start:end]
+        cuts = np.flatnonzero(np.any(col[1:] != col[:-1], axis=1)) + 1
+        keep = np.empty(len(ip), dtype=bool)
+        keep[0]  = True
+        keep[1:] = np.any(ip[1:] != ip[:-1], axis=1)
+        runs  = []
+        bounds = [0, *cuts.tolist(), len(col)]
+        for g0, g1 in zip(bounds, bounds[1:]):
+            mask    = keep[g0:g1 + 1].copy()
+            mask[0] = True
+            poly    = ip[g0:g1 + 1][mask]
+            if len(poly) > 1:
+                runs.append((tuple(col[g0].tolist()), list(map(tuple, poly.tolist()))))
+        return runs, box
+
+    ipts = [(int(x), int(y)) for x, y in seg]
+    xs   = [p[0] for p in ipts]
+    ys   = [p[1] for p in ipts]
+    box  = (min(xs), min(ys), max(xs), max(ys))
+    runs = []
+    col  = tuple(colors[start])
+    poly = [ipts[0]]
+    for i in range(start, end):
+        c = tuple(colors[i])
+        if c != col:
+            if len(poly) > 1:
+                runs.append((col, poly))
+            col, poly = c, [poly[-1]]
+        p = ipts[i - start + 1]
+        if p != poly[-1]:
+            poly.append(p)
+    if len(poly) > 1:
+        runs.append((col, poly))
+    return runs, box
@@ -0,0 +1,109 @@
+"""Background PNG saves.
+
+The UI thread only snapshots the canvas as raw RGB bytes (a couple of
+milliseconds); PNG encoding and the file write run on one worker thread,
+in submission order. Files are written under a temporary name and renamed
+into place, so a crash never leaves a truncated PNG and the autosave is
+always the last complete one.
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from constants import SAVE_DIR, AUTOSAVE_PATH, AUTOSAVE_INTERVAL
+from png_writer import PNGWriter
+
+BAND_ROWS = 64   # rows handed to zlib per call
+
+
+class SaveQueue:
+    """Queue of canvas snapshots ``(width, height, rgb_bytes)`` to write.
+
+    ``save`` queues a user save; ``autosave`` queues a crash-recovery save
+    at most every AUTOSAVE_INTERVAL seconds, and only if the canvas changed.
+    ``poll`` hands finished user saves back to the UI thread.
+    """
+
+    def __init__(self, autosave_path=AUTOSAVE_PATH, interval=AUTOSAVE_INTERVAL):
+        self._executor      = ThreadPoolExecutor(max_workers=1,
+                                                 thread_name_prefix="spiro-save")
+        self._pending       = deque()   # (path, future) of user saves, oldest first
+        self._auto          = None      # future of the queued or running autosave
+        self._auto_path     = autosave_path
+        self._interval      = interval
+        self._auto_revision = None      # canvas revision of the last autosave
+        self._auto_due      = time.monotonic() + interval
+
+    @property
+    def busy(self):
+        """True while a user save is queued or being written."""
+        return bool(self._pending)
+
+    def save(self, snapshot, path):
+        self._pending.append((path, self._executor.submit(write_png, snapshot, path)))
+
+    def autosave(self, revision, snapshot):
+        """Queue ``snapshot()`` for the recovery file if the interval has
+        passed and ``revision`` differs from the last one saved. Never
+        queues a second autosave behind one that has not finished."""
+        if (revision == self._auto_revision or time.monotonic() < self._auto_due
+                or (self._auto is not None and not self._auto.done())):
+            return False
+        self._auto_revision = revision
+        self._auto_due      = time.monotonic() + self._interval
+        # Best effort: a failed autosave just leaves its error in the future.
+        self._auto = self._executor.submit(write_png, snapshot(), self._auto_path)
+        return True
+
+    def poll(self):
+        """Return ``[(path, error)]`` for user saves finished since the last
+        call, in order; ``error`` is None on success."""
+        done = []
+        while self._pending and self._pending[0][1].done():
+            path, future = self._pending.popleft()
+            done.append((path, future.exception()))
+        return done
+
+    def shutdown(self):
+        """Finish queued user saves; drop an autosave that has not started."""
+        if self._auto is not None:
+            self._auto.cancel()
+        self._executor.shutdown(wait=True)
+
+
+def save_path(suffix=".png"):
+    """Timestamped path for a new file in SAVE_DIR, which is created
+    here, on the first save, rather than at start-up."""
+    os.makedirs(SAVE_DIR, exist_ok=True)
+    return os.path.join(SAVE_DIR,
+                        f"spirograph_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}")
+
+
+def error_text(exc):
+    """One-line reason for a failed save or export, for the status bar."""
+    if isinstance(exc, OSError) and exc.strerror:
+        return exc.strerror
+    return str(exc) or type(exc).__name__
+
+
+def write_png(snapshot, path):
+    """Encode ``(width, height, rgb_bytes)`` to ``path`` atomically."""
+    w, h, raw = snapshot
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp    = path + ".part"
+    writer = PNGWriter(tmp, w, h)
+    try:
+        view = memoryview(raw)
+        for y0 in range(0, h, BAND_ROWS):
+            writer.write_rows(view[y * w * 3:(y + 1) * w * 3]
+                              for y in range(y0, min(y0 + BAND_ROWS, h)))
+        writer.close()
+    except BaseException:
+        writer.abort()
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return path
+
@@ -1,9 +1,29 @@
+import cmath
 import math
 from math import gcd
 
+from constants import (CURVE_TOL_PX, CURVE_MIN_STEPS, CURVE_MAX_STEPS, CURVE_CHUNK,
+                       CURVE_STREAM_MAX, CURVE_STORE_MIN_STEPS)
+from curve_cache import CURVE_CACHE
+from curve_store import CURVE_STORE
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+# Part of every CURVE_STORE key: bump it whenever the points generated for
+# given parameters change, so curves stored by older versions are not used.
+CURVE_VERSION = 2
+
 
 class SpiroMath:
-    """Hypotrochoid parametric equations and period calculation."""
+    """Hypotrochoid parametric equations and period calculation.
+
+    With NumPy installed, point sets come back as ``(N, 2)`` float arrays;
+    without it they are lists of ``(x, y)`` tuples. Both index the same way.
+    """
 
     def get_period(self, R, r):
         """Number of full inner-wheel loops to complete the curve."""
@@ -11,14 +31,226 @@ class SpiroMath:
         Ri = max(1, int(round(R)))
         return ri // max(1, gcd(Ri, ri))
 
+    def get_lobes(self, R, r):
+        """Number of congruent lobes, or 1 if ``R`` or ``r`` is not an integer.
+
+        In complex form z(t) = (R - r)·e^(it) + d·e^(-ikt) with 1 + k = R/r,
+        so z(t + 2π·r/R) = e^(2πi·r/R)·z(t): each 2π·r/R stretch of the
+        parameter is the previous one rotated by 2π·r/R, and the closed
+        curve is R / gcd(R, r) of them."""
+        if R != int(R) or r != int(r) or not 0 < r < R:
+            return 1
+        return int(R) // gcd(int(R), int(r))
+
+    @staticmethod
+    def max_extent(R, r, d):
+        """Upper bound on |x| and |y| of the curve, |R - r| + |d| by the
+        triangle inequality (at least 1, so scaling never divides by zero)."""
+        return max(abs(R - r) + abs(d), 1)
+
+    def steps_for(self, R, r, d, size, margin, tol=CURVE_TOL_PX,
+                  max_steps=CURVE_MAX_STEPS):
+        """Fewest uniform samples that keep every chord within ``tol`` px of
+        the true curve once it is fitted to a ``size``² canvas.
+
+        |z''(t)| <= |R - r| + |d|·k² with k = (R - r) / r, and a chord over
+        a parameter step h deviates from the arc by at most |z''|·h² / 8.
+        """
+        k       = (R - r) / max(r, 0.001)
+        scale   = (size / 2 - margin) / self.max_extent(R, r, d)
+        accel   = (abs(R - r) + abs(d) * k * k) * scale
+        total_t = 2 * math.pi * self.get_period(R, r)
+        h       = math.sqrt(8 * tol / max(accel, 1e-9))
+        steps   = max(CURVE_MIN_STEPS, math.ceil(total_t / h))
+        lobes   = self.get_lobes(R, r)
+        steps   = -(-steps // lobes) * lobes     # whole lobes: see compute_points
+        return min(max_steps, steps)
+
+    def bezier_steps(self, R, r, d, size, margin, tol, max_steps=CURVE_STREAM_MAX):
+        """Fewest uniform cubic Bézier segments that stay within ``tol`` px
+        of the true curve when each is built from the end points and
+        tangents (``fit_tangents``) of its parameter step.
+
+        Cubic Hermite interpolation over a step h deviates by at most
+        |z⁗|·h⁴ / 384, and |z⁗(t)| <= |R - r| + |d|·k⁴.
+        """
+        k       = (R - r) / max(r, 0.001)
+        scale   = (size / 2 - margin) / self.max_extent(R, r, d)
+        d4_max  = (abs(R - r) + abs(d) * k ** 4) * scale
+        loops   = self.get_period(R, r)
+        h       = (384 * tol / max(d4_max, 1e-9)) ** 0.25
+        steps   = math.ceil(2 * math.pi * loops / h)
+        return max(8 * loops, min(max_steps, steps))
+
     def compute_points(self, R, r, d, steps=6000):
-        """Return list of (x, y) hypotrochoid points centred at origin."""
+        """Return hypotrochoid points centred at origin.
+
+        When ``steps`` is a multiple of the lobe count (``steps_for``
+        rounds to one), only the first lobe is evaluated and the others are
+        rotated copies of it: one complex multiply per point instead of
+        four trig calls."""
+        lobes = self.get_lobes(R, r)
+        if lobes > 1 and steps % lobes == 0:
+            return self._compute_by_rotation(R, r, d, steps, lobes)
         loops   = self.get_period(R, r)
         total_t = 2 * math.pi * loops
+        k       = (R - r) / max(r, 0.001)
+        if _HAS_NUMPY:
+            t   = np.linspace(0.0, total_t, steps + 1)
+            kt  = k * t
+            pts = np.empty((steps + 1, 2))
+            pts[:, 0] = (R - r) * np.cos(t) + d * np.cos(kt)
+            pts[:, 1] = (R - r) * np.sin(t) - d * np.sin(kt)
+            return pts
         pts = []
         for i in range(steps + 1):
             t = total_t * i / steps
-            x = (R - r) * math.cos(t) + d * math.cos((R - r) * t / max(r, 0.001))
-            y = (R - r) * math.sin(t) - d * math.sin((R - r) * t / max(r, 0.001))
+            x = (R - r) * math.cos(t) + d * math.cos(k * t)
+            y = (R - r) * math.sin(t) - d * math.sin(k * t)
             pts.append((x, y))
         return pts
+
+    def _compute_by_rotation(self, R, r, d, steps, lobes):
+        per   = steps // lobes
+        k     = (R - r) / r
+        dt    = 2 * math.pi * self.get_period(R, r) / steps
+        angle = 2 * math.pi * r / R
+        if _HAS_NUMPY:
+            t    = np.arange(per) * dt
+            lobe = (R - r) * np.exp(1j * t) + d * np.exp(-1j * k * t)
+            z    = np.empty(steps + 1, dtype=complex)
+            np.multiply(np.exp(1j * angle * np.arange(lobes))[:, None], lobe,
+                        out=z[:-1].reshape(lobes, per))
+            z[-1] = z[0]                                  # the curve closes
+            return z.view(np.float64).reshape(-1, 2)      # (re, im) = (x, y)
+        lobe  = [(R - r) * cmath.exp(1j * i * dt) + d * cmath.exp(-1j * k * i * dt)
+                 for i in range(per)]
+        pts   = [(z.real, z.imag)
+                 for j in range(lobes) for z in (cmath.exp(1j * angle * j) * p for p in lobe)]
+        pts.append(pts[0])
+        return pts
+
+    def fit_points(self, R, r, d, size, margin, steps=None, tol=CURVE_TOL_PX):
+        """Return points scaled to fill a ``size``² canvas, leaving
+        ``margin`` px on every side, with the origin at the canvas centre.
+        ``steps`` defaults to the adaptive count from ``steps_for``."""
+        if steps is None:
+            steps = self.steps_for(R, r, d, size, margin, tol)
+        pts   = self.compute_points(R, r, d, steps)
+        half  = size // 2
+        scale = (size / 2 - margin) / self.max_extent(R, r, d)
+        if _HAS_NUMPY:
+            pts *= scale
+            pts += half
+            return pts
+        return [(half + x * scale, half + y * scale) for x, y in pts]
+
+    def stream_points(self, R, r, d, size, margin, steps, chunk=CURVE_CHUNK):
+        """Yield the ``steps + 1`` points of ``fit_points`` in batches of at
+        most ``chunk + 1``, never holding the whole curve. Each batch after
+        the first starts with the previous batch's last point, so every
+        segment lies within one batch."""
+        for i0 in range(0, steps, chunk):
+            yield self.fit_range(R, r, d, size, margin, steps, i0, min(i0 + chunk, steps) + 1)
+
+    def fit_range(self, R, r, d, size, margin, steps, i0, i1):
+        """Points ``i0..i1-1`` of ``fit_points(..., steps)``, computed on
+        their own.
+
+        Scaling uses the same analytic ``max_extent`` as ``fit_points``.
+        """
+        loops = self.get_period(R, r)
+        dt    = 2 * math.pi * loops / steps
+        k     = (R - r) / max(r, 0.001)
+        scale = (size / 2 - margin) / self.max_extent(R, r, d)
+        half  = size // 2
+        if _HAS_NUMPY:
+            t   = np.arange(i0, i1) * dt
+            kt  = k * t
+            pts = np.empty((i1 - i0, 2))
+            pts[:, 0] = (R - r) * np.cos(t) + d * np.cos(kt)
+            pts[:, 1] = (R - r) * np.sin(t) - d * np.sin(kt)
+            pts *= scale
+            pts += half
+            return pts
+        pts = []
+        for i in range(i0, i1):
+            t = i * dt
+            x = (R - r) * math.cos(t) + d * math.cos(k * t)
+            y = (R - r) * math.sin(t) - d * math.sin(k * t)
+            pts.append((half + x * scale, half + y * scale))
+        return pts
+
+    def fit_tangents(self, R, r, d, size, margin, steps, i0, i1):
+        """Derivatives of ``fit_range`` points ``i0..i1-1`` with respect to
+        the sample index, i.e. the canvas-space velocity over one step."""
+        loops = self.get_period(R, r)
+        dt    = 2 * math.pi * loops / steps
+        k     = (R - r) / max(r, 0.001)
+        scale = (size / 2 - margin) / self.max_extent(R, r, d) * dt
+        if _HAS_NUMPY:
+            t   = np.arange(i0, i1) * dt
+            kt  = k * t
+            tan = np.empty((i1 - i0, 2))
+            tan[:, 0] = -(R - r) * np.sin(t) - d * k * np.sin(kt)
+            tan[:, 1] = (R - r) * np.cos(t) - d * k * np.cos(kt)
+            tan *= scale
+            return tan
+        tan = []
+        for i in range(i0, i1):
+            t = i * dt
+            x = -(R - r) * math.sin(t) - d * k * math.sin(k * t)
+            y = (R - r) * math.cos(t) - d * k * math.cos(k * t)
+            tan.append((x * scale, y * scale))
+        return tan
+
+    def curve(self, R, r, d, size, margin, steps=None, tol=CURVE_TOL_PX):
+        """``fit_points`` through the shared ``CURVE_CACHE`` and, for curves
+        of CURVE_STORE_MIN_STEPS samples or more, the on-disk
+        ``CURVE_STORE`` behind it. The result is shared with other callers
+        (and possibly a read-only file mapping) and must not be modified."""
+        if steps is None:
+            steps = self.steps_for(R, r, d, size, margin, tol)
+        key = (R, r, d, steps, size, margin)
+        return CURVE_CACHE.get(key, lambda: self._stored_curve(key))
+
+    def _stored_curve(self, key):
+        R, r, d, steps, size, margin = key
+        if steps < CURVE_STORE_MIN_STEPS:
+            return self._frozen(self.fit_points(R, r, d, size, margin, steps))
+        pts = CURVE_STORE.load((*key, CURVE_VERSION), (steps + 1, 2))
+        if pts is None:
+            pts = self._frozen(self.fit_points(R, r, d, size, margin, steps))
+            CURVE_STORE.save((*key, CURVE_VERSION), pts)
+        return pts
+
+    def stream_curve(self, R, r, d, size, margin, steps, chunk=CURVE_CHUNK):
+        """``stream_points`` through the on-disk ``CURVE_STORE``: a stored
+        curve comes back as read-only views of its mapping, paged in as the
+        pen reaches them; otherwise batches are computed as usual and the
+        curve is stored once the stream has been read to the end."""
+        key = (R, r, d, steps, size, margin, CURVE_VERSION)
+        pts = CURVE_STORE.load(key, (steps + 1, 2))
+        if pts is not None:
+            for i0 in range(0, steps, chunk):
+                yield pts[i0:min(i0 + chunk, steps) + 1]
+            return
+        out = CURVE_STORE.writer(key, (steps + 1, 2))
+        try:
+            for i, batch in enumerate(self.stream_points(R, r, d, size, margin, steps, chunk)):
+                if out is not None:
+                    out.write(batch if i == 0 else batch[1:])   # drop the shared point
+                yield batch
+            if out is not None:
+                out.commit()
+                out = None
+        finally:
+            if out is not None:
+                out.discard()       # abandoned part-way (layer cancelled)
+
+    @staticmethod
+    def _frozen(pts):
+        if _HAS_NUMPY:
+            pts.flags.writeable = False
+            return pts
+        return tuple(pts)
@@ -1,10 +1,11 @@
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "pygame_app"))
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-from app import App
+import startup
+import tracing
 
 if __name__ == "__main__":
+    startup.enable()
+    tracing.enable()
+    with startup.phase("import pygame"):
+        import pygame  # noqa: F401  (timed apart from the app modules)
+    with startup.phase("import pygame_app"):
+        from pygame_app.app import App
     App().run()
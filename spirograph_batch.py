@@ -0,0 +1,172 @@
+#!/usr/bin/env python3.13
+"""Headless batch renderer for Spirograph Studio.
+
+Reads a CSV or JSON manifest of ``R, r, d, color, width, size`` rows and
+renders each one to a PNG with the PIL DrawingEngine, spread across a
+process pool.
+
+    ./spirograph_batch.py shapes.csv -o out/ -j 8
+
+``color`` is ``#rrggbb``, ``rainbow``, or a ``/``-separated gradient of
+hex stops; ``width`` defaults to 1 and ``size`` to the on-screen canvas
+size. Output names are derived from the parameters, so re-running a
+manifest resumes where it stopped and duplicate rows are rendered once.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from constants import CANVAS_SIZE, DRAW_REF_STEPS
+from palette import color_at
+import theme
+
+
+class _PenColor:
+    """Fixed pen mode with the same interface as ColorPicker.
+
+    ``spec`` is ``#rrggbb``, ``rainbow``, or ``/``-separated hex stops for
+    a multi-stop gradient along the curve (``#f95757/#fcd71e/#1ed2f5``).
+    """
+
+    def __init__(self, spec: str) -> None:
+        self.rainbow = spec == "rainbow"
+        if self.rainbow:
+            self._mode = "rainbow"
+        elif "/" in spec:
+            self._mode = ("gradient", tuple(_parse_hex(s) for s in spec.split("/")))
+        else:
+            self._mode = _parse_hex(spec)
+
+    def color_mode(self):
+        return self._mode
+
+    def get_color(self, idx: int, total: int) -> tuple:
+        return color_at(self._mode, idx, total)
+
+    def current_solid(self) -> tuple:
+        if self.rainbow:
+            return theme.PRESET_COLORS[0]
+        return self._mode[1][0] if self._mode[0] == "gradient" else self._mode
+
+
+def _parse_hex(spec: str) -> tuple:
+    h = spec.strip().lstrip("#")
+    if len(h) != 6:
+        raise ValueError(f"bad color {spec!r}: expected #rrggbb, a /-separated "
+                         f"gradient of them, or 'rainbow'")
+    return tuple(int(h[i:i + 2], 16) for i in (0, 2, 4))
+
+
+# ── Manifest ──────────────────────────────────────────────────────────────────
+
+def _normalize(row: dict) -> tuple:
+    """Turn a manifest row into a hashable ``(R, r, d, color, width, size)``."""
+    R     = int(row["R"])
+    r     = int(row["r"])
+    d     = int(row["d"])
+    if not 0 < r < R:
+        raise ValueError(f"r={r} must be between 0 and R={R}")
+    color = str(row.get("color") or "#ffffff").strip().lower()
+    if color != "rainbow":
+        color = "/".join("#{:02x}{:02x}{:02x}".format(*_parse_hex(c))
+                         for c in color.split("/"))
+    width = int(row.get("width") or 1)
+    size  = int(row.get("size") or CANVAS_SIZE)
+    return (R, r, d, color, width, size)
+
+
+def load_manifest(path: str) -> list:
+    """Read a .json (list of objects) or .csv (header row) manifest.
+
+    Raises ValueError listing every bad row (numbered from 1, not counting
+    a CSV header), so nothing is rendered from a manifest with typos."""
+    with open(path, newline="") as fh:
+        if path.lower().endswith(".json"):
+            rows = json.load(fh)
+        else:
+            rows = list(csv.DictReader(fh))
+    jobs, errors = [], []
+    for n, row in enumerate(rows, 1):
+        try:
+            jobs.append(_normalize(row))
+        except KeyError as exc:
+            errors.append(f"row {n}: missing {exc.args[0]!r}")
+        except (TypeError, ValueError) as exc:
+            errors.append(f"row {n}: {exc}")
+    if errors:
+        raise ValueError(f"{path}: {len(errors)} bad row(s)\n  " + "\n  ".join(errors))
+    return jobs
+
+
+def output_name(job: tuple) -> str:
+    R, r, d, color, width, size = job
+    slug = color.replace("#", "").replace("/", "-")
+    return f"spiro_R{R}_r{r}_d{d}_{slug}_w{width}_{size}px.png"
+
+
+# ── Rendering (runs in pool workers) ──────────────────────────────────────────
+
+def render_job(args: tuple) -> str:
+    """Render one job to ``out_dir``; returns the written path."""
+    from tui.drawing_engine import DrawingEngine
+
+    job, out_dir = args
+    R, r, d, color, width, size = job
+    pen    = _PenColor(color)
+    engine = DrawingEngine(size)
+    engine.start(R, r, d)
+    while engine.drawing:
+        engine.step(DRAW_REF_STEPS, width, pen)
+
+    path = os.path.join(out_dir, output_name(job))
+    tmp  = path + ".part"
+    engine.canvas.save(tmp, format="PNG")
+    os.replace(tmp, path)       # a killed run never leaves a truncated PNG
+    return path
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Render a manifest of spirographs to PNG.")
+    ap.add_argument("manifest", help="CSV or JSON file of R, r, d, color, width, size")
+    ap.add_argument("-o", "--out", default="spirograph_batch", help="output directory")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes (default: all cores)")
+    ap.add_argument("--force", action="store_true",
+                    help="re-render images that already exist")
+    args = ap.parse_args(argv)
+
+    try:
+        jobs = list(dict.fromkeys(load_manifest(args.manifest)))
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+    todo = [j for j in jobs
+            if args.force or not os.path.exists(os.path.join(args.out, output_name(j)))]
+    print(f"{len(jobs)} unique jobs, {len(jobs) - len(todo)} already rendered, "
+          f"{len(todo)} to go")
+    if not todo:
+        return 0
+
+    t0 = time.perf_counter()
+    with multiprocessing.Pool(max(1, args.jobs)) as pool:
+        work = [(job, args.out) for job in todo]
+        for n, _path in enumerate(pool.imap_unordered(render_job, work), 1):
+            if n % 25 == 0 or n == len(todo):
+                rate = n / (time.perf_counter() - t0)
+                print(f"  {n}/{len(todo)}  {rate:.1f} img/s", flush=True)
+
+    elapsed = time.perf_counter() - t0
+    print(f"Rendered {len(todo)} images in {elapsed:.1f}s "
+          f"({len(todo) / elapsed:.1f} img/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3.13
 """Entry point for Spirograph Studio TUI (Textual + Kitty/TGP)."""
-import sys
-import os
-
-# Ensure root package is on the path so tui/ can import spiro_math, theme, constants
-sys.path.insert(0, os.path.dirname(__file__))
-
-from tui.app import SpirographTUIApp
+import startup
+import tracing
 
 if __name__ == "__main__":
-    SpirographTUIApp().run()
+    startup.enable()
+    tracing.enable()
+    with startup.phase("import textual"):
+        import textual.app  # noqa: F401  (timed apart from the app modules)
+    with startup.phase("import tui"):
+        from tui.app import SpirographTUIApp
+    with startup.phase("app init"):
+        app = SpirographTUIApp()
+    app.run()
+    startup.report()
@@ -0,0 +1,63 @@
+"""Start-up timing behind the ``--startup-profile`` flag.
+
+Entry points call ``enable`` before their heavy imports, wrap import and
+initialization steps in ``phase`` blocks, call ``ready`` once the first
+frame is on screen and ``report`` to print the breakdown. While disabled
+every call is a no-op.
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+FLAG = "--startup-profile"
+
+_t0     = time.perf_counter()
+_phases = None    # [(depth, name, seconds)] once enabled
+_depth  = 0
+_ready  = None    # seconds from import of this module to the first frame
+
+
+def enable(argv=None):
+    """Start recording if ``FLAG`` is in ``argv`` (default ``sys.argv``),
+    removing it; returns whether profiling is on."""
+    global _phases
+    argv = sys.argv if argv is None else argv
+    if FLAG in argv:
+        argv.remove(FLAG)
+        _phases = []
+    return _phases is not None
+
+
+@contextmanager
+def phase(name):
+    global _depth
+    if _phases is None:
+        yield
+        return
+    entry = [_depth, name, 0.0]
+    _phases.append(entry)
+    _depth += 1
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry[2] = time.perf_counter() - t0
+        _depth  -= 1
+
+
+def ready():
+    """Mark the first frame as shown; only the first call counts."""
+    global _ready
+    if _phases is not None and _ready is None:
+        _ready = time.perf_counter() - _t0
+
+
+def report(file=None):
+    if _phases is None:
+        return
+    file = file or sys.stderr
+    print("startup profile (ms)", file=file)
+    for depth, name, seconds in _phases:
+        print(f"  {'  ' * depth}{name:<{34 - 2 * depth}} {seconds * 1e3:8.1f}", file=file)
+    if _ready is not None:
+        print(f"  {'first frame':<34} {_ready * 1e3:8.1f}", file=file)
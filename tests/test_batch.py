@@ -0,0 +1,32 @@
+import pytest
+
+from constants import CANVAS_SIZE
+from spirograph_batch import load_manifest
+
+
+def _write(tmp_path, text, name="shapes.csv"):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_rows_are_normalized(tmp_path):
+    path = _write(tmp_path, "R,r,d,color\n150,80,100,#FFF000\n150,80,100,\n")
+    assert load_manifest(path) == [(150, 80, 100, "#fff000", 1, CANVAS_SIZE),
+                                   (150, 80, 100, "#ffffff", 1, CANVAS_SIZE)]
+
+
+@pytest.mark.parametrize("r", [150, 200, 0])
+def test_r_outside_0_R_is_rejected_with_its_row(tmp_path, r):
+    path = _write(tmp_path, f"R,r,d\n150,80,100\n150,{r},100\n")
+    with pytest.raises(ValueError, match=rf"row 2: r={r} must be between 0 and R=150"):
+        load_manifest(path)
+
+
+def test_every_bad_row_is_reported(tmp_path):
+    path = _write(tmp_path, '[{"R": 150, "r": 80}, {"R": 96, "r": 52, "d": 40, '
+                            '"color": "teal"}]', name="shapes.json")
+    with pytest.raises(ValueError, match="2 bad row") as info:
+        load_manifest(path)
+    assert "row 1: missing 'd'" in str(info.value)
+    assert "row 2: bad color 'teal'" in str(info.value)
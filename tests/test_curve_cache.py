@@ -0,0 +1,47 @@
+import threading
+
+from curve_cache import CurveCache
+
+
+def test_hit_returns_the_cached_value_without_computing():
+    cache = CurveCache(maxsize=4)
+    calls = []
+    value = cache.get("a", lambda: calls.append(1) or object())
+    assert cache.get("a", lambda: calls.append(1) or object()) is value
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses, cache.hit_rate) == (1, 1, 0.5)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = CurveCache(maxsize=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 0)          # a is now the most recent
+    cache.get("c", lambda: 3)          # evicts b
+    assert len(cache) == 2
+    assert cache.get("a", lambda: -1) == 1
+    assert cache.get("b", lambda: -2) == -2
+
+
+def test_clear_resets_entries_and_counters():
+    cache = CurveCache()
+    cache.get("a", lambda: 1)
+    cache.get("a", lambda: 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses, cache.hit_rate) == (0, 0, 0.0)
+
+
+def test_concurrent_gets_stay_within_bounds():
+    cache = CurveCache(maxsize=8)
+
+    def work(offset):
+        for i in range(200):
+            cache.get((offset + i) % 20, lambda i=i: i)
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(cache) <= 8
+    assert cache.hits + cache.misses == 800
@@ -0,0 +1,150 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import curve_store                       # noqa: E402
+from curve_store import CurveStore       # noqa: E402
+from spiro_math import SpiroMath         # noqa: E402
+
+KEY   = (150, 80, 100, 1000, 680, 28, 2)
+SHAPE = (1001, 2)
+
+
+def _curve(seed=0, n=SHAPE[0]):
+    return np.random.default_rng(seed).random((n, 2))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CurveStore(str(tmp_path), max_bytes=1 << 30)
+
+
+def test_round_trip_is_a_read_only_mapping(store):
+    pts = _curve()
+    store.save(KEY, pts)
+    got = store.load(KEY, SHAPE)
+    assert np.array_equal(got, pts)
+    assert not got.flags.writeable
+    assert isinstance(got.base, np.memmap) or isinstance(got.base.base, np.memmap)
+    assert (store.hits, store.misses) == (1, 0)
+
+
+def test_misses(store):
+    assert store.load(KEY, SHAPE) is None                    # not stored
+    store.save(KEY, _curve())
+    assert store.load(KEY, (5, 2)) is None                   # wrong shape
+    with open(store.path(KEY), "wb") as fh:                  # not an .npy file
+        fh.write(b"garbage")
+    assert store.load(KEY, SHAPE) is None
+    assert (store.hits, store.misses) == (0, 3)
+
+
+def test_writer_publishes_only_on_complete_commit(store):
+    out = store.writer(KEY, SHAPE)
+    out.write(_curve()[:500])
+    assert store.load(KEY, SHAPE) is None                    # nothing visible yet
+    assert [p for p in os.listdir(store.root) if p.endswith(".part")]
+    out.commit()                                             # short: discarded
+    assert os.listdir(store.root) == []
+
+    out = store.writer(KEY, SHAPE)
+    pts = _curve()
+    out.write(pts[:500])
+    out.write(pts[500:])
+    out.commit()
+    assert os.listdir(store.root) == [os.path.basename(store.path(KEY))]
+    assert np.array_equal(store.load(KEY, SHAPE), pts)
+
+
+def test_discard_removes_the_part_file(store):
+    out = store.writer(KEY, SHAPE)
+    out.write(_curve())
+    out.discard()
+    assert os.listdir(store.root) == []
+
+
+def test_eviction_drops_least_recently_loaded(store):
+    keys = [(i,) + KEY[1:] for i in range(3)]
+    for i, key in enumerate(keys):
+        store.save(key, _curve(i))
+        os.utime(store.path(key), (1000 + i, 1000 + i))
+    store.load(keys[0], SHAPE)                               # refreshes its mtime
+    store.max_bytes = 2 * os.path.getsize(store.path(keys[0]))
+    store.evict()
+    assert not os.path.exists(store.path(keys[1]))
+    assert os.path.exists(store.path(keys[0])) and os.path.exists(store.path(keys[2]))
+
+
+def test_eviction_sweeps_stale_part_files_only(store):
+    fresh = os.path.join(store.root, "a.npy.1-1.part")
+    stale = os.path.join(store.root, "b.npy.1-1.part")
+    for path in (fresh, stale):
+        open(path, "wb").close()
+    old = time.time() - curve_store.PART_MAX_AGE - 10
+    os.utime(stale, (old, old))
+    store.evict()
+    assert os.path.exists(fresh) and not os.path.exists(stale)
+
+
+def test_disabled_store_never_writes(tmp_path):
+    store = CurveStore(str(tmp_path / "off"), max_bytes=0)
+    store.save(KEY, _curve())
+    assert store.writer(KEY, SHAPE) is None
+    assert store.load(KEY, SHAPE) is None
+    assert not os.path.exists(store.root)
+
+
+def test_mapped_view_survives_eviction(store):
+    pts = _curve()
+    store.save(KEY, pts)
+    got = store.load(KEY, SHAPE)
+    store.max_bytes = 1
+    store.evict()
+    assert not os.path.exists(store.path(KEY))
+    assert np.array_equal(got, pts)
+
+
+def _load_sum(args):
+    root, rounds = args
+    reader = CurveStore(root, max_bytes=1 << 30)
+    sums   = set()
+    for _ in range(rounds):
+        pts = reader.load(KEY, SHAPE)
+        if pts is not None:
+            sums.add(float(pts.sum()))
+    return sums
+
+
+def test_concurrent_readers_only_see_complete_curves(store):
+    pts = _curve()
+    with multiprocessing.get_context().Pool(4) as pool:
+        result = pool.map_async(_load_sum, [(store.root, 300)] * 4)
+        while not result.ready():                            # rewrite while they read
+            store.save(KEY, pts)
+        sums = set().union(*result.get(timeout=60))
+    assert sums <= {float(pts.sum())}
+
+
+def test_stream_curve_stores_then_serves_mapped_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr("spiro_math.CURVE_STORE", CurveStore(str(tmp_path), max_bytes=1 << 30))
+    spiro = SpiroMath()
+    args  = (173, 61, 140, 2048, 28, 40000)
+    want  = list(spiro.stream_points(*args, chunk=4096))
+    first = list(spiro.stream_curve(*args, chunk=4096))
+    again = list(spiro.stream_curve(*args, chunk=4096))
+    assert len(first) == len(again) == len(want)
+    for a, b, c in zip(want, first, again):
+        assert np.array_equal(a, b) and np.array_equal(a, c)
+    assert not again[0].flags.writeable
+
+
+def test_abandoned_stream_is_not_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr("spiro_math.CURVE_STORE", CurveStore(str(tmp_path), max_bytes=1 << 30))
+    stream = SpiroMath().stream_curve(173, 61, 140, 2048, 28, 40000, chunk=4096)
+    next(stream)
+    stream.close()
+    assert os.listdir(tmp_path) == []
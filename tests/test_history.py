@@ -0,0 +1,119 @@
+import pytest
+
+from history import ClearCommand, DrawCommand, History, layers_from_history, resample_runs
+from tile_store import TileStore
+
+SIZE = 160     # not a multiple of History.TILE: edge tiles are partial
+
+
+# ── Replay ────────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("n", [80, 6000, 20000])
+def test_full_run_maps_to_every_point(n):
+    assert resample_runs([(1, 6000, 2, "solid")], 6000, n) == [(1, n, 2, "solid")]
+
+
+def test_adjacent_runs_stay_contiguous():
+    runs = [(1, 2000, 1, "a"), (2000, 4001, 2, "b"), (4001, 6000, 1, "c")]
+    out  = resample_runs(runs, 6000, 80)
+    assert out[0][0] == 1 and out[-1][1] == 80
+    for (_, end, _, _), (start, _, _, _) in zip(out, out[1:]):
+        assert end == start
+
+
+def test_runs_too_short_to_survive_are_dropped():
+    assert resample_runs([(10, 11, 1, "a")], 6000, 80) == []
+
+
+# ── Tile deltas and undo ──────────────────────────────────────────────────────
+
+
+class Canvas:
+    """Packed-RGB canvas with the read/write tile callbacks History needs."""
+
+    def __init__(self, size=SIZE):
+        self.size = size
+        self.px   = bytearray(size * size * 3)
+
+    def _row(self, x, y, w):
+        i = (y * self.size + x) * 3
+        return slice(i, i + w * 3)
+
+    def fill(self, x0, y0, x1, y1, value):
+        for y in range(y0, y1):
+            self.px[self._row(x0, y, x1 - x0)] = bytes([value]) * (x1 - x0) * 3
+
+    def read(self, rect):
+        x, y, w, h = rect
+        return b"".join(bytes(self.px[self._row(x, y + j, w)]) for j in range(h))
+
+    def write(self, rect, raw):
+        x, y, w, h = rect
+        for j in range(h):
+            self.px[self._row(x, y + j, w)] = raw[j * w * 3:(j + 1) * w * 3]
+
+
+def _history(canvas, ram_budget=1 << 30):
+    return History(canvas.size, canvas.read, canvas.write, TileStore(ram_budget))
+
+
+def _draw(history, canvas, box, value, layers_before=0):
+    history.push(DrawCommand(150, 80, 100, layers_before, 6000))
+    history.touch(*box)
+    canvas.fill(box[0], box[1], box[2] + 1, box[3] + 1, value)
+
+
+def test_only_changed_tiles_are_kept():
+    canvas  = Canvas()
+    history = _history(canvas)
+    _draw(history, canvas, (10, 10, 20, 20), 7)
+    history.touch(100, 100, 150, 150)          # touched but left unchanged
+    history.seal()
+    rects = [rect for rect, _ in history.commands[0].delta.tiles]
+    assert rects == [(0, 0, 64, 64)]
+
+
+@pytest.mark.parametrize("ram_budget", [1 << 30, 1])
+def test_undo_restores_every_state_in_reverse(ram_budget):
+    canvas  = Canvas()
+    history = _history(canvas, ram_budget)
+    states  = [bytes(canvas.px)]
+    for i, box in enumerate([(0, 0, 70, 70), (60, 60, 159, 159), (0, 100, 159, 120)]):
+        _draw(history, canvas, box, 50 + i, i)
+        states.append(bytes(canvas.px))
+    history.push(ClearCommand(3))
+    history.touch_all()
+    canvas.fill(0, 0, SIZE, SIZE, 0)
+    states.append(bytes(canvas.px))
+
+    assert history.pop().kind == "clear"
+    for expected in reversed(states[:-1]):
+        assert bytes(canvas.px) == expected
+        if history:
+            history.pop()
+    assert len(history) == 0
+    assert history.store.ram_bytes == history.store.spilled_bytes == 0
+
+
+def test_partial_edge_tiles_round_trip():
+    canvas  = Canvas()
+    history = _history(canvas)
+    _draw(history, canvas, (150, 150, 159, 159), 9)
+    assert history.pop()
+    assert not any(canvas.px)
+
+
+def test_layers_from_history_starts_after_the_last_clear():
+    canvas  = Canvas()
+    history = _history(canvas)
+    for i in range(2):
+        _draw(history, canvas, (0, 0, 5, 5), 1, i)
+        history.commands[-1].record(1, 100, 2, "solid")
+    history.push(ClearCommand(2))
+    _draw(history, canvas, (0, 0, 5, 5), 1)
+    history.commands[-1].record(1, 50, 1, "rainbow")
+    history.commands[-1].record(50, 80, 1, "rainbow")      # merged into one run
+    history.push(DrawCommand(150, 80, 100, 1, 6000))        # nothing drawn: skipped
+    history.seal()
+    assert layers_from_history(history.commands) == [(150, 80, 100, 6000, [(1, 80, 1, "rainbow")])]
@@ -0,0 +1,63 @@
+import pytest
+
+import perf
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    perf.reset()
+    yield
+    perf.reset()
+
+
+def test_timer_percentiles():
+    for ms in range(1, 101):
+        perf.record("t", ms / 1000)
+    t = perf.snapshot()["timers"]["t"]
+    assert t["count"] == 100
+    assert t["p50_ms"] == pytest.approx(50)
+    assert t["p95_ms"] == pytest.approx(95)
+    assert t["p99_ms"] == pytest.approx(99)
+    assert t["max_ms"] == pytest.approx(100)
+    assert t["mean_ms"] == pytest.approx(50.5)
+
+
+def test_timer_and_timed_record_calls():
+    @perf.timed("fn")
+    def fn(x):
+        return x * 2
+
+    assert fn(21) == 42
+    with perf.timer("block"):
+        pass
+    timers = perf.snapshot()["timers"]
+    assert timers["fn"]["count"] == timers["block"]["count"] == 1
+
+
+def test_timer_records_when_the_block_raises():
+    with pytest.raises(ValueError):
+        with perf.timer("boom"):
+            raise ValueError
+    assert perf.snapshot()["timers"]["boom"]["count"] == 1
+
+
+def test_counters_total_and_rate():
+    perf.count("segments", 30)
+    perf.count("segments", 10)
+    c = perf.snapshot()["counters"]["segments"]
+    assert c["total"] == 40
+    assert c["rate"] == pytest.approx(40 / perf.PERF_RATE_WINDOW)
+
+
+def test_gauges_are_sampled_at_snapshot_and_survive_reset():
+    value = {"n": 1}
+    perf.gauge("test.gauge", lambda: value["n"])
+    value["n"] = 5
+    perf.reset()
+    assert perf.snapshot()["gauges"]["test.gauge"] == 5
+
+
+def test_hud_lines_without_samples():
+    lines = perf.hud_lines(perf.snapshot())
+    assert len(lines) == 4
+    assert all(isinstance(line, str) for line in lines)
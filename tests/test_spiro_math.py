@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import spiro_math                # noqa: E402
+from spiro_math import SpiroMath  # noqa: E402
+
+CASES = [(150, 80, 100), (173, 61, 140), (200, 199, 20), (300, 7, 250), (96, 36, 60)]
+
+
+def _direct(R, r, d, steps):
+    """The hypotrochoid evaluated point by point, as before lobe rotation."""
+    total_t = 2 * math.pi * SpiroMath().get_period(R, r)
+    k       = (R - r) / r
+    t       = np.linspace(0.0, total_t, steps + 1)
+    return np.column_stack(((R - r) * np.cos(t) + d * np.cos(k * t),
+                            (R - r) * np.sin(t) - d * np.sin(k * t)))
+
+
+@pytest.mark.parametrize("R, r, d", CASES)
+def test_rotated_lobes_match_direct_evaluation(R, r, d):
+    spiro = SpiroMath()
+    steps = spiro.steps_for(R, r, d, 680, 28)
+    assert steps % spiro.get_lobes(R, r) == 0
+    pts = spiro.compute_points(R, r, d, steps)
+    assert pts.shape == (steps + 1, 2)
+    assert np.abs(pts - _direct(R, r, d, steps)).max() < 1e-9 * (abs(R - r) + d)
+
+
+@pytest.mark.parametrize("R, r, d", CASES)
+def test_pure_python_fallback_matches(R, r, d, monkeypatch):
+    spiro = SpiroMath()
+    steps = spiro.steps_for(R, r, d, 155, 10)
+    fast  = spiro.compute_points(R, r, d, steps)
+    monkeypatch.setattr(spiro_math, "_HAS_NUMPY", False)
+    slow  = spiro.compute_points(R, r, d, steps)
+    assert np.abs(np.array(slow) - fast).max() < 1e-9 * (abs(R - r) + d)
+
+
+@pytest.mark.parametrize("R, r, d", CASES)
+def test_max_extent_bounds_the_curve(R, r, d):
+    pts = _direct(R, r, d, 20000)
+    ext = SpiroMath.max_extent(R, r, d)
+    assert np.abs(pts).max() <= ext + 1e-9
+    assert np.abs(pts).max() == pytest.approx(ext)
+
+
+def test_fit_range_matches_fit_points():
+    spiro = SpiroMath()
+    R, r, d = 173, 61, 140
+    steps = spiro.steps_for(R, r, d, 680, 28)
+    whole = spiro.fit_points(R, r, d, 680, 28, steps)
+    part  = spiro.fit_range(R, r, d, 680, 28, steps, 1000, 3000)
+    assert np.abs(whole[1000:3000] - part).max() < 1e-7
+
+
+def test_lobes_and_period():
+    spiro = SpiroMath()
+    assert spiro.get_lobes(150, 80) == 15 and spiro.get_period(150, 80) == 8
+    assert spiro.get_lobes(150.5, 80) == 1
@@ -0,0 +1,45 @@
+import os
+
+from tile_store import TileStore
+
+
+def _tiles(n=3):
+    return [((i * 64, 0, 64, 64), os.urandom(64 * 64 * 3)) for i in range(n)]
+
+
+def test_put_take_round_trip_in_ram():
+    store = TileStore(ram_budget=1 << 30)
+    tiles = _tiles()
+    delta = store.put(tiles)
+    assert not delta.spilled
+    assert store.ram_bytes == delta.nbytes
+    assert store.take(delta) == tiles
+    assert store.ram_bytes == 0
+
+
+def test_oldest_deltas_spill_past_the_budget():
+    store  = TileStore(ram_budget=1)
+    deltas = [store.put(_tiles()) for _ in range(3)]
+    assert [d.spilled for d in deltas] == [True, True, False]   # newest always stays
+    assert store.ram_bytes == deltas[-1].nbytes
+    assert store.spilled_bytes == deltas[0].nbytes + deltas[1].nbytes
+
+
+def test_undo_order_restores_spilled_tiles_and_truncates_the_file():
+    store  = TileStore(ram_budget=1)
+    tiles  = [_tiles() for _ in range(4)]
+    deltas = [store.put(t) for t in tiles]
+    sizes  = []
+    for delta, expected in zip(reversed(deltas), reversed(tiles)):
+        assert store.take(delta) == expected
+        store._spill.seek(0, 2)
+        sizes.append(store._spill.tell())
+    assert sizes == sorted(sizes, reverse=True) and sizes[-1] == 0
+    assert store.ram_bytes == store.spilled_bytes == 0
+
+
+def test_empty_delta():
+    store = TileStore()
+    delta = store.put([])
+    assert delta.nbytes == 0
+    assert store.take(delta) == []
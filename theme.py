@@ -15,6 +15,7 @@ DRAW  = ( 99, 102, 241)   # indigo
 UNDO  = (217, 119,   6)   # amber
 CLEAR = (220,  38,  38)   # red
 SAVE  = ( 22, 163,  74)   # green
+ERROR = (248, 113, 113)   # light red: failed save / export
 
 # ── Per-slider accent colors ─────────────────────────────────────────────────
 SLIDER_COLORS = [
@@ -69,7 +70,7 @@ RAINBOW_CHECK_COLOR  = ( 20,  20,  20)
 # ── Preview widget ────────────────────────────────────────────────────────────
 PREVIEW_SPIN_IDLE    = 0.018   # radians per frame at rest
 PREVIEW_SPIN_DRAW    = 0.055   # radians per frame while drawing
-PREVIEW_GHOST_STEPS  = 900     # curve resolution for ghost trace
+PREVIEW_GHOST_TOL    = 0.5     # max ghost trace deviation, in px
 PREVIEW_GHOST_A      = 50      # ghost trace alpha
 PREVIEW_MARGIN       = 10      # padding inside preview surface
 PREVIEW_OUTER_RING   = ( 65,  60, 110)
@@ -102,6 +103,15 @@ STATUS_DOT_R         = 6
 STATUS_DOT_IDLE      = ( 55,  50,  88)
 STATUS_PROGRESS_R    = 3      # progress bar border-radius
 
+# ── Performance HUD ───────────────────────────────────────────────────────────
+HUD_W                = 260    # overlay width, in px
+HUD_PAD              = 8
+HUD_LINE_H           = 16
+HUD_BG_A             = 210    # overlay background alpha
+
+# ── Vector export ─────────────────────────────────────────────────────────────
+VECTOR_COLOR_BANDS   = 96     # solid color runs per curve for rainbow/gradient pens
+
 # ── Fonts ─────────────────────────────────────────────────────────────────────
 FONT_FACE_DEFAULT = "Arial"
 FONT_FACE_MONO    = "Courier New"
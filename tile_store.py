@@ -0,0 +1,83 @@
+import tempfile
+import threading
+import zlib
+from collections import deque
+
+from constants import UNDO_RAM_BUDGET
+
+
+class TileDelta:
+    """Compressed pre-images of the tiles one command changed.
+
+    ``tiles`` holds ``(rect, payload)`` pairs where ``rect`` is
+    ``(x, y, w, h)`` and ``payload`` is zlib-compressed RGB bytes while in
+    RAM, or an ``(offset, length)`` pair into the spill file once evicted.
+    """
+
+    __slots__ = ("tiles", "spilled", "nbytes")
+
+    def __init__(self, tiles):
+        self.tiles   = tiles
+        self.spilled = False
+        self.nbytes  = sum(len(p) for _, p in tiles)
+
+
+class TileStore:
+    """Holds TileDeltas in RAM up to ``ram_budget`` bytes, spilling the
+    oldest to an anonymous temp file beyond that.
+
+    Undo consumes deltas newest-first, so the spill file only ever grows or
+    shrinks at its tail and is truncated as spilled deltas are restored.
+    """
+
+    def __init__(self, ram_budget=UNDO_RAM_BUDGET):
+        self.ram_budget    = ram_budget
+        self.ram_bytes     = 0
+        self.spilled_bytes = 0
+        self._resident     = deque()    # in-RAM deltas, oldest first
+        self._spill        = None
+        self._lock         = threading.Lock()
+
+    def put(self, tiles):
+        """Compress ``[(rect, raw_rgb_bytes), ...]`` into a new TileDelta."""
+        delta = TileDelta([(rect, zlib.compress(raw, 1)) for rect, raw in tiles])
+        with self._lock:
+            self._resident.append(delta)
+            self.ram_bytes += delta.nbytes
+            while self.ram_bytes > self.ram_budget and len(self._resident) > 1:
+                self._evict(self._resident.popleft())
+        return delta
+
+    def take(self, delta):
+        """Remove ``delta`` from the store; returns ``[(rect, raw_rgb_bytes)]``."""
+        with self._lock:
+            if delta.spilled:
+                tiles = self._unspill(delta)
+            else:
+                self._resident.remove(delta)
+                self.ram_bytes -= delta.nbytes
+                tiles = delta.tiles
+        return [(rect, zlib.decompress(p)) for rect, p in tiles]
+
+    def _evict(self, delta):
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(prefix="spirograph-undo-")
+        self._spill.seek(0, 2)
+        spilled = []
+        for rect, payload in delta.tiles:
+            spilled.append((rect, (self._spill.tell(), len(payload))))
+            self._spill.write(payload)
+        delta.tiles    = spilled
+        delta.spilled  = True
+        self.ram_bytes     -= delta.nbytes
+        self.spilled_bytes += delta.nbytes
+
+    def _unspill(self, delta):
+        tiles = []
+        for rect, (offset, length) in delta.tiles:
+            self._spill.seek(offset)
+            tiles.append((rect, self._spill.read(length)))
+        if delta.tiles:
+            self._spill.truncate(delta.tiles[0][1][0])
+        self.spilled_bytes -= delta.nbytes
+        return tiles
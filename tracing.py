@@ -0,0 +1,155 @@
+"""Span tracing to Chrome / Perfetto trace-event JSON.
+
+Enabled by ``SPIRO_TRACE=<path>`` in the environment or ``--trace[=<path>]``
+on the command line; the trace is written at exit and opens in
+chrome://tracing or https://ui.perfetto.dev. Every ``perf`` timer is also
+a span, and ``traced`` / ``span`` mark other hot paths. Spans keep their
+start times and threads, so a single slow frame stands out where
+``perf`` percentiles would only shift.
+
+While disabled ``traced`` returns the function unchanged and ``span`` a
+shared null context, so the instrumentation costs nothing measurable.
+``traced`` decides when it decorates: the environment variable is read
+on import, and the entry points call ``enable`` for the flag before
+importing the app modules.
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+ENV          = "SPIRO_TRACE"
+FLAG         = "--trace"
+DEFAULT_PATH = "spirograph-trace.json"
+
+_path    = None
+_events  = None   # [(name, start_s, end_s, thread_ident, args)] once enabled
+_threads = {}     # thread ident -> thread name
+_t0      = time.perf_counter()
+_NULL    = nullcontext()
+
+
+def enable(argv=None):
+    """Start tracing if FLAG is in ``argv`` (default ``sys.argv``; the
+    flag is removed); returns whether tracing is on."""
+    argv = sys.argv if argv is None else argv
+    path = None
+    for arg in list(argv):
+        if arg == FLAG or arg.startswith(FLAG + "="):
+            argv.remove(arg)
+            path = arg.partition("=")[2] or DEFAULT_PATH
+    if path and _events is None:
+        start(path)
+    return _events is not None
+
+
+def start(path):
+    """Record spans from now on and write them to ``path`` at exit."""
+    global _path, _events
+    _path, _events = path, []
+    atexit.register(write)
+
+
+def enabled():
+    return _events is not None
+
+
+# ── Recording ─────────────────────────────────────────────────────────────────
+
+def complete(name, t0, t1, args=None):
+    """Record a span that ran from ``t0`` to ``t1`` (``perf_counter``
+    seconds) on the calling thread; a no-op while disabled."""
+    if _events is None:
+        return
+    ident = threading.get_ident()
+    if ident not in _threads:
+        _threads[ident] = threading.current_thread().name
+    _events.append((name, t0, t1, ident, args))   # list.append is atomic
+
+
+class _Span:
+    __slots__ = ("name", "args", "t0")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        complete(self.name, self.t0, time.perf_counter(), self.args)
+        return False
+
+
+def span(name, **args):
+    """Context manager recording a span named ``name`` with ``args``."""
+    if _events is None:
+        return _NULL
+    return _Span(name, args or None)
+
+
+def traced(name=None):
+    """Decorator recording every call as a span (default: the function's
+    qualified name). Works on coroutine functions too."""
+    def wrap(fn):
+        if _events is None:
+            return fn
+        label = name or fn.__qualname__
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def call_async(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    complete(label, t0, time.perf_counter())
+            return call_async
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                complete(label, t0, time.perf_counter())
+        return call
+    return wrap
+
+
+# ── Output ────────────────────────────────────────────────────────────────────
+
+def write(path=None):
+    """Write the recorded spans as trace-event JSON (microseconds since
+    this module was imported)."""
+    import multiprocessing
+    path = path or _path
+    if _events is None or path is None or multiprocessing.parent_process() is not None:
+        return                   # export workers inherit ENV; only the app writes
+    spans   = list(_events)
+    threads = dict(_threads)     # after the spans: covers every thread they name
+    pid     = os.getpid()
+    tids    = {ident: n for n, ident in enumerate(threads, 1)}
+    events  = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tids[ident],
+                "args": {"name": name}} for ident, name in threads.items()]
+    for name, t0, t1, ident, args in spans:
+        event = {"name": name, "ph": "X", "pid": pid, "tid": tids[ident],
+                 "ts": round((t0 - _t0) * 1e6, 3), "dur": round((t1 - t0) * 1e6, 3)}
+        if args:
+            event["args"] = args
+        events.append(event)
+    tmp = path + ".part"
+    with open(tmp, "w") as fh:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+    os.replace(tmp, path)
+    print(f"trace: {len(spans)} spans written to {path}", file=sys.stderr)
+
+
+if os.environ.get(ENV):
+    start(os.environ[ENV])
@@ -1,22 +1,30 @@
 """SpirographTUIApp — Textual TUI for Spirograph Studio."""
 import os
-import sys
-from datetime import datetime
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import time
+from functools import partial
 
+from rich.markup import escape
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Vertical, Horizontal
 from textual.widgets import Button, Static
-
-from constants import SAVE_DIR
+from textual.worker import get_current_worker
+
+import perf
+import startup
+import tracing
+from constants import EXPORT_SIZE, PERF_HUD_REFRESH, FLASH_SECS, FLASH_ERROR_SECS
+from explorer import Explorer
+from history import layers_from_history
+from save_queue import SaveQueue, save_path, error_text
 import theme as _theme
 
 from .drawing_engine import DrawingEngine
+from .scheduler import FrameScheduler
 from .widgets.slider import SpiroSlider
 from .widgets.color_picker import ColorPicker
 from .widgets.canvas import CanvasWidget
+from .widgets.explorer import ExplorerWidget, render_thumbnail
 
 # ── Section-rule helper ───────────────────────────────────────────────────────
 
@@ -36,12 +44,28 @@ class SpirographTUIApp(App):
         Binding("escape", "quit",   "Quit"),
         Binding("q",      "quit",   "Quit", show=False),
         Binding("d",      "draw",   "Draw", show=False),
+        Binding("e",      "export", "Export"),
+        Binding("v",      "export_svg", "SVG"),
+        Binding("p",      "export_pdf", "PDF"),
+        Binding("x",      "toggle_explorer", "Explore"),
+        Binding("f3",     "toggle_perf", "Perf"),
     ]
 
     def __init__(self) -> None:
         super().__init__()
         self._engine     = DrawingEngine()
-        self._save_flash = 0
+        self._sched      = FrameScheduler()
+        self._flash_text  = ""     # footer message, cleared at _flash_until
+        self._flash_until = 0.0
+        self._footer_msg = None
+        self._export_label: str | None = None   # set while an export runs
+        self._export_pct:   int | None = None   # percent done, if reported
+        self._saver = SaveQueue()
+        self._save_requested: str | None = None  # path waiting for the layer to finish
+        self._perf_hud   = False   # footer shows perf metrics instead of status
+        self._perf_next  = 0.0     # perf_counter time of the next metrics refresh
+        self._explorer: Explorer | None = None   # created on mount, from the slider limits
+        perf.gauge("undo.bytes", lambda: self._engine.undo_bytes)
 
     # ── Convenience accessors ─────────────────────────────────────────────────
 
@@ -123,25 +147,77 @@ class SpirographTUIApp(App):
                 yield ColorPicker(id="color-picker")
 
             yield CanvasWidget(id="canvas")
+            yield ExplorerWidget(id="explorer")
 
         yield Static("", id="footer")
 
     def on_mount(self) -> None:
-        self.query_one(CanvasWidget).refresh_canvas(self._engine.canvas)
-        self.set_interval(1 / 15, self._on_tick)
+        limits = [(s.min_val, s.max_val) for s in self.query(SpiroSlider)][:3]
+        self._explorer = Explorer(render_thumbnail, limits)
+        self._schedule_tick()
 
-    # ── Tick ──────────────────────────────────────────────────────────────────
+    def on_unmount(self) -> None:
+        self._saver.shutdown()
+        self._explorer.shutdown()
 
-    async def _on_tick(self) -> None:
-        cp = self._color_picker()
-        self._engine.step(self._speed() * 5, self._thick(), cp)
+    # ── Tick ──────────────────────────────────────────────────────────────────
 
-        if self._engine.take_dirty():
-            self.query_one(CanvasWidget).refresh_canvas(self._engine.canvas)
+    def _schedule_tick(self) -> None:
+        self.set_timer(self._sched.interval, self._on_tick)
 
+    @tracing.traced("app.tick")
+    async def _on_tick(self) -> None:
+        sched = self._sched
+        dt    = sched.begin_tick()
+        perf.record("frame", dt)
+        try:
+            self._tick(dt)
+        finally:
+            sched.end_tick()
+            self._schedule_tick()
+
+    def _tick(self, dt: float) -> None:
+        sched = self._sched
+        cp    = self._color_picker()
+
+        # Speed is segments per tick at the original fixed 15 fps; convert
+        # to a per-second rate so progress follows the clock, not the tick rate.
+        if self._engine.drawing:
+            n = sched.segments(self._speed() * 5 * sched.TARGET_FPS, dt)
+            with sched.phase("step"):
+                self._engine.step(n, self._thick(), cp)
+            sched.note_segments(n, sched.last["step"])
+        else:
+            sched.reset_progress()
+        self._poll_saves()
+        if self._flash_text and time.monotonic() >= self._flash_until:
+            self._flash_text = ""
+
+        with sched.phase("canvas"):
+            box = self._engine.take_dirty()
+            if box:
+                self.query_one(CanvasWidget).refresh_canvas(self._engine.canvas, box)
+
+        explorer = self.query_one(ExplorerWidget)
+        if explorer.display:
+            with sched.phase("explorer"):
+                moved   = self._explorer.update(self._R(), self._r(), self._d(),
+                                                cp.current_solid())
+                arrived = self._explorer.poll()
+                if moved or arrived:
+                    explorer.show(self._explorer)
+
+        with sched.phase("footer"):
+            self._update_status()
+        startup.ready()
+
+    def _update_status(self) -> None:
         # Draw button label — shows progress during animation
         btn = self.query_one("#btn-draw", Button)
-        if self._engine.drawing:
+        if self._engine.computing:
+            btn.label = "COMPUTING…"
+            btn.add_class("drawing")
+        elif self._engine.drawing:
             pct = int(100 * self._engine.draw_index / max(1, self._engine.draw_total))
             btn.label = f"DRAWING  {pct}%"
             btn.add_class("drawing")
@@ -150,10 +226,33 @@ class SpirographTUIApp(App):
             btn.remove_class("drawing")
 
         # Footer status
-        if self._save_flash > 0:
-            self._save_flash -= 1
+        if self._perf_hud:
+            now = time.perf_counter()
+            if now >= self._perf_next:
+                self._perf_next = now + PERF_HUD_REFRESH
+                self._update_footer("\n".join(perf.hud_lines(perf.snapshot())))
+        elif self._flash_text:
             self._update_footer(
-                f"Saved  ·  R={self._R()}  r={self._r()}  d={self._d()}"
+                f"{self._flash_text}  ·  R={self._R()}  r={self._r()}  d={self._d()}"
+                f"  ·  layers={self._engine.layer_count}"
+            )
+        elif self._export_label is not None:
+            pct = "" if self._export_pct is None else f" {self._export_pct}%"
+            self._update_footer(
+                f"R={self._R()}  r={self._r()}  d={self._d()}"
+                f"  ·  Exporting {self._export_label}{pct}"
+                f"  ·  layers={self._engine.layer_count}"
+            )
+        elif self._save_requested is not None or self._saver.busy:
+            self._update_footer(
+                f"R={self._R()}  r={self._r()}  d={self._d()}"
+                f"  ·  Saving…"
+                f"  ·  layers={self._engine.layer_count}"
+            )
+        elif self._engine.computing:
+            self._update_footer(
+                f"R={self._R()}  r={self._r()}  d={self._d()}"
+                f"  ·  Computing curve…"
                 f"  ·  layers={self._engine.layer_count}"
             )
         elif self._engine.drawing:
@@ -171,38 +270,149 @@ class SpirographTUIApp(App):
             )
 
     def _update_footer(self, msg: str) -> None:
-        self.query_one("#footer", Static).update(msg)
+        if msg != self._footer_msg:
+            self._footer_msg = msg
+            self.query_one("#footer", Static).update(msg)
 
     # ── Button callbacks ──────────────────────────────────────────────────────
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         bid = event.button.id
         if bid == "btn-draw":
-            self._engine.start(self._R(), self._r(), self._d())
+            self._draw()
         elif bid == "btn-undo":
             self._engine.pop_undo()
-            self.query_one(CanvasWidget).refresh_canvas(self._engine.canvas)
         elif bid == "btn-clear":
             self._engine.clear()
-            self.query_one(CanvasWidget).refresh_canvas(self._engine.canvas)
         elif bid == "btn-save":
             self._save()
 
     # ── Key actions ───────────────────────────────────────────────────────────
 
     def action_undo(self) -> None:
-        self._engine.pop_undo()
-        self.query_one(CanvasWidget).refresh_canvas(self._engine.canvas)
+        self._engine.pop_undo()     # marks the canvas dirty; the next tick redraws it
 
     def action_draw(self) -> None:
-        self._engine.start(self._R(), self._r(), self._d())
+        self._draw()
+
+    def action_toggle_explorer(self) -> None:
+        """Swap the canvas for the neighbouring-parameter thumbnail grid."""
+        explorer = self.query_one(ExplorerWidget)
+        canvas   = self.query_one(CanvasWidget)
+        explorer.display = not explorer.display
+        canvas.display   = not explorer.display
+        if explorer.display:
+            explorer.show(self._explorer)
+        else:
+            canvas.refresh_canvas(self._engine.canvas)
+
+    def on_explorer_widget_picked(self, event: ExplorerWidget.Picked) -> None:
+        for sid, value in zip(("#slider-R", "#slider-r", "#slider-d"), event.params):
+            self.query_one(sid, SpiroSlider).value = value
+
+    def action_toggle_perf(self) -> None:
+        """Switch the footer between status and live perf metrics."""
+        self._perf_hud  = not self._perf_hud
+        self._perf_next = 0.0
+        self.query_one("#footer", Static).set_class(self._perf_hud, "perf")
+
+    # ── Background compute ────────────────────────────────────────────────────
+
+    def _draw(self) -> None:
+        """Request a layer and compute its curve on a worker thread. A newer
+        Draw cancels the previous worker (exclusive group)."""
+        job = self._engine.request(self._R(), self._r(), self._d())
+        self.run_worker(partial(self._compute, job), thread=True,
+                        group="compute", exclusive=True)
+
+    def _compute(self, job: tuple) -> None:
+        try:
+            points = self._engine.compute(job)
+        except Exception as exc:    # bad parameters, MemoryError on a huge curve
+            if not get_current_worker().is_cancelled:
+                self.call_from_thread(self._compute_failed, exc)
+            return
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._accept, job, points)
+
+    def _accept(self, job: tuple, points) -> None:
+        try:
+            self._engine.accept(job, points)
+        except Exception as exc:    # streamed curves compute their first batch here
+            self._compute_failed(exc)
+
+    def _compute_failed(self, error: Exception) -> None:
+        self._engine.cancel()
+        self._flash(f"Curve failed: {error_text(error)}", ok=False)
+
+    # ── Export ────────────────────────────────────────────────────────────────
+
+    def action_export(self) -> None:
+        """Re-render the layers at EXPORT_SIZE on a worker thread."""
+        from export import export_png     # multiprocessing: load on first use
+
+        def progress(rows: int, size: int) -> None:
+            self._export_pct = 100 * rows // size
+        self._start_export(f"{EXPORT_SIZE}px", 0,
+                           partial(export_png, size=EXPORT_SIZE, progress=progress),
+                           save_path(f"_{EXPORT_SIZE}px.png"))
+
+    def action_export_svg(self) -> None:
+        from vector_export import write_svg
+        self._start_export("SVG", None, write_svg, save_path(".svg"))
+
+    def action_export_pdf(self) -> None:
+        from vector_export import write_pdf
+        self._start_export("PDF", None, write_pdf, save_path(".pdf"))
+
+    def _start_export(self, label: str, pct: int | None, fn, fname: str) -> None:
+        """Run ``fn(layers, fname)`` on a worker thread with a snapshot of
+        the layer history; one export at a time."""
+        if self._export_label is not None:
+            return
+        layers = layers_from_history(self._engine.commands)
+        self._export_label = label
+        self._export_pct   = pct
+        self.run_worker(partial(self._export, fn, layers, fname), thread=True, group="export")
+
+    def _export(self, fn, layers: list, fname: str) -> None:
+        try:
+            fn(layers, fname)
+        except Exception as exc:
+            self.call_from_thread(self._export_done, fname, exc)
+        else:
+            self.call_from_thread(self._export_done, fname, None)
+
+    def _export_done(self, fname: str, error: Exception | None) -> None:
+        if error is None:
+            self._flash(f"Exported {os.path.basename(fname)}")
+        else:
+            self._flash(f"{self._export_label} export failed: {error_text(error)}", ok=False)
+        self._export_label = None
+        self._export_pct   = None
+
+    def _flash(self, text: str, ok: bool = True) -> None:
+        """Show ``text`` in the footer for a few seconds."""
+        text = escape(text)
+        self._flash_text  = text if ok else f"[#f87171]{text}[/]"
+        self._flash_until = time.monotonic() + (FLASH_SECS if ok else FLASH_ERROR_SECS)
 
     # ── Save ──────────────────────────────────────────────────────────────────
 
     def _save(self) -> None:
-        fname = os.path.join(
-            SAVE_DIR,
-            f"spirograph_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png",
-        )
-        self._engine.canvas.save(fname)
-        self._save_flash = 45
+        """Queue a save; the canvas is snapshotted once no layer is
+        mid-animation and written on the save worker."""
+        self._save_requested = save_path()
+
+    def _poll_saves(self) -> None:
+        for _path, error in self._saver.poll():
+            if error is None:
+                self._flash("Saved")
+            else:
+                self._flash(f"Save failed: {error_text(error)}", ok=False)
+        if self._engine.drawing:
+            return
+        if self._save_requested is not None:
+            self._saver.save(self._engine.snapshot(), self._save_requested)
+            self._save_requested = None
+        self._saver.autosave(self._engine.revision, self._engine.snapshot)
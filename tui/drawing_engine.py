@@ -1,19 +1,26 @@
 """PIL-based DrawingEngine — mirrors drawing_engine.py with PIL backend."""
 import math
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from functools import lru_cache
 
 from PIL import Image, ImageDraw
 
+import perf
+import tracing
+from raster import pixel_runs
 from spiro_math import SpiroMath
+from history import History, DrawCommand, ClearCommand
+from palette import color_table, color_rows
 import theme
-from constants import CANVAS_SIZE, CANVAS_MARGIN
+from constants import (CANVAS_SIZE, CANVAS_MARGIN, DRAW_REF_STEPS,
+                       CURVE_STREAM_STEPS, CURVE_STREAM_MAX)
 
 
+@lru_cache(maxsize=4)
 def _make_canvas_bg(size: int) -> Image.Image:
-    """Create the dot-grid background (same logic as utils.make_canvas_bg)."""
+    """Create the dot-grid background (same logic as utils.make_canvas_bg).
+
+    Cached per size, since batch workers build an engine per job; callers
+    copy or paste it and never draw on it."""
     r, g, b = theme.CANVAS_BG
     img = Image.new("RGB", (size, size), (r, g, b))
     sp   = theme.GRID_SPACING
@@ -21,97 +28,229 @@ def _make_canvas_bg(size: int) -> Image.Image:
     amp  = theme.GRID_VARY_AMP
     freq = theme.GRID_VARY_FREQ
     tint = theme.GRID_BLUE_TINT
+    px   = img.load()
     for gx in range(sp, size, sp):
+        sx = amp * math.sin(gx * freq)
         for gy in range(sp, size, sp):
-            c = base + int(amp * math.sin(gx * freq) * math.cos(gy * freq))
-            img.putpixel((gx, gy), (c, c, c + tint))
+            c = base + int(sx * math.cos(gy * freq))
+            px[gx, gy] = (c, c, c + tint)
     return img
 
 
 class DrawingEngine:
-    """Owns the PIL canvas, undo stack, and drawing animation state."""
+    """Owns the PIL canvas, undo history, and drawing animation state."""
 
-    MAX_UNDO = 20
-
-    def __init__(self):
+    def __init__(self, size: int = CANVAS_SIZE):
+        self.size        = size
+        self._margin     = round(CANVAS_MARGIN * size / CANVAS_SIZE)
         self._spiro      = SpiroMath()
-        self._canvas_bg  = _make_canvas_bg(CANVAS_SIZE)
+        self._canvas_bg  = _make_canvas_bg(size)
         self.canvas      = self._canvas_bg.copy()
         self.drawing     = False
+        self.computing   = False   # a requested layer's curve is on a worker
+        self._job_id     = 0
         self.draw_index  = 0
         self.draw_points = []
         self.draw_total  = 0
+        self._draw_carry = 0.0
+        self._base       = 0      # curve index of draw_points[0]
+        self._stream     = None   # remaining point batches of a streamed curve
+        self._window_colors = (None, None)
         self.layer_count = 0
-        self._undo_stack = []
-        self._dirty      = True  # start dirty so initial canvas is sent
+        self.revision    = 0      # bumped whenever the layer history changes
+        self._history    = History(size, self._read_tile, self._write_tile)
+        self._layer: DrawCommand | None = None   # command being animated
+        self._dirty      = self._full_box()  # start dirty so initial canvas is sent
 
     # ── Undo ──────────────────────────────────────────────────────────────────
 
-    def push_undo(self):
-        self._undo_stack.append(self.canvas.copy())
-        if len(self._undo_stack) > self.MAX_UNDO:
-            self._undo_stack.pop(0)
+    def push_undo(self, cmd) -> None:
+        self._history.push(cmd)
+        self.revision += 1
+
+    def pop_undo(self) -> None:
+        if self.computing:          # nothing drawn yet: undo just drops the request
+            self.cancel()
+            return
+        if not self._history:
+            return
+        self.drawing     = False
+        self._layer      = None
+        cmd              = self._history.pop()
+        self.layer_count = cmd.layers_before
+        self.revision   += 1
+        self._dirty      = self._full_box()
+
+    def _read_tile(self, rect: tuple) -> bytes:
+        x, y, w, h = rect
+        return self.canvas.crop((x, y, x + w, y + h)).tobytes()
 
-    def pop_undo(self):
-        if self._undo_stack:
-            self.drawing     = False
-            self.canvas      = self._undo_stack.pop()
-            self.layer_count = max(0, self.layer_count - 1)
-            self._dirty      = True
+    def _write_tile(self, rect: tuple, raw: bytes) -> None:
+        self.canvas.paste(Image.frombytes("RGB", rect[2:], raw), rect[:2])
 
     @property
     def undo_count(self):
-        return len(self._undo_stack)
+        return len(self._history)
+
+    @property
+    def undo_bytes(self) -> int:
+        """Compressed undo tiles held in RAM and spilled to disk."""
+        store = self._history.store
+        return store.ram_bytes + store.spilled_bytes
+
+    @property
+    def commands(self) -> list:
+        """The undo log, oldest first. Read only."""
+        return self._history.commands
 
     # ── Canvas control ────────────────────────────────────────────────────────
 
+    def snapshot(self) -> tuple:
+        """The canvas as ``(width, height, rgb_bytes)``, for ``SaveQueue``."""
+        return (*self.canvas.size, self.canvas.tobytes())
+
     def clear(self):
-        self.push_undo()
+        self.cancel()
+        self.push_undo(ClearCommand(self.layer_count))
+        self._history.touch_all()
         self.drawing     = False
-        self.canvas      = self._canvas_bg.copy()
+        self._layer      = None
+        self.canvas.paste(self._canvas_bg)
         self.layer_count = 0
-        self._dirty      = True
+        self._dirty      = self._full_box()
 
     # ── Drawing ───────────────────────────────────────────────────────────────
 
-    def start(self, R, r, d):
-        pts     = self._spiro.compute_points(R, r, d)
-        max_ext = max(max(abs(v) for pt in pts for v in pt), 1)
-        scale   = (CANVAS_SIZE / 2 - CANVAS_MARGIN) / max_ext
-        cx = cy = CANVAS_SIZE // 2
-        self.draw_points = [(cx + x * scale, cy + y * scale) for x, y in pts]
-        self.draw_total  = len(self.draw_points)
+    def request(self, R, r, d) -> tuple:
+        """Supersede any running or pending layer and return a job for
+        ``compute``; hand the result to ``accept``."""
+        self.drawing   = False
+        self._layer    = None
+        self._history.seal()
+        self._job_id  += 1
+        self.computing = True
+        return (self._job_id, R, r, d)
+
+    @perf.timed("engine.compute")
+    def compute(self, job: tuple):
+        """Curve for ``job`` as ``(total_points, batches)``. Touches no
+        engine state, so it is safe to run on a worker thread.
+
+        Curves up to CURVE_STREAM_STEPS samples come back whole (one batch,
+        from the shared cache); finer ones as a lazy stream of batches that
+        ``step`` evaluates as the pen reaches them.
+        """
+        _, R, r, d = job
+        steps = self._spiro.steps_for(R, r, d, self.size, self._margin,
+                                      max_steps=CURVE_STREAM_MAX)
+        if steps > CURVE_STREAM_STEPS:
+            return steps + 1, self._spiro.stream_curve(R, r, d, self.size, self._margin, steps)
+        points = self._spiro.curve(R, r, d, self.size, self._margin, steps)
+        return len(points), iter((points,))
+
+    def accept(self, job: tuple, curve) -> bool:
+        """Start animating ``curve``; returns False if ``job`` was
+        superseded or cancelled in the meantime."""
+        if not self.computing or job[0] != self._job_id:
+            return False
+        _, R, r, d = job
+        self.computing   = False
+        self.draw_total, self._stream = curve
+        self.draw_points = next(self._stream)
+        self._base       = 0
         self.draw_index  = 1
-        self.push_undo()
+        self._draw_carry = 0.0
+        self._layer      = DrawCommand(R, r, d, self.layer_count, self.draw_total)
+        self.push_undo(self._layer)
         self.drawing = True
-        self._dirty  = False
+        self._dirty  = None
+        return True
+
+    def cancel(self) -> None:
+        """Drop the pending request, if any; its result will be ignored."""
+        self._job_id  += 1
+        self.computing = False
+
+    @tracing.traced("engine.start")
+    def start(self, R, r, d):
+        """Compute and start a layer synchronously (headless use)."""
+        job = self.request(R, r, d)
+        self.accept(job, self.compute(job))
+
+    def _segments_for(self, speed: int) -> int:
+        """Convert ``speed`` (segments per tick at DRAW_REF_STEPS samples)
+        to this curve's sample count, so a Draw takes the same time however
+        densely the curve is sampled."""
+        self._draw_carry += speed * self.draw_total / DRAW_REF_STEPS
+        n = int(self._draw_carry)
+        self._draw_carry -= n
+        return n
+
+    def _draw_run(self, pts, start: int, end: int, thick: int, colors) -> None:
+        if end <= start:
+            return
+        runs, (x0, y0, x1, y1) = pixel_runs(pts, start, end, colors)
+        pad = thick + 1
+        self._history.touch(x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+        self._mark_dirty(x0 - pad, y0 - pad, x1 + pad + 1, y1 + pad + 1)
+        draw = ImageDraw.Draw(self.canvas)
+        for col, poly in runs:
+            draw.line(poly, fill=col, width=max(1, thick))
+
+    def _colors(self, mode):
+        """Segment colors indexed like ``draw_points``: the cached table for
+        a whole curve, or just the current batch's rows for a stream."""
+        if len(self.draw_points) == self.draw_total:
+            return color_table(mode, self.draw_total)
+        key = (mode, self._base)
+        if self._window_colors[0] != key:
+            end = self._base + len(self.draw_points)
+            self._window_colors = (key, color_rows(mode, self.draw_total, self._base, end))
+        return self._window_colors[1]
 
     def step(self, speed: int, thick: int, color_picker) -> None:
         if not self.drawing:
             return
-        draw     = ImageDraw.Draw(self.canvas)
-        advanced = False
-        for _ in range(speed):
+        with perf.timer("engine.step"):
+            start = self.draw_index
+            end   = min(start + self._segments_for(speed), self.draw_total)
+            mode  = color_picker.color_mode()
+            seg   = start
+            while seg < end:
+                stop = min(end, self._base + len(self.draw_points))
+                if stop <= seg:                 # pen reached the end of this batch
+                    self._base      += len(self.draw_points) - 1
+                    self.draw_points = next(self._stream)
+                    continue
+                b = self._base
+                self._draw_run(self.draw_points, seg - b, stop - b, thick, self._colors(mode))
+                seg = stop
+            self._layer.record(start, end, thick, mode)
+            perf.count("engine.segments", end - start)
+            self.draw_index = end
             if self.draw_index >= self.draw_total:
                 self.drawing      = False
+                self._layer       = None
+                self._stream      = None
                 self.layer_count += 1
-                self._dirty       = True
-                break
-            p1  = self.draw_points[self.draw_index - 1]
-            p2  = self.draw_points[self.draw_index]
-            col = color_picker.get_color(self.draw_index, self.draw_total)
-            draw.line(
-                [(int(p1[0]), int(p1[1])), (int(p2[0]), int(p2[1]))],
-                fill=col,
-                width=max(1, thick),
-            )
-            self.draw_index += 1
-            advanced = True
-        if advanced:
-            self._dirty = True
-
-    def take_dirty(self) -> bool:
-        """Return True if canvas was updated since last call; resets the flag."""
+                self._history.seal()
+
+    # ── Dirty region ──────────────────────────────────────────────────────────
+
+    def _full_box(self) -> tuple:
+        return (0, 0, self.size, self.size)
+
+    def _mark_dirty(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.size, x1), min(self.size, y1)
+        if self._dirty is not None:
+            dx0, dy0, dx1, dy1 = self._dirty
+            x0, y0, x1, y1 = min(x0, dx0), min(y0, dy0), max(x1, dx1), max(y1, dy1)
+        self._dirty = (x0, y0, x1, y1)
+
+    def take_dirty(self) -> tuple | None:
+        """Return the ``(x0, y0, x1, y1)`` canvas box changed since the last
+        call (exclusive right/bottom), or None; resets it."""
         d = self._dirty
-        self._dirty = False
+        self._dirty = None
         return d
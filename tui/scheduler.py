@@ -0,0 +1,88 @@
+"""FrameScheduler — adaptive tick pacing for the TUI."""
+import time
+from contextlib import contextmanager
+
+
+class FrameScheduler:
+    """Measures each tick phase and adapts the tick rate and the drawing
+    work per tick to a wall-clock frame budget.
+
+    Drawing progress is tied to elapsed time, not to the number of ticks:
+    a slow terminal gets fewer, larger steps rather than a slower drawing.
+    """
+
+    TARGET_FPS = 15
+    MIN_FPS    = 4
+    LOAD       = 0.6    # max share of wall time spent inside ticks
+    STEP_SHARE = 0.5    # max share of the frame budget given to the engine step
+    MAX_DT     = 0.5    # clamp for stalls (suspended terminal, GC pause)
+    SMOOTHING  = 0.2    # EWMA weight of the newest sample
+
+    def __init__(self) -> None:
+        self.budget   = 1 / self.TARGET_FPS
+        self.interval = self.budget
+        self.costs: dict[str, float] = {}   # phase -> EWMA seconds
+        self.last:  dict[str, float] = {}   # phase -> most recent seconds
+        self._last_tick: float | None = None
+        self._tick_t0   = 0.0
+        self._owed      = 0.0               # reference segments not yet drawn
+        self._seg_cost  = 0.0               # EWMA seconds per reference segment
+
+    # ── Measurement ───────────────────────────────────────────────────────────
+
+    def begin_tick(self) -> float:
+        """Start a tick; returns seconds since the previous one.
+
+        A tick that arrives later than scheduled means the event loop was
+        busy between ticks (typically the terminal painting the last frame);
+        that lag counts against the budget like work done inside the tick."""
+        now = time.perf_counter()
+        dt  = self.interval if self._last_tick is None else now - self._last_tick
+        self._note("lag", max(0.0, dt - self.interval))
+        self._last_tick = now
+        self._tick_t0   = now
+        return min(dt, self.MAX_DT)
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._note(name, time.perf_counter() - t0)
+
+    def end_tick(self) -> None:
+        """Finish a tick and pick the interval until the next one."""
+        self._note("tick", time.perf_counter() - self._tick_t0)
+        want = (self.costs["tick"] + self.costs["lag"]) / self.LOAD
+        self.interval = max(self.budget, min(1 / self.MIN_FPS, want))
+
+    def _note(self, name: str, seconds: float) -> None:
+        self.last[name] = seconds
+        prev = self.costs.get(name)
+        self.costs[name] = seconds if prev is None else (
+            prev + (seconds - prev) * self.SMOOTHING)
+
+    # ── Drawing work ──────────────────────────────────────────────────────────
+
+    def segments(self, rate: float, dt: float) -> float:
+        """Reference segments to draw this tick for ``rate`` per second.
+
+        Work beyond the step's share of the budget is carried to later
+        ticks, so progress catches up instead of being dropped."""
+        self._owed += rate * dt
+        n = self._owed
+        if self._seg_cost > 0:
+            n = min(n, self.budget * self.STEP_SHARE / self._seg_cost)
+        self._owed -= n
+        return n
+
+    def note_segments(self, n: float, seconds: float) -> None:
+        """Record the cost of drawing ``n`` reference segments."""
+        if n >= 1:
+            per = seconds / n
+            self._seg_cost = per if not self._seg_cost else (
+                self._seg_cost + (per - self._seg_cost) * self.SMOOTHING)
+
+    def reset_progress(self) -> None:
+        self._owed = 0.0
@@ -2,5 +2,6 @@ from .slider import SpiroSlider
 from .color_picker import ColorPicker
 from .canvas import CanvasWidget
 from .preview import PreviewWidget
+from .explorer import ExplorerWidget
 
-__all__ = ["SpiroSlider", "ColorPicker", "CanvasWidget", "PreviewWidget"]
+__all__ = ["SpiroSlider", "ColorPicker", "CanvasWidget", "PreviewWidget", "ExplorerWidget"]
@@ -1,10 +1,12 @@
 """CanvasWidget — displays the PIL drawing canvas via textual-image (TGP)."""
+import math
+
 from textual.widget import Widget
 from textual.app import ComposeResult
 from textual import events
 
 try:
-    from textual_image.widget import TGPImage as TImage
+    from .frame_image import FrameImage as TImage
     from textual_image._terminal import get_cell_size as _get_cell_size
     _HAS_TEXTUAL_IMAGE = True
 except ImportError:
@@ -15,6 +17,8 @@ except ImportError:
 
 from PIL import Image as PILImage
 
+import perf
+
 
 class CanvasWidget(Widget):
     """Displays the PIL spirograph canvas scaled to fill the column width,
@@ -32,6 +36,10 @@ class CanvasWidget(Widget):
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         self._last_pil: PILImage.Image | None = None
+        self._scaled:   PILImage.Image | None = None   # resample of _last_pil last shown
+        self._back:     PILImage.Image | None = None   # the other buffer, one patch behind
+        self._patch     = None                         # (region, xy) last pasted into _scaled
+        self._vpad      = None
 
     def compose(self) -> ComposeResult:
         if _HAS_TEXTUAL_IMAGE:
@@ -47,9 +55,14 @@ class CanvasWidget(Widget):
 
     # ── Core sizing & centering ───────────────────────────────────────────────
 
-    def _render_and_center(self, pil_image: PILImage.Image) -> None:
+    @perf.timed("canvas.upload")
+    def _render_and_center(self, pil_image: PILImage.Image, box: tuple | None = None) -> None:
         """Scale the PIL image to fill the column width, then set a
-        top-margin so it sits vertically centered in the widget."""
+        top-margin so it sits vertically centered in the widget.
+
+        With ``box`` (a changed source region), only that part is resampled,
+        into the scaled buffer the widget is not showing; otherwise the whole
+        image is rescaled. Either way the widget gets a new image."""
         w_cells = self.size.width  or 80
         h_cells = self.size.height or 40
         cell    = _get_cell_size()
@@ -61,24 +74,65 @@ class CanvasWidget(Widget):
         px_h = h_cells * cell.height
         px   = max(64, min(px_w, px_h))   # square image: take smaller dim
 
-        img = pil_image.copy().resize((px, px), PILImage.LANCZOS)
+        if box is None or self._scaled is None or self._scaled.width != px:
+            self._scaled = pil_image.resize((px, px), PILImage.LANCZOS)
+            self._back   = None
+            self._patch  = None
+        else:
+            self._rescale_region(pil_image, box, px)
+        img = self._scaled
 
         # Vertical centering: compute how many rows the rendered image takes,
         # then push it down by half the remaining rows.
         img_rows  = max(1, round(img.height / cell.height))
         vpad      = max(0, (h_cells - img_rows) // 2)
 
-        self._img.styles.margin_top    = vpad
-        self._img.styles.margin_bottom = 0
-        self._img.image = img
+        if vpad != self._vpad:
+            self._vpad = vpad
+            self._img.styles.margin_top    = vpad
+            self._img.styles.margin_bottom = 0
+        self._img.show_frame(img)
+
+    def _rescale_region(self, pil_image: PILImage.Image, box: tuple, px: int) -> None:
+        """Resample the destination pixels whose LANCZOS footprint overlaps
+        source ``box`` and paste them into the back buffer, then swap it
+        with the one shown, which the image widget owns until then.
+
+        The back buffer missed the previous patch, so that is pasted first;
+        only the first region update after a full rescale copies the image."""
+        s    = pil_image.width / px                # source px per dest px
+        supp = 3 * max(s, 1.0)                     # LANCZOS support, in source px
+        x0, y0, x1, y1 = box
+        dx0 = max(0,  math.floor((x0 - supp) / s) - 1)
+        dy0 = max(0,  math.floor((y0 - supp) / s) - 1)
+        dx1 = min(px, math.ceil((x1 + supp) / s) + 1)
+        dy1 = min(px, math.ceil((y1 + supp) / s) + 1)
+        if dx1 <= dx0 or dy1 <= dy0:
+            return
+        region = pil_image.resize(
+            (dx1 - dx0, dy1 - dy0), PILImage.LANCZOS,
+            box=(dx0 * s, dy0 * s, dx1 * s, dy1 * s),
+        )
+        back = self._back
+        if back is None:
+            back = self._scaled.copy()
+        elif self._patch is not None:
+            back.paste(*self._patch)
+        back.paste(region, (dx0, dy0))
+        self._back, self._scaled = self._scaled, back
+        self._patch = (region, (dx0, dy0))
 
     # ── Public API ────────────────────────────────────────────────────────────
 
-    def refresh_canvas(self, pil_image: PILImage.Image) -> None:
+    def refresh_canvas(self, pil_image: PILImage.Image, box: tuple | None = None) -> None:
+        """Show ``pil_image``. Pass the engine's dirty ``box`` to resample
+        only the region that changed since the last refresh."""
         if not (_HAS_TEXTUAL_IMAGE and hasattr(self, "_img")):
             return
+        if pil_image is not self._last_pil:
+            box = None
         self._last_pil = pil_image
-        self._render_and_center(pil_image)
+        self._render_and_center(pil_image, box)
 
     def on_resize(self, _event: events.Resize) -> None:
         if self._last_pil is not None and hasattr(self, "_img"):
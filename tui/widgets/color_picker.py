@@ -1,10 +1,4 @@
 """ColorPicker — swatch grid + rainbow toggle for the TUI."""
-import colorsys
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
-
 from textual.widget import Widget
 from textual.reactive import reactive
 from textual.message import Message
@@ -13,6 +7,7 @@ from textual.binding import Binding
 from rich.text import Text
 
 import theme
+from palette import color_at
 
 # Each swatch is 3 chars + 1 gap = 4 chars
 _SWATCH_STRIDE = 4
@@ -72,12 +67,12 @@ class ColorPicker(Widget):
 
     # ── Color access (same interface as Pygame ColorPicker) ───────────────────
 
+    def color_mode(self):
+        """Hashable pen mode for palette.color_table."""
+        return "rainbow" if self.rainbow else theme.PRESET_COLORS[self.selected]
+
     def get_color(self, idx: int, total: int) -> tuple:
-        if self.rainbow:
-            h = (idx / max(total, 1)) % 1.0
-            r, g, b = colorsys.hsv_to_rgb(h, 1.0, 1.0)
-            return (int(r * 255), int(g * 255), int(b * 255))
-        return theme.PRESET_COLORS[self.selected]
+        return color_at(self.color_mode(), idx, total)
 
     def current_solid(self) -> tuple:
         return theme.PRESET_COLORS[self.selected]
@@ -0,0 +1,141 @@
+"""ExplorerWidget — neighbouring-parameter thumbnail grid for the TUI."""
+from textual import events
+from textual.app import ComposeResult
+from textual.message import Message
+from textual.widget import Widget
+from textual.widgets import Static
+
+try:
+    from textual_image.widget import TGPImage as TImage
+    _HAS_TEXTUAL_IMAGE = True
+except ImportError:
+    _HAS_TEXTUAL_IMAGE = False
+
+from PIL import Image as PILImage, ImageDraw
+
+import theme
+from constants import EXPLORER_SPAN, EXPLORER_STEPS, EXPLORER_THUMB
+from explorer import Explorer, PARAMS
+from spiro_math import SpiroMath
+
+from .canvas import _get_cell_size
+
+GAP = 8   # px between thumbnails
+
+
+def _grid_size() -> tuple:
+    cols = 2 * EXPLORER_SPAN + 1
+    return (cols * EXPLORER_THUMB + (cols - 1) * GAP,
+            len(PARAMS) * EXPLORER_THUMB + (len(PARAMS) - 1) * GAP)
+
+
+def render_thumbnail(R: int, r: int, d: int, color: tuple) -> PILImage.Image:
+    """Thumbnail image of one curve; runs on an explorer pool thread."""
+    img = PILImage.new("RGB", (EXPLORER_THUMB, EXPLORER_THUMB), theme.CANVAS_BG)
+    pts = SpiroMath().fit_points(R, r, d, EXPLORER_THUMB, theme.PREVIEW_MARGIN,
+                                 tol=theme.PREVIEW_GHOST_TOL)
+    ImageDraw.Draw(img).line([(float(x), float(y)) for x, y in pts], fill=color, width=1)
+    return img
+
+
+class ExplorerWidget(Widget):
+    """Shows an ``Explorer``'s grid as one image in place of the canvas and
+    posts ``Picked`` with the ``(R, r, d)`` of a clicked thumbnail."""
+
+    DEFAULT_CSS = """
+    ExplorerWidget {
+        width: 1fr;
+        layout: vertical;
+        align: center middle;
+        background: #06050f;
+        display: none;
+    }
+    ExplorerWidget > #explorer-title {
+        width: 100%;
+        text-align: center;
+        color: #827aaf;
+    }
+    """
+
+    class Picked(Message):
+        def __init__(self, params: tuple) -> None:
+            super().__init__()
+            self.params = params
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._explorer: Explorer | None = None
+
+    def compose(self) -> ComposeResult:
+        steps = "  ".join(f"{p} ±{s}" for p, s in zip(PARAMS, EXPLORER_STEPS))
+        yield Static(f"Explorer  ·  rows {steps}  ·  click to load  ·  x to close",
+                     id="explorer-title")
+        if _HAS_TEXTUAL_IMAGE:
+            self._img = TImage(id="explorer-img")
+            yield self._img
+
+    # ── Grid image ────────────────────────────────────────────────────────────
+
+    def _grid_image(self, explorer: Explorer) -> PILImage.Image:
+        img  = PILImage.new("RGB", _grid_size(), theme.CANVAS_BG)
+        draw = ImageDraw.Draw(img)
+        for i, row in enumerate(explorer.rows):
+            for c, cell in enumerate(row):
+                x, y = self._cell_origin(i, c)
+                box  = (x, y, x + EXPLORER_THUMB - 1, y + EXPLORER_THUMB - 1)
+                if cell is None:
+                    draw.rectangle(box, outline=theme.CARD_EDGE)
+                    continue
+                thumb = explorer.image(cell)
+                if thumb is None:
+                    draw.rectangle(box, fill=theme.CARD)
+                else:
+                    img.paste(thumb, (x, y))
+                centre = c == EXPLORER_SPAN
+                draw.rectangle(box, outline=theme.DRAW if centre else theme.CARD_EDGE,
+                               width=2 if centre else 1)
+        return img
+
+    @staticmethod
+    def _cell_origin(row: int, col: int) -> tuple:
+        return col * (EXPLORER_THUMB + GAP), row * (EXPLORER_THUMB + GAP)
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def show(self, explorer: Explorer) -> None:
+        """Redraw the grid of ``explorer``, scaled to fit the widget."""
+        self._explorer = explorer
+        if not (_HAS_TEXTUAL_IMAGE and hasattr(self, "_img")):
+            return
+        img  = self._grid_image(explorer)
+        cell = _get_cell_size()
+        w_px = (self.size.width  or 80) * cell.width
+        h_px = ((self.size.height or 40) - 1) * cell.height   # minus the title row
+        k    = min(1.0, w_px / img.width, h_px / img.height)
+        if k < 1.0:
+            img = img.resize((max(1, int(img.width * k)), max(1, int(img.height * k))),
+                             PILImage.LANCZOS)
+        # Pin the widget to the image's cell size so clicks map straight
+        # from its region back to grid pixels.
+        self._img.styles.width  = max(1, round(img.width / cell.width))
+        self._img.styles.height = max(1, round(img.height / cell.height))
+        self._img.image = img
+
+    def on_resize(self, _event: events.Resize) -> None:
+        if self._explorer is not None:
+            self.show(self._explorer)
+
+    def on_click(self, event: events.Click) -> None:
+        if self._explorer is None or not hasattr(self, "_img"):
+            return
+        region = self._img.region
+        if not region.contains(event.screen_x, event.screen_y):
+            return
+        grid_w, grid_h = _grid_size()
+        x = (event.screen_x - region.x + 0.5) / region.width  * grid_w
+        y = (event.screen_y - region.y + 0.5) / region.height * grid_h
+        col, row = int(x // (EXPLORER_THUMB + GAP)), int(y // (EXPLORER_THUMB + GAP))
+        if row < len(self._explorer.rows) and col <= 2 * EXPLORER_SPAN:
+            params = self._explorer.rows[row][col]
+            if params is not None:
+                self.post_message(self.Picked(params))
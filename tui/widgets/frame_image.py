@@ -0,0 +1,27 @@
+"""FrameImage — TGPImage for animated content of a fixed size."""
+from textual_image.renderable.tgp import Image as TGPRenderable
+from textual_image.widget import TGPImage
+
+
+class FrameImage(TGPImage, Renderable=TGPRenderable):
+    """Shows a stream of same-sized frames. ``show_frame`` goes through the
+    public ``image`` setter but repaints without the layout pass the setter
+    requests, unless the frame size changed."""
+
+    # Class-level defaults: the base initializer already calls refresh().
+    _frame_size = None
+    _same_size  = False   # set while show_frame runs the setter
+
+    def show_frame(self, frame) -> None:
+        self._same_size  = frame.size == self._frame_size
+        self._frame_size = frame.size
+        try:
+            self.image = frame
+        finally:
+            self._same_size = False
+
+    def refresh(self, *regions, repaint: bool = True, layout: bool = False,
+                recompose: bool = False):
+        if self._same_size:
+            layout = False
+        return super().refresh(*regions, repaint=repaint, layout=layout, recompose=recompose)
@@ -1,21 +1,18 @@
 """PreviewWidget — animated PIL mechanism preview for the TUI."""
 import math
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 
 from textual.widget import Widget
 from textual.app import ComposeResult
 
 try:
-    from textual_image.widget import TGPImage as TImage
+    from .frame_image import FrameImage
     _HAS_TEXTUAL_IMAGE = True
 except ImportError:
     _HAS_TEXTUAL_IMAGE = False
 
 from PIL import Image as PILImage, ImageDraw
 
+import perf
 from spiro_math import SpiroMath
 import theme
 from constants import PREVIEW_SIZE
@@ -38,11 +35,13 @@ class PreviewWidget(Widget):
         self._ghost_pts    = []
         self._ghost_params = None
         self._spiro        = SpiroMath()
+        self._static: PILImage.Image | None = None   # flattened ghost, ring, ticks
+        self._static_key   = None
         self._last_frame: PILImage.Image | None = None
 
     def compose(self) -> ComposeResult:
         if _HAS_TEXTUAL_IMAGE:
-            self._img = TImage(id="preview-img")
+            self._img = FrameImage(id="preview-img")
             yield self._img
         else:
             from textual.widgets import Static
@@ -50,32 +49,27 @@ class PreviewWidget(Widget):
 
     # ── Ghost trace cache ─────────────────────────────────────────────────────
 
-    def _get_ghost(self, R: float, r: float, d: float) -> list:
+    def _get_ghost(self, R: float, r: float, d: float):
         params = (R, r, d)
         if params == self._ghost_params:
             return self._ghost_pts
         self._ghost_params = params
-        raw     = self._spiro.compute_points(R, r, d, steps=theme.PREVIEW_GHOST_STEPS)
-        max_ext = max(max(abs(v) for pt in raw for v in pt), 1)
-        scale   = (PREVIEW_SIZE * 0.5 - theme.PREVIEW_MARGIN) / max_ext
-        half    = PREVIEW_SIZE // 2
-        self._ghost_pts = [(half + px * scale, half + py * scale) for px, py in raw]
+        self._ghost_pts = self._spiro.curve(R, r, d, PREVIEW_SIZE, theme.PREVIEW_MARGIN,
+                                            tol=theme.PREVIEW_GHOST_TOL)
         return self._ghost_pts
 
-    # ── PIL frame renderer ────────────────────────────────────────────────────
+    # ── Static layer ──────────────────────────────────────────────────────────
 
-    def _draw_frame(
-        self,
-        R: float,
-        r: float,
-        d: float,
-        pen_color: tuple,
-    ) -> PILImage.Image:
-        sz        = PREVIEW_SIZE
-        cx = cy   = sz // 2
-        scale     = (sz // 2 - theme.PREVIEW_MARGIN) / (R + 4)
-        r_clamped = min(r, R - 1)
-        inner_rot = -(R - r_clamped) / max(r_clamped, 0.001) * self._angle
+    def _get_static(self, R: float, r: float, d: float, pen_color: tuple) -> PILImage.Image:
+        """Background, ghost trace, outer ring and ticks, flattened to RGB.
+        Rebuilt only when (R, r, d, pen_color) changes."""
+        key = (R, r, d, tuple(pen_color))
+        if key == self._static_key:
+            return self._static
+        perf.count("preview.static.miss")
+        sz      = PREVIEW_SIZE
+        cx = cy = sz // 2
+        scale   = (sz // 2 - theme.PREVIEW_MARGIN) / (R + 4)
 
         img  = PILImage.new("RGBA", (sz, sz), (0, 0, 0, 0))
         draw = ImageDraw.Draw(img, "RGBA")
@@ -108,6 +102,32 @@ class PreviewWidget(Widget):
                 width=1,
             )
 
+        # Flatten RGBA onto the canvas background color
+        bg_r, bg_g, bg_b = theme.CANVAS_BG
+        bg = PILImage.new("RGBA", (sz, sz), (bg_r, bg_g, bg_b, 255))
+        bg.paste(img, mask=img)
+        self._static, self._static_key = bg.convert("RGB"), key
+        return self._static
+
+    # ── PIL frame renderer ────────────────────────────────────────────────────
+
+    def _draw_frame(
+        self,
+        R: float,
+        r: float,
+        d: float,
+        pen_color: tuple,
+    ) -> PILImage.Image:
+        sz        = PREVIEW_SIZE
+        cx = cy   = sz // 2
+        scale     = (sz // 2 - theme.PREVIEW_MARGIN) / (R + 4)
+        r_clamped = min(r, R - 1)
+        inner_rot = -(R - r_clamped) / max(r_clamped, 0.001) * self._angle
+
+        # Moving parts are alpha-blended straight onto a copy of the static layer.
+        img  = self._get_static(R, r, d, pen_color).copy()
+        draw = ImageDraw.Draw(img, "RGBA")
+
         # Inner wheel
         wheel_x = cx + int((R - r_clamped) * scale * math.cos(self._angle))
         wheel_y = cy + int((R - r_clamped) * scale * math.sin(self._angle))
@@ -174,18 +194,15 @@ class PreviewWidget(Widget):
         # R= / r= labels (skip text — PIL font loading is complex in TUI context)
         # The labels are decorative; omit to avoid font dependency issues.
 
-        # Flatten RGBA onto the canvas background color
-        bg_r, bg_g, bg_b = theme.CANVAS_BG
-        bg = PILImage.new("RGBA", (sz, sz), (bg_r, bg_g, bg_b, 255))
-        bg.paste(img, mask=img)
-        return bg.convert("RGB")
+        return img
 
     # ── Public update call (called each tick from app) ────────────────────────
 
+    @perf.timed("preview.frame")
     def update(self, R: float, r: float, d: float, pen_color: tuple, drawing: bool) -> None:
         speed = theme.PREVIEW_SPIN_DRAW if drawing else theme.PREVIEW_SPIN_IDLE
         self._angle += speed
         frame = self._draw_frame(R, r, d, pen_color)
         self._last_frame = frame
         if _HAS_TEXTUAL_IMAGE and hasattr(self, "_img"):
-            self._img.image = frame  # setter calls refresh(layout=True) internally
+            self._img.show_frame(frame)   # fixed PREVIEW_SIZE: no layout pass
@@ -1,9 +1,4 @@
 """SpiroSlider — two-line draggable slider widget for the TUI."""
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
-
 from textual.widget import Widget
 from textual.reactive import reactive
 from textual.binding import Binding
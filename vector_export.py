@@ -0,0 +1,164 @@
+"""Vector export of the layer history as SVG or PDF.
+
+Layers are rebuilt from their recorded parameters as cubic Béziers rather
+than dense polylines: each segment takes its control points from the
+curve's exact tangents, so a few segments per lobe stay within VECTOR_TOL
+of the true hypotrochoid. Rainbow and gradient pens become
+VECTOR_COLOR_BANDS solid runs per curve instead of one path per segment,
+so hundreds of layers stay small enough for design tools to open quickly.
+"""
+import os
+import zlib
+
+import theme
+from constants import CANVAS_SIZE, CANVAS_MARGIN, CURVE_STREAM_MAX, CURVE_CHUNK, VECTOR_TOL
+from history import resample_runs
+from palette import color_rows
+from spiro_math import SpiroMath
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+
+# ── Geometry ──────────────────────────────────────────────────────────────────
+
+def strokes(layers, size=CANVAS_SIZE, tol=VECTOR_TOL):
+    """Yield ``(layer_no, width, color, start, segs)`` in paint order, in a
+    ``size``² coordinate space. ``start`` is the first point and ``segs``
+    a list of ``(c1x, c1y, c2x, c2y, x, y)`` cubic Bézier segments."""
+    spiro  = SpiroMath()
+    margin = round(CANVAS_MARGIN * size / CANVAS_SIZE)
+    k      = size / CANVAS_SIZE
+    for layer_no, (R, r, d, total, runs) in enumerate(layers, 1):
+        steps = spiro.bezier_steps(R, r, d, size, margin, tol, max_steps=CURVE_STREAM_MAX)
+        n     = steps + 1
+        for a, b, thick, mode in resample_runs(runs, total, n):
+            color, start, segs = None, None, []
+            for s0, s1 in _pieces(a, b, n):
+                mid = (s0 + s1) // 2
+                col = tuple(int(c) for c in color_rows(mode, n, mid, mid + 1)[0])
+                if col != color:
+                    if segs:
+                        yield layer_no, thick * k, color, start, segs
+                    color, start, segs = col, None, []
+                p0, piece = _beziers(spiro, R, r, d, size, margin, steps, s0, s1)
+                start = start or p0
+                segs.extend(piece)
+            if segs:
+                yield layer_no, thick * k, color, start, segs
+
+
+def _pieces(a, b, n):
+    """Split segments ``a..b-1`` at color band and CURVE_CHUNK boundaries."""
+    bands = theme.VECTOR_COLOR_BANDS
+    cuts  = {a, b}
+    cuts.update(-(-i * n // bands) for i in range(1, bands))
+    cuts.update(range(CURVE_CHUNK + 1, n, CURVE_CHUNK))
+    cuts = sorted(c for c in cuts if a <= c <= b)
+    return [(s0, s1) for s0, s1 in zip(cuts, cuts[1:]) if s1 > s0]
+
+
+def _beziers(spiro, R, r, d, size, margin, steps, s0, s1):
+    """Start point and Bézier segments for curve segments ``s0..s1-1``
+    (segment j joins samples j-1 and j)."""
+    pts = spiro.fit_range(R, r, d, size, margin, steps, s0 - 1, s1)
+    tan = spiro.fit_tangents(R, r, d, size, margin, steps, s0 - 1, s1)
+    if _HAS_NUMPY:
+        segs = np.hstack((pts[:-1] + tan[:-1] / 3, pts[1:] - tan[1:] / 3, pts[1:]))
+        return tuple(pts[0].tolist()), segs.tolist()
+    segs = [(ax + atx / 3, ay + aty / 3, bx - btx / 3, by - bty / 3, bx, by)
+            for (ax, ay), (atx, aty), (bx, by), (btx, bty)
+            in zip(pts, tan, pts[1:], tan[1:])]
+    return tuple(pts[0]), segs
+
+
+# ── Writers ───────────────────────────────────────────────────────────────────
+
+def _num(v):
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+
+def _svg_path(start, segs):
+    """Path data with relative ``c`` commands on a 0.01 px grid; offsets
+    are taken between rounded points so rounding never accumulates."""
+    x0, y0 = round(start[0] * 100), round(start[1] * 100)
+    out    = [f"M{_num(x0 / 100)} {_num(y0 / 100)}c"]
+    for seg in segs:
+        q = [round(v * 100) for v in seg]
+        out.append(" ".join(_num((v - (y0 if i % 2 else x0)) / 100)
+                            for i, v in enumerate(q)))
+        x0, y0 = q[4], q[5]
+    return out[0] + " ".join(out[1:])
+
+
+def write_svg(layers, path, size=CANVAS_SIZE):
+    """Write ``layers`` (from ``layers_from_history``) as an SVG, one group
+    per layer."""
+    tmp = path + ".part"
+    with open(tmp, "w") as fh:
+        fh.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+                 f'viewBox="0 0 {size} {size}">\n')
+        fh.write('<rect width="100%" height="100%" fill="#{:02x}{:02x}{:02x}"/>\n'
+                 .format(*theme.CANVAS_BG))
+        fh.write('<g fill="none" stroke-linecap="round" stroke-linejoin="round">\n')
+        current = None
+        for layer_no, width, color, start, segs in strokes(layers, size):
+            if layer_no != current:
+                if current is not None:
+                    fh.write("</g>\n")
+                fh.write(f'<g id="layer-{layer_no}">\n')
+                current = layer_no
+            fh.write('<path stroke="#{:02x}{:02x}{:02x}" '.format(*color)
+                     + f'stroke-width="{_num(width)}" d="{_svg_path(start, segs)}"/>\n')
+        if current is not None:
+            fh.write("</g>\n")
+        fh.write("</g>\n</svg>\n")
+    os.replace(tmp, path)
+    return path
+
+
+def write_pdf(layers, path, size=CANVAS_SIZE):
+    """Write ``layers`` as a single-page PDF with one Flate-compressed
+    content stream, encoded as it is generated."""
+    tmp = path + ".part"
+    with open(tmp, "wb") as fh:
+        offsets = {}
+
+        def obj(num, body):
+            offsets[num] = fh.tell()
+            fh.write(f"{num} 0 obj\n".encode() + body + b"\nendobj\n")
+
+        fh.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        obj(2, b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>")
+        obj(3, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {size} {size}] "
+               f"/Resources << >> /Contents 4 0 R >>".encode())
+
+        offsets[4] = fh.tell()
+        fh.write(b"4 0 obj\n<< /Length 5 0 R /Filter /FlateDecode >>\nstream\n")
+        begin = fh.tell()
+        z     = zlib.compressobj(6)
+        bg    = " ".join(_num(c / 255) for c in theme.CANVAS_BG)
+        # Flip to a top-left origin so coordinates match the canvas.
+        fh.write(z.compress(f"q 1 0 0 -1 0 {size} cm {bg} rg 0 0 {size} {size} re f "
+                            f"1 J 1 j\n".encode()))
+        for _, width, color, start, segs in strokes(layers, size):
+            rgb = " ".join(_num(c / 255) for c in color)
+            ops = [f"{_num(width)} w {rgb} RG {_num(start[0])} {_num(start[1])} m"]
+            ops += [" ".join(map(_num, seg)) + " c" for seg in segs]
+            fh.write(z.compress((" ".join(ops) + " S\n").encode()))
+        fh.write(z.compress(b"Q\n") + z.flush())
+        length = fh.tell() - begin
+        fh.write(b"\nendstream\nendobj\n")
+        obj(5, str(length).encode())
+
+        xref = fh.tell()
+        fh.write(b"xref\n0 6\n0000000000 65535 f \n")
+        for num in range(1, 6):
+            fh.write(f"{offsets[num]:010d} 00000 n \n".encode())
+        fh.write(f"trailer\n<< /Size 6 /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    os.replace(tmp, path)
+    return path